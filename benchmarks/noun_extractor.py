@@ -0,0 +1,111 @@
+"""NounExtractor.extract_nouns() とノードを辿る従来の名詞抽出のスループット比較
+
+実行方法（リポジトリのルートで）:
+    python -m benchmarks.noun_extractor [--posts 20000] [--repeat 3]
+
+合成した5ch風の投稿を、parseToNode() のノードを辿る従来の実装と、Tagger.parse() の
+"品詞\t表層形" の行から取り出す extract_nouns() で処理し、
+1秒あたりの処理投稿数と、結果が投稿ごとに一致することを確認する。
+"""
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Callable, List
+
+from src.analysis.noun_extractor import NounExtractor
+
+
+# 投稿の素材（技術板の書き込み・AA・URL・半角カナ・全角英数字など）
+FRAGMENTS = [
+    "Pythonの型ヒントって実行時には無視されるの？",
+    "Rustの所有権がよくわからん",
+    "東京駅で待ち合わせしてから大阪に向かう",
+    "ｷﾀ━━━━(ﾟ∀ﾟ)━━━━!!",
+    ">>123 それはGCの問題だろ",
+    "C++のテンプレートメタプログラミングは闇",
+    "https://medaka.5ch.net/test/read.cgi/prog/1700000000/",
+    "お前らのおすすめのエディタ教えて",
+    "VSCodeかEmacsかVimか",
+    "ワロタｗｗｗｗ",
+    "データベースのインデックスが効かない",
+    "SQLのJOINが遅いんだけどどうすればいい？",
+    "プログラマー３５歳定年説",
+    "ＪａｖａＳｃｒｉｐｔの非同期処理",
+    "　　∧＿∧\n　 （　´∀｀）",
+    "GitHubのActionsでCIを回している",
+    "自然言語処理の形態素解析器はMeCabが定番",
+    "株価が下がって含み損がやばい",
+    "Go言語のgoroutineは軽量スレッド",
+    "きしゃのきしゃがきしゃできしゃした",
+]
+
+
+def build_posts(num_posts: int, seed: int = 0) -> List[str]:
+    rng = random.Random(seed)
+    return [
+        "\n".join(rng.choice(FRAGMENTS) for _ in range(rng.randint(1, 5)))
+        for _ in range(num_posts)
+    ]
+
+
+def extract_nouns_by_node(extractor: NounExtractor, text: str) -> List[str]:
+    # ノードを1つずつ辿って品詞を判定する従来の実装（結果の比較用）
+    nouns: List[str] = []
+    node = extractor.tagger.parseToNode(text)
+    while node:
+        if node.feature.split(',')[0] == "名詞" and node.surface:
+            nouns.append(node.surface)
+        node = node.next
+    return nouns
+
+
+def measure(func: Callable[[], List[List[str]]], repeat: int) -> float:
+    # repeat回のうち最速の経過時間（秒）
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--posts", type=int, default=20000)
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--dictionary-path", default=None)
+    args = parser.parse_args()
+
+    extractor = NounExtractor(dictionary_path=args.dictionary_path)
+    posts = build_posts(args.posts)
+
+    by_node = [extract_nouns_by_node(extractor, post) for post in posts]
+    per_post = [extractor.extract_nouns(post) for post in posts]
+    mismatches = sum(1 for a, b in zip(by_node, per_post) if a != b)
+
+    by_node_sec = measure(
+        lambda: [extract_nouns_by_node(extractor, post) for post in posts], args.repeat
+    )
+    per_post_sec = measure(
+        lambda: [extractor.extract_nouns(post) for post in posts], args.repeat
+    )
+
+    print(f"posts: {len(posts)}, nouns: {sum(len(nouns) for nouns in by_node)}")
+    for label, sec in (
+        ("parseToNode (node walk)", by_node_sec),
+        ("extract_nouns          ", per_post_sec),
+    ):
+        print(
+            f"{label}: {sec:.3f}s ({len(posts) / sec:,.0f} posts/s, "
+            f"{by_node_sec / sec:.2f}x)"
+        )
+    print(f"mismatched posts: {mismatches}")
+
+    if mismatches:
+        raise SystemExit(1)
+
+
+if __name__ == "__main__":
+    main()
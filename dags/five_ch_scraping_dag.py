@@ -1,8 +1,10 @@
 import os
 import sys
 import logging
+import multiprocessing
 from datetime import date, datetime, timedelta, timezone
-from typing import Optional
+from functools import partial
+from typing import List, Optional
 from uuid import uuid4
 
 # srcモジュールをインポートできるようにパスを追加
@@ -11,12 +13,23 @@ sys.path.insert(0, "/opt/airflow")
 from airflow import DAG
 from airflow.operators.python import PythonOperator
 
-from src.analysis.daily_processor import DailyProcessor
+from src.analysis.daily_processor import DailyProcessor, warm_term_cache
+from src.analysis.token_store import TokenStore
+from src.analysis.tokenize_pool import TokenizePool
 from src.analysis.weekly_processor import WeeklyProcessor
 from src.database.models import PipelineRun
 from src.database.repositories import PipelineRunRepository
+from src.database.term_cache import get_shared_term_cache
 from src.database.session import get_db
-from src.scraping.daily_scraper import collect_posts_for_date
+from src.scraping.archive import RawHtmlArchive
+from src.scraping.checkpoint import CollectionCheckpoint
+from src.scraping.crawl_budget import CrawlCoverage
+from src.scraping.crawl_state import CrawlStateStore
+from src.scraping.daily_scraper import iter_posts_for_date
+from src.scraping.http_cache import HttpValidatorCache
+from src.scraping.multi_board import BoardTarget, parse_board_urls, run_for_boards
+from src.scraping.pacer import AimdPacer
+from src.scraping.stats import ScraperStats
 
 # JSTタイムゾーンの定義
 JST = timezone(timedelta(hours=9))
@@ -28,6 +41,21 @@ logger = logging.getLogger(__name__)
 SCRAPING_BASE_URL = os.getenv("SCRAPING_BASE_URL", "https://medaka.5ch.net")
 SCRAPING_BOARD_PATH = os.getenv("SCRAPING_BOARD_PATH", "/prog/")
 SCRAPING_BOARD_KEY = os.getenv("SCRAPING_BOARD_KEY", "prog")
+# 複数の板を収集する場合は板トップページのURLをカンマ区切りで指定する
+# 例: "https://medaka.5ch.net/prog/,https://egg.5ch.net/software/"
+SCRAPING_BOARDS = os.getenv("SCRAPING_BOARDS", "")
+# 巡回状態などスクレイピングの作業データを保存するディレクトリ
+SCRAPING_DATA_DIR = os.getenv("SCRAPING_DATA_DIR", "/opt/airflow/data")
+# 1板あたりのスレッド巡回の時間予算（秒）。指定した場合は、遅い日でもDAGのSLAを超えないよう
+# 予算内で対象日の投稿が多いスレッドから優先して取得する（既定は指定なし: 板の並び順に巡回）
+# 優先度順の巡回では、収集される投稿が板の並び順の巡回と一致するとは限らない
+SCRAPING_TIME_BUDGET_SEC = (
+    float(os.environ["SCRAPING_TIME_BUDGET_SEC"])
+    if os.getenv("SCRAPING_TIME_BUDGET_SEC")
+    else None
+)
+# 名詞抽出を行うワーカープロセス数（1以下の場合はDAGのプロセスで逐次処理する）
+TOKENIZE_WORKERS = int(os.getenv("TOKENIZE_WORKERS", "0"))
 
 
 def get_target_date_jst(execution_date: Optional[datetime] = None) -> date:
@@ -44,6 +72,13 @@ def get_target_date_jst(execution_date: Optional[datetime] = None) -> date:
     return target_date
 
 
+def get_scraping_boards() -> List[BoardTarget]:
+    # SCRAPING_BOARDS（板URLのカンマ区切り）が指定されていない場合は単一板の設定を使う
+    if SCRAPING_BOARDS.strip():
+        return parse_board_urls(SCRAPING_BOARDS)
+    return [BoardTarget(SCRAPING_BASE_URL, SCRAPING_BOARD_PATH, SCRAPING_BOARD_KEY)]
+
+
 def run_daily_collection(**context) -> None:
     execution_date = context.get("execution_date")
     if execution_date is None:
@@ -51,83 +86,227 @@ def run_daily_collection(**context) -> None:
     
     # JSTでの対象日を取得
     target_date = get_target_date_jst(execution_date)
-    
-    logger.info(f"日次データ収集開始: target_date={target_date}, board_key={SCRAPING_BOARD_KEY}")
+
+    # dag_run.conf に {"replay": true} を指定した場合は、サイトに接続せず
+    # アーカイブ済みのページから再処理する
+    dag_run = context.get("dag_run")
+    replay = bool(dag_run is not None and (dag_run.conf or {}).get("replay"))
+
+    boards = get_scraping_boards()
+    logger.info(
+        f"日次データ収集開始: target_date={target_date}, "
+        f"boards={[board.board_key for board in boards]}, replay={replay}"
+    )
+
+    # 板ごとに並行して収集する
+    # リクエスト間隔はホストごとに全板で共有し、同じホストの板は公平に分け合う
+    # （2秒から始めて応答に応じて調整し、1秒未満にはしない）
+    pacer = AimdPacer(initial_delay=2.0, min_delay=1.0)
+    archive = RawHtmlArchive(os.path.join(SCRAPING_DATA_DIR, "archive"))
+    # 同じ対象日の再実行・リトライでは変更のないページを条件付きリクエストで再利用する
+    http_cache = HttpValidatorCache(os.path.join(SCRAPING_DATA_DIR, "http_cache"))
+    # 投稿ごとの名詞抽出の結果を記録し、正規化ルールの変更後は再取得せずに再集計できるようにする
+    # （python -m src.analysis.reprocess）
+    # 語彙のterm_idを解決するキャッシュは、板の収集を始める前に短いトランザクションで読み込む
+    # （各板の処理は巡回が終わって結果を保存するまでDBに接続しない）
+    term_cache = get_shared_term_cache()
+    if not term_cache.warmed:
+        with get_db() as session:
+            warm_term_cache(session, term_cache)
+    with TokenStore(os.path.join(SCRAPING_DATA_DIR, "token_store.sqlite3")) as token_store:
+        run_for_boards(
+            boards,
+            partial(
+                collect_board,
+                target_date=target_date,
+                replay=replay,
+                pacer=pacer,
+                archive=archive,
+                http_cache=http_cache,
+                token_store=token_store,
+            ),
+        )
+
+
+def collect_board(
+    board: BoardTarget,
+    target_date: date,
+    replay: bool,
+    pacer: AimdPacer,
+    archive: RawHtmlArchive,
+    http_cache: HttpValidatorCache,
+    token_store: TokenStore,
+) -> None:
+    logger.info(f"板の収集開始: target_date={target_date}, board_key={board.board_key}")
     
     run_id = uuid4()
     pipeline_run = None
+    # 成功済みの実行をリプレイする場合は、その実行のステータスを変更しない
+    keep_status = False
     
     try:
         with get_db() as session:
             # 1. PipelineRunを作成
-            pipeline_run = PipelineRun(
-                run_id=run_id,
-                target_date=target_date,
-                board_key=SCRAPING_BOARD_KEY,
-                status="partial",  # 開始時はpartial
-                config={
-                    "base_url": SCRAPING_BASE_URL,
-                    "board_path": SCRAPING_BOARD_PATH,
-                    "board_key": SCRAPING_BOARD_KEY,
-                },
-            )
+            # 同じ対象日・板の実行が既にある場合（Airflowのリトライなど）はそのrun_idを引き継ぎ、
+            # run_idごとのチェックポイントから収集を再開する
             run_repo = PipelineRunRepository(session)
-            pipeline_run = run_repo.create(pipeline_run)
+            pipeline_run = run_repo.get_by_date_and_board(target_date, board.board_key)
+            if pipeline_run is not None and pipeline_run.status == "success":
+                if not replay:
+                    # 成功済みの実行は再実行しない（対象日・板ごとに1件のため、新しい実行も作れない）
+                    # 一部の板だけ失敗したタスクのリトライでは、成功した板を飛ばして失敗した板だけを収集する
+                    logger.warning(
+                        f"成功済みのPipelineRunがあるためスキップ: run_id={pipeline_run.run_id}, "
+                        f"target_date={target_date}, board_key={board.board_key}"
+                    )
+                    return
+                # リプレイはアーカイブからその実行の集計を作り直す（ステータスはそのまま）
+                run_id = pipeline_run.run_id
+                keep_status = True
+                logger.info(f"成功済みのPipelineRunをリプレイ: run_id={run_id}, target_date={target_date}")
+            elif pipeline_run is not None:
+                run_id = pipeline_run.run_id
+                pipeline_run.is_recovered = True
+                pipeline_run.status = "partial"
+                pipeline_run.finished_at = None
+                session.flush()
+                logger.info(f"既存のPipelineRunを再開: run_id={run_id}, target_date={target_date}")
+            else:
+                pipeline_run = PipelineRun(
+                    run_id=run_id,
+                    target_date=target_date,
+                    board_key=board.board_key,
+                    status="partial",  # 開始時はpartial
+                    config={
+                        "base_url": board.base_url,
+                        "board_path": board.board_path,
+                        "board_key": board.board_key,
+                        "replay": replay,
+                    },
+                )
+                pipeline_run = run_repo.create(pipeline_run)
+                logger.info(f"PipelineRun作成: run_id={run_id}, target_date={target_date}")
             session.commit()
-            
-            logger.info(f"PipelineRun作成: run_id={run_id}, target_date={target_date}")
         
-        # 2. スクレイピング実行
-        posts = collect_posts_for_date(
-            base_url=SCRAPING_BASE_URL,
-            board_path=SCRAPING_BOARD_PATH,
+        # 2. スクレイピング実行（前回巡回時の続きから取得し、取得したページはアーカイブに保存）
+        # リプレイ時は巡回状態を使わず、アーカイブに記録されたページだけから収集する
+        crawl_state = None
+        checkpoint = None
+        if not replay:
+            crawl_state = CrawlStateStore(
+                os.path.join(SCRAPING_DATA_DIR, "crawl_state", f"{board.board_key}.json")
+            )
+            # 取得済みのスレッドをrun_idごとに記録し、リトライ時は未取得のスレッドから再開する
+            checkpoint = CollectionCheckpoint(
+                os.path.join(SCRAPING_DATA_DIR, "checkpoints", f"{run_id}.jsonl")
+            )
+            if len(checkpoint) > 0:
+                logger.info(f"チェックポイントから再開: restored_threads={len(checkpoint)}")
+        # リクエストのレイテンシ・転送量・リトライ・待機時間を集計し、日次メトリクスとともに保存する
+        # （リプレイ時はリクエストを行わないため集計せず、元の巡回の集計を残す）
+        scraper_stats = None if replay else ScraperStats()
+        # 時間予算を指定した場合は、予算内に巡回できた範囲を記録する
+        # （リプレイ時はネットワークに接続しないため予算なし）
+        crawl_coverage = (
+            CrawlCoverage()
+            if not replay and SCRAPING_TIME_BUDGET_SEC is not None
+            else None
+        )
+        # 投稿はスレッド単位で逐次返される（巡回は下の process_posts_stream の中で進む）
+        posts = iter_posts_for_date(
+            base_url=board.base_url,
+            board_path=board.board_path,
             target_date=target_date,
             timeout=30,
             max_retries=3,
             backoff_factor=1.0,
             request_delay=2.0,
-            max_posts=300,
+            adaptive_tail=50,
+            pacer=pacer,
+            crawl_state=crawl_state,
+            board_index="subject",
+            archive=archive,
+            replay=replay,
+            checkpoint=checkpoint,
+            stats=scraper_stats,
+            time_budget_sec=None if replay else SCRAPING_TIME_BUDGET_SEC,
+            coverage=crawl_coverage,
+            http_cache=http_cache,
         )
         
-        logger.info(f"スクレイピング完了: posts={len(posts)}")
+        # 3. 名詞抽出・分析・DB保存（スクレイピングと並行して逐次処理）
+        # TOKENIZE_WORKERS > 1 の場合は名詞抽出をワーカープロセスに分散する
+        # （巡回のスレッドが動いているため、ワーカーは fork ではなく forkserver で起動する）
+        tokenize_pool = (
+            TokenizePool(TOKENIZE_WORKERS, mp_context=multiprocessing.get_context("forkserver"))
+            if TOKENIZE_WORKERS > 1 else None
+        )
+        try:
+            # セッションは最初のクエリでDB接続を取得する。DailyProcessorは巡回中（名詞抽出・集計）に
+            # DBを使わず、巡回が終わってから語彙の解決と保存を行うため、
+            # 巡回の間はDB接続・トランザクションを保持しない
+            with get_db() as session:
+                # 語彙のterm_idはプロセス内で共有するキャッシュから解決する（板をまたいで共有）
+                processor = DailyProcessor(
+                    session,
+                    tokenize_pool=tokenize_pool,
+                    token_store=token_store,
+                    term_cache=get_shared_term_cache(),
+                )
+                metrics = processor.process_posts_stream(
+                    posts=posts,
+                    target_date=target_date,
+                    board_key=board.board_key,
+                    run_id=run_id,
+                    scraper_stats=scraper_stats,
+                    crawl_coverage=crawl_coverage,
+                    # リプレイでは集計し直した結果で対象日・板の daily_term_stats を置き換える
+                    replace_existing=replay,
+                )
+                session.commit()
+                
+                logger.info(
+                    f"日次処理完了: "
+                    f"fetched_threads={metrics.fetched_threads}, "
+                    f"fetched_posts={metrics.fetched_posts}, "
+                    f"parsed_posts={metrics.parsed_posts}, "
+                    f"total_tokens={metrics.total_tokens}, "
+                    f"tokenize_cache_hit_rate={metrics.tokenize_cache_hit_rate:.3f}, "
+                    f"term_cache={get_shared_term_cache().summary()}, "
+                    f"duration_sec={metrics.duration_sec}"
+                )
+                if crawl_coverage is not None and crawl_coverage.budget_exhausted:
+                    logger.warning(
+                        f"時間予算内に巡回を完了できませんでした: "
+                        f"unvisited_threads={crawl_coverage.threads_unvisited}, "
+                        f"coverage_ratio={crawl_coverage.coverage_ratio:.3f}"
+                    )
+        finally:
+            if tokenize_pool is not None:
+                tokenize_pool.close()
         
-        # 3. 名詞抽出・分析・DB保存
-        with get_db() as session:
-            processor = DailyProcessor(session)
-            metrics = processor.process_posts(
-                posts=posts,
-                target_date=target_date,
-                board_key=SCRAPING_BOARD_KEY,
-                run_id=run_id,
-            )
-            session.commit()
-            
-            logger.info(
-                f"日次処理完了: "
-                f"fetched_threads={metrics.fetched_threads}, "
-                f"fetched_posts={metrics.fetched_posts}, "
-                f"parsed_posts={metrics.parsed_posts}, "
-                f"total_tokens={metrics.total_tokens}, "
-                f"duration_sec={metrics.duration_sec}"
-            )
+        # 4. PipelineRunのステータスを更新（成功済みの実行のリプレイでは変更しない）
+        if not keep_status:
+            with get_db() as session:
+                run_repo = PipelineRunRepository(session)
+                run_repo.update_status(
+                    run_id=run_id,
+                    status="success",
+                    finished_at=datetime.utcnow(),
+                )
+                session.commit()
+                
+                logger.info(f"PipelineRun更新完了: run_id={run_id}, status=success")
         
-        # 4. PipelineRunのステータスを更新
-        with get_db() as session:
-            run_repo = PipelineRunRepository(session)
-            run_repo.update_status(
-                run_id=run_id,
-                status="success",
-                finished_at=datetime.utcnow(),
-            )
-            session.commit()
-            
-            logger.info(f"PipelineRun更新完了: run_id={run_id}, status=success")
+        # 正常に完了したらチェックポイントは不要
+        if checkpoint is not None:
+            checkpoint.delete()
     
     except Exception as e:
-        logger.error(f"日次データ収集エラー: {e}", exc_info=True)
+        logger.error(f"日次データ収集エラー: board_key={board.board_key}: {e}", exc_info=True)
         
         # エラー時はPipelineRunのステータスを更新
-        if pipeline_run is not None:
+        if pipeline_run is not None and not keep_status:
             try:
                 with get_db() as session:
                     run_repo = PipelineRunRepository(session)
@@ -152,31 +331,41 @@ def run_weekly_analysis(**context) -> None:
     execution_jst = execution_date.replace(tzinfo=timezone.utc).astimezone(JST)
     execution_date_jst = execution_jst.date()
     
-    logger.info(
-        f"週次データ分析開始: execution_date={execution_date_jst}, "
-        f"board_key={SCRAPING_BOARD_KEY}"
-    )
-    
-    try:
-        with get_db() as session:
-            processor = WeeklyProcessor(session)
-            metrics = processor.process_weekly_analysis(
-                execution_date=execution_date_jst,
-                board_key=SCRAPING_BOARD_KEY,
-            )
-            session.commit()
-            
-            logger.info(
-                f"週次データ分析完了: "
-                f"processed_terms={metrics.processed_terms}, "
-                f"error_terms={metrics.error_terms}, "
-                f"invalid_dates={len(metrics.invalid_dates)}, "
-                f"duration_sec={metrics.duration_sec}"
-            )
+    # 1つの板で失敗しても残りの板は分析し、失敗した板はまとめて最後にエラーにする
+    errors = {}
+    for board in get_scraping_boards():
+        logger.info(
+            f"週次データ分析開始: execution_date={execution_date_jst}, "
+            f"board_key={board.board_key}"
+        )
+        
+        try:
+            with get_db() as session:
+                processor = WeeklyProcessor(session)
+                metrics = processor.process_weekly_analysis(
+                    execution_date=execution_date_jst,
+                    board_key=board.board_key,
+                )
+                session.commit()
+                
+                logger.info(
+                    f"週次データ分析完了: "
+                    f"board_key={board.board_key}, "
+                    f"processed_terms={metrics.processed_terms}, "
+                    f"error_terms={metrics.error_terms}, "
+                    f"invalid_dates={len(metrics.invalid_dates)}, "
+                    f"duration_sec={metrics.duration_sec}"
+                )
+        
+        except Exception as e:
+            logger.error(f"週次データ分析エラー: board_key={board.board_key}: {e}", exc_info=True)
+            errors[board.board_key] = e
     
-    except Exception as e:
-        logger.error(f"週次データ分析エラー: {e}", exc_info=True)
-        raise
+    if errors:
+        first_error = next(iter(errors.values()))
+        raise RuntimeError(
+            f"Weekly analysis failed for boards: {sorted(errors)}"
+        ) from first_error
 
 
 # 日次データ収集DAG
@@ -1,11 +1,16 @@
 from src.analysis.daily_processor import DailyProcessor, DailyProcessorMetrics
-from src.analysis.normalizer import normalize_term
-from src.analysis.noun_extractor import NounExtractor, extract_nouns_from_text
+from src.analysis.normalizer import normalize_term, normalize_terms
+from src.analysis.noun_extractor import (
+    NounExtractor,
+    extract_nouns_from_text,
+    warm_up_noun_extractor,
+)
 from src.analysis.statistics import (
     calculate_appearance_rate_ci,
     calculate_zscore,
     perform_linear_regression,
 )
+from src.analysis.tokenize_pool import TokenizePool
 from src.analysis.weekly_processor import (
     WeeklyProcessor,
     WeeklyProcessorMetrics,
@@ -16,10 +21,13 @@ __all__ = [
     "DailyProcessorMetrics",
     "NounExtractor",
     "extract_nouns_from_text",
+    "warm_up_noun_extractor",
     "normalize_term",
+    "normalize_terms",
     "calculate_appearance_rate_ci",
     "calculate_zscore",
     "perform_linear_regression",
+    "TokenizePool",
     "WeeklyProcessor",
     "WeeklyProcessorMetrics",
 ]
@@ -1,21 +1,41 @@
 from __future__ import annotations
 
 from collections import defaultdict
-from datetime import date, datetime
-from typing import Dict, List, Optional
+from itertools import groupby
+from datetime import date, datetime, timedelta
+from typing import Dict, Iterable, Iterator, List, Optional
 from uuid import UUID
 
 from sqlalchemy.orm import Session
 
 from src.analysis.noun_extractor import NounExtractor
 from src.analysis.normalizer import normalize_term
-from src.database.models import DailyTermStats, PipelineMetricsDaily, Term
+from src.analysis.token_store import TokenStore
+from src.analysis.tokenize_memo import DEFAULT_MAX_ENTRIES, TokenizeMemo
+from src.analysis.tokenize_pool import NounCounts, TokenizePool, count_nouns
+from src.database.models import DailyTermStats, PipelineMetricsDaily
 from src.database.repositories import (
     DailyTermStatsRepository,
     PipelineMetricsDailyRepository,
     TermRepository,
 )
+from src.database.term_cache import CachedTerm, TermCache
+from src.scraping.crawl_budget import CrawlCoverage
 from src.scraping.daily_scraper import CollectedPost
+from src.scraping.stats import ScraperStats
+
+
+# TermCacheに読み込む語の期間（日数）
+TERM_CACHE_WARM_DAYS = 7
+
+
+def warm_term_cache(session: Session, term_cache: TermCache) -> int:
+    # 最近出現した語をキャッシュに読み込み、読み込んだ語数を返す
+    # （出現の多い語ほど後に渡され、キャッシュから削除されにくい）
+    return term_cache.warm_load(TermRepository(session).get_recently_active(
+        since=date.today() - timedelta(days=TERM_CACHE_WARM_DAYS),
+        limit=term_cache.max_entries,
+    ))
 
 
 class DailyProcessorMetrics:
@@ -29,6 +49,9 @@ class DailyProcessorMetrics:
         self.tokenize_fail_posts = 0
         self.total_tokens = 0
         self.filtered_tokens = 0
+        # 名詞抽出のメモ（同じ本文の投稿）のヒット数・ミス数
+        self.tokenize_cache_hits = 0
+        self.tokenize_cache_misses = 0
         self.start_time: Optional[datetime] = None
         self.end_time: Optional[datetime] = None
     
@@ -45,24 +68,65 @@ class DailyProcessorMetrics:
         if self.total_tokens == 0:
             return 0.0
         return self.filtered_tokens / self.total_tokens
+    
+    @property
+    def tokenize_cache_hit_rate(self) -> float:
+        """名詞抽出のメモのヒット率"""
+        lookups = self.tokenize_cache_hits + self.tokenize_cache_misses
+        if lookups == 0:
+            return 0.0
+        return self.tokenize_cache_hits / lookups
 
 
 class DailyProcessor:
     """日次データ処理クラス：名詞抽出→正規化→DB保存"""
     
-    def __init__(self, session: Session):
+    def __init__(
+        self,
+        session: Session,
+        tokenize_pool: Optional[TokenizePool] = None,
+        tokenize_memo_size: int = DEFAULT_MAX_ENTRIES,
+        token_store: Optional[TokenStore] = None,
+        term_cache: Optional[TermCache] = None,
+        noun_extractor: Optional[NounExtractor] = None,
+    ):
         self.session = session
-        self.noun_extractor = NounExtractor()
-        self.term_repo = TermRepository(session)
+        # noun_extractorを省略した場合は、最初に名詞抽出するときに作成する
+        # （reprocess() などの名詞抽出をしない処理ではMeCabを読み込まない）
+        self._noun_extractor = noun_extractor
+        # tokenize_poolが指定された場合は、名詞抽出をワーカープロセスで並行して行う
+        # （プールの終了は呼び出し側で行う）
+        self.tokenize_pool = tokenize_pool
+        # 同じ本文の投稿（コピペ・AAなど）の名詞抽出は1回だけ行う（0の場合はメモしない）
+        self.tokenize_memo = (
+            TokenizeMemo(tokenize_memo_size) if tokenize_memo_size > 0 else None
+        )
+        # token_storeが指定された場合は、投稿ごとの名詞抽出の結果を記録する（reprocess()で再集計できる）
+        self.token_store = token_store
+        # term_cacheが指定された場合は、キャッシュにある語はDBに問い合わせずにterm_idを解決する
+        # （最初に使うときに、最近出現した語をまとめて読み込む）
+        self.term_cache = term_cache
+        self.term_repo = TermRepository(session, term_cache=term_cache)
+        if term_cache is not None and not term_cache.warmed:
+            warm_term_cache(session, term_cache)
         self.daily_stats_repo = DailyTermStatsRepository(session)
         self.metrics_repo = PipelineMetricsDailyRepository(session)
     
+    @property
+    def noun_extractor(self) -> NounExtractor:
+        if self._noun_extractor is None:
+            self._noun_extractor = NounExtractor()
+        return self._noun_extractor
+    
     def process_posts(
         self,
         posts: List[CollectedPost],
         target_date: date,
         board_key: str,
         run_id: Optional[UUID] = None,
+        scraper_stats: Optional[ScraperStats] = None,
+        crawl_coverage: Optional[CrawlCoverage] = None,
+        replace_existing: bool = False,
     ) -> DailyProcessorMetrics:
         """
         投稿リストを処理して名詞を抽出し、DBに保存する。
@@ -77,6 +141,15 @@ class DailyProcessor:
             板キー（例: "prog"）
         run_id : UUID, optional
             パイプライン実行ID
+        scraper_stats : ScraperStats, optional
+            スクレイピングのリクエスト計測。指定した場合は集計をメトリクスとともに保存する
+            （省略した場合、保存済みのメトリクスの計測値はそのまま残す）
+        crawl_coverage : CrawlCoverage, optional
+            時間予算付きの巡回の網羅状況。指定した場合はメトリクスとともに保存する
+        replace_existing : bool, default False
+            Trueの場合、対象日・板の既存の daily_term_stats を削除してから保存する
+            （アーカイブからのリプレイなど、正規化・名詞抽出の変更後に集計し直す場合。
+            変更後に出現しなくなった語の行を残さない）
         
         Returns
         -------
@@ -94,70 +167,349 @@ class DailyProcessor:
         metrics.fetched_threads = len(thread_posts)
         metrics.fetched_posts = len(posts)
         
-        # 名詞の集計（term_id -> (post_hits, thread_hits)）
+        term_stats = self._new_term_stats()
+        if self.token_store is not None:
+            self.token_store.begin_day(target_date, board_key)
+        
+        # スレッドごとに処理
+        self._process_threads(
+            thread_posts.values(), metrics, term_stats, target_date, board_key
+        )
+        
+        self._save_results(
+            term_stats, metrics, target_date, board_key, run_id,
+            scraper_stats, crawl_coverage, replace_existing,
+        )
+        
+        return metrics
+    
+    def process_posts_stream(
+        self,
+        posts: Iterable[CollectedPost],
+        target_date: date,
+        board_key: str,
+        run_id: Optional[UUID] = None,
+        scraper_stats: Optional[ScraperStats] = None,
+        crawl_coverage: Optional[CrawlCoverage] = None,
+        replace_existing: bool = False,
+    ) -> DailyProcessorMetrics:
+        """
+        投稿のイテラブル（iter_posts_for_date など）を逐次処理して名詞を抽出し、DBに保存する。
+        
+        process_posts と同じ集計を行うが、投稿をすべてメモリに載せず、
+        スレッド単位で受け取りながら名詞抽出を進める。
+        スクレイピングと組み合わせると、スレッドの取得待ちの間に前のスレッドの
+        名詞抽出が進み、メモリ使用量も1スレッド分に抑えられる。
+        
+        Parameters
+        ----------
+        posts : Iterable[CollectedPost]
+            処理対象の投稿。同じスレッドの投稿は連続している必要がある。
+        target_date : date
+            対象日付
+        board_key : str
+            板キー（例: "prog"）
+        run_id : UUID, optional
+            パイプライン実行ID
+        scraper_stats : ScraperStats, optional
+            スクレイピングのリクエスト計測。指定した場合は集計をメトリクスとともに保存する
+            （省略した場合、保存済みのメトリクスの計測値はそのまま残す）
+        crawl_coverage : CrawlCoverage, optional
+            時間予算付きの巡回の網羅状況。指定した場合はメトリクスとともに保存する
+        replace_existing : bool, default False
+            Trueの場合、対象日・板の既存の daily_term_stats を削除してから保存する
+            （アーカイブからのリプレイなど、正規化・名詞抽出の変更後に集計し直す場合。
+            変更後に出現しなくなった語の行を残さない）
+        
+        Returns
+        -------
+        DailyProcessorMetrics
+            処理メトリクス
+        
+        Raises
+        ------
+        ValueError
+            同じスレッドの投稿が連続していない場合
+        """
+        metrics = DailyProcessorMetrics()
+        metrics.start_time = datetime.now()
+        
+        term_stats = self._new_term_stats()
+        if self.token_store is not None:
+            self.token_store.begin_day(target_date, board_key)
+        
+        def iter_threads() -> Iterator[List[CollectedPost]]:
+            seen_threads: set[str] = set()
+            
+            # 連続する同じスレッドの投稿ごとに処理
+            for thread_path, group in groupby(posts, key=lambda post: post.thread_path):
+                if thread_path in seen_threads:
+                    # スレ数（thread_hits）を二重に数えないよう、分割されたスレッドはエラーにする
+                    raise ValueError(f"Posts of thread are not contiguous: {thread_path}")
+                seen_threads.add(thread_path)
+                
+                thread_post_list = list(group)
+                metrics.fetched_threads += 1
+                metrics.fetched_posts += len(thread_post_list)
+                yield thread_post_list
+        
+        self._process_threads(iter_threads(), metrics, term_stats, target_date, board_key)
+        
+        self._save_results(
+            term_stats, metrics, target_date, board_key, run_id,
+            scraper_stats, crawl_coverage, replace_existing,
+        )
+        
+        return metrics
+    
+    @staticmethod
+    def _new_term_stats() -> Dict[str, Dict[str, int]]:
+        # 名詞の集計（正規化後の語 -> (post_hits, thread_hits, occurrences)）
         # post_hits: その語を含んだレス数（同一レス内で複数回出ても1カウント）
         # thread_hits: その語を含んだスレ数（同一スレ内で複数レスに出ても1カウント）
-        term_stats: Dict[int, Dict[str, int]] = defaultdict(
-            lambda: {"post_hits": 0, "thread_hits": 0}
+        # occurrences: その語の出現回数（ブロックされた語のフィルタ数に使う）
+        # Termの取得は集計の後に語彙ごとに1回だけ行う（_resolve_term_stats）
+        return defaultdict(lambda: {"post_hits": 0, "thread_hits": 0, "occurrences": 0})
+    
+    def _process_threads(
+        self,
+        threads: Iterable[List[CollectedPost]],
+        metrics: DailyProcessorMetrics,
+        term_stats: Dict[str, Dict[str, int]],
+        target_date: date,
+        board_key: str,
+    ) -> None:
+        """スレッドごとの投稿から名詞を抽出し、受け取った順にterm_statsに加算する"""
+        if self.tokenize_pool is None:
+            for thread_post_list in threads:
+                tokenized = [
+                    self._tokenize(post.content, metrics) for post in thread_post_list
+                ]
+                self._record_tokens(thread_post_list, tokenized, target_date, board_key)
+                self._count_thread(tokenized, metrics, term_stats)
+            return
+        
+        # 名詞抽出はワーカープロセスで行い、Termの取得・集計はこのプロセスで行う
+        # （結果はスレッドの順序どおりに返るため、1プロセスの場合と同じ集計になる）
+        # メモにない本文だけをワーカーに送る
+        def thread_contents():
+            for thread_post_list in threads:
+                cached = [self._memo_get(post.content, metrics) for post in thread_post_list]
+                misses = [
+                    post.content
+                    for post, noun_counts in zip(thread_post_list, cached)
+                    if noun_counts is None
+                ]
+                yield (thread_post_list, cached), misses
+        
+        for (thread_post_list, cached), tokenized_misses in self.tokenize_pool.map_threads(
+            thread_contents()
+        ):
+            miss_iter = iter(tokenized_misses)
+            tokenized = []
+            for post, noun_counts in zip(thread_post_list, cached):
+                if noun_counts is None:
+                    noun_counts = next(miss_iter)
+                    self._memo_put(post.content, noun_counts)
+                tokenized.append(noun_counts)
+            self._record_tokens(thread_post_list, tokenized, target_date, board_key)
+            self._count_thread(tokenized, metrics, term_stats)
+    
+    def _tokenize(self, content: str, metrics: DailyProcessorMetrics) -> Optional[NounCounts]:
+        """投稿から名詞を抽出し、名詞ごとの出現回数を返す（失敗した場合はNone）"""
+        noun_counts = self._memo_get(content, metrics)
+        if noun_counts is not None:
+            return noun_counts
+        
+        try:
+            noun_counts = count_nouns(self.noun_extractor.extract_nouns(content))
+        except Exception:
+            # トークン化に失敗した場合（MeCabのエラーなど）
+            return None
+        
+        self._memo_put(content, noun_counts)
+        return noun_counts
+    
+    def _memo_get(self, content: str, metrics: DailyProcessorMetrics) -> Optional[NounCounts]:
+        """同じ本文の名詞抽出の結果がメモにあれば返す"""
+        if self.tokenize_memo is None:
+            return None
+        noun_counts = self.tokenize_memo.get(content)
+        if noun_counts is None:
+            metrics.tokenize_cache_misses += 1
+        else:
+            metrics.tokenize_cache_hits += 1
+        return noun_counts
+    
+    def _memo_put(self, content: str, noun_counts: Optional[NounCounts]) -> None:
+        # 名詞抽出に失敗した投稿は記録しない
+        if self.tokenize_memo is not None and noun_counts is not None:
+            self.tokenize_memo.put(content, noun_counts)
+    
+    def _record_tokens(
+        self,
+        thread_post_list: List[CollectedPost],
+        tokenized: List[Optional[NounCounts]],
+        target_date: date,
+        board_key: str,
+    ) -> None:
+        """1スレッド分の名詞抽出の結果をtoken_storeに記録する"""
+        if self.token_store is None or not thread_post_list:
+            return
+        self.token_store.record_thread(
+            target_date,
+            board_key,
+            thread_post_list[0].thread_path,
+            [post.content for post in thread_post_list],
+            tokenized,
         )
+    
+    def _count_thread(
+        self,
+        tokenized: List[Optional[NounCounts]],
+        metrics: DailyProcessorMetrics,
+        term_stats: Dict[str, Dict[str, int]],
+    ) -> None:
+        """1スレッド分の投稿ごとの名詞の出現回数を、正規化後の語ごとにterm_statsに加算する"""
+        thread_terms: set[str] = set()  # このスレッドで出現した語のセット
         
-        # スレッドごとに処理
-        for thread_path, thread_post_list in thread_posts.items():
-            thread_term_ids: set[int] = set()  # このスレッドで出現したterm_idのセット
+        # 各投稿を処理
+        for noun_counts in tokenized:
+            metrics.parsed_posts += 1
+            
+            if noun_counts is None:
+                metrics.tokenize_fail_posts += 1
+                continue
+            
+            if not noun_counts:
+                # 名詞が抽出できなかった場合（空の投稿など）
+                # これは失敗ではなく、単に名詞が含まれていないだけなのでカウントしない
+                continue
             
-            # 各投稿を処理
-            for post in thread_post_list:
-                metrics.parsed_posts += 1
+            try:
+                # 投稿内で出現した語のセット（同一レス内で複数回出ても1カウント）
+                post_terms: set[str] = set()
                 
-                try:
-                    # 名詞を抽出
-                    nouns = self.noun_extractor.extract_nouns(post.content)
+                # 同じ名詞は投稿内の出現回数をまとめて数え、正規化は1回だけ行う
+                for noun, occurrences in noun_counts.items():
+                    metrics.total_tokens += occurrences
                     
-                    if not nouns:
-                        # 名詞が抽出できなかった場合（空の投稿など）
-                        # これは失敗ではなく、単に名詞が含まれていないだけなのでカウントしない
+                    # 正規化
+                    normalized = normalize_term(noun)
+                    
+                    if not normalized:
+                        # 正規化後に空になった場合はフィルタ対象
+                        metrics.filtered_tokens += occurrences
                         continue
                     
-                    # 投稿内で出現したterm_idのセット（同一レス内で複数回出ても1カウント）
-                    post_term_ids: set[int] = set()
+                    stats = term_stats[normalized]
+                    stats["occurrences"] += occurrences
                     
-                    for noun in nouns:
-                        metrics.total_tokens += 1
-                        
-                        # 正規化
-                        normalized = normalize_term(noun)
-                        
-                        if not normalized:
-                            # 正規化後に空になった場合はフィルタ対象
-                            metrics.filtered_tokens += 1
-                            continue
-                        
-                        # Termを取得または作成
-                        term = self.term_repo.get_or_create(normalized)
-                        
-                        # ブロックされている場合はスキップ
-                        if term.is_blocked:
-                            metrics.filtered_tokens += 1
-                            continue
-                        
-                        term_id = term.term_id
-                        
-                        # この投稿で初めて出現したterm_idの場合のみカウント
-                        if term_id not in post_term_ids:
-                            post_term_ids.add(term_id)
-                            term_stats[term_id]["post_hits"] += 1
-                        
-                        # このスレッドで初めて出現したterm_idの場合のみカウント
-                        if term_id not in thread_term_ids:
-                            thread_term_ids.add(term_id)
-                            term_stats[term_id]["thread_hits"] += 1
-                
-                except Exception:
-                    # トークン化に失敗した場合（Janomeのエラーなど）
-                    metrics.tokenize_fail_posts += 1
-                    continue
+                    # この投稿で初めて出現した語の場合のみカウント
+                    if normalized not in post_terms:
+                        post_terms.add(normalized)
+                        stats["post_hits"] += 1
+                    
+                    # このスレッドで初めて出現した語の場合のみカウント
+                    if normalized not in thread_terms:
+                        thread_terms.add(normalized)
+                        stats["thread_hits"] += 1
+            
+            except Exception:
+                # 集計に失敗した場合（正規化のエラーなど）
+                metrics.tokenize_fail_posts += 1
+                continue
+    
+    def reprocess(
+        self,
+        target_date: date,
+        board_key: str,
+        token_store: TokenStore,
+    ) -> DailyProcessorMetrics:
+        """
+        token_storeに記録した名詞から、正規化と集計だけをやり直してDBに保存する。
         
-        # daily_term_statsに保存
+        正規化ルールやブロックリストを変更した後に、スクレイピング・名詞抽出をせずに
+        daily_term_stats を作り直す。対象日・板の既存の daily_term_stats は削除してから保存し、
+        pipeline_metrics_daily はトークン数・フィルタ数だけを更新する。
+        
+        Parameters
+        ----------
+        target_date : date
+            対象日付
+        board_key : str
+            板キー（例: "prog"）
+        token_store : TokenStore
+            日次処理で名詞抽出の結果を記録したストア
+        
+        Returns
+        -------
+        DailyProcessorMetrics
+            処理メトリクス
+        """
+        metrics = DailyProcessorMetrics()
+        metrics.start_time = datetime.now()
+        
+        term_stats = self._new_term_stats()
+        for _, tokenized in token_store.iter_threads(target_date, board_key):
+            metrics.fetched_threads += 1
+            metrics.fetched_posts += len(tokenized)
+            self._count_thread(tokenized, metrics, term_stats)
+        
+        resolved_stats = self._resolve_term_stats(term_stats, metrics)
+        self.daily_stats_repo.delete_by_date_and_board(target_date, board_key)
+        self._save_term_stats(resolved_stats, target_date, board_key)
+        
+        metrics.end_time = datetime.now()
+        
+        # スクレイピングの計測などは日次処理の値のまま、集計に関わる値だけを更新する
+        pipeline_metrics = self.metrics_repo.get_by_date_and_board(target_date, board_key)
+        if pipeline_metrics is not None:
+            pipeline_metrics.tokenize_fail_posts = metrics.tokenize_fail_posts
+            pipeline_metrics.total_tokens = metrics.total_tokens
+            pipeline_metrics.filtered_tokens = metrics.filtered_tokens
+            pipeline_metrics.filtered_rate = metrics.filtered_rate
+            self.session.flush()
+        
+        return metrics
+    
+    def _resolve_terms(self, vocabulary: List[str]) -> Dict[str, CachedTerm]:
+        """正規化後の語をterm_id・ブロック状態に対応付ける（存在しない語は作成する）"""
+        # 語彙をまとめて作成・取得する
+        if self.term_cache is not None:
+            return self.term_repo.resolve_cached(vocabulary)
+        return {
+            normalized: CachedTerm(term_id=term.term_id, is_blocked=term.is_blocked)
+            for normalized, term in self.term_repo.resolve_many(vocabulary).items()
+        }
+    
+    def _resolve_term_stats(
+        self,
+        term_stats: Dict[str, Dict[str, int]],
+        metrics: DailyProcessorMetrics,
+    ) -> Dict[int, Dict[str, int]]:
+        """語ごとの集計をterm_idごとの集計に置き換え、ブロックされた語をフィルタ数に加える"""
+        terms = self._resolve_terms(list(term_stats))
+        
+        resolved: Dict[int, Dict[str, int]] = {}
+        for normalized, stats in term_stats.items():
+            term = terms[normalized]
+            
+            # ブロックされている場合はスキップ
+            if term.is_blocked:
+                metrics.filtered_tokens += stats["occurrences"]
+                continue
+            
+            resolved[term.term_id] = stats
+        return resolved
+    
+    def _save_term_stats(
+        self,
+        term_stats: Dict[int, Dict[str, int]],
+        target_date: date,
+        board_key: str,
+    ) -> None:
+        """集計結果をdaily_term_statsに保存する"""
         for term_id, stats in term_stats.items():
             daily_stats = DailyTermStats(
                 date=target_date,
@@ -167,6 +519,24 @@ class DailyProcessor:
                 thread_hits=stats["thread_hits"],
             )
             self.daily_stats_repo.upsert(daily_stats)
+    
+    def _save_results(
+        self,
+        term_stats: Dict[str, Dict[str, int]],
+        metrics: DailyProcessorMetrics,
+        target_date: date,
+        board_key: str,
+        run_id: Optional[UUID],
+        scraper_stats: Optional[ScraperStats],
+        crawl_coverage: Optional[CrawlCoverage],
+        replace_existing: bool,
+    ) -> None:
+        """集計結果と処理メトリクスをDBに保存する"""
+        # 集計した語彙のterm_idをまとめて取得し、daily_term_statsに保存
+        resolved_stats = self._resolve_term_stats(term_stats, metrics)
+        if replace_existing:
+            self.daily_stats_repo.delete_by_date_and_board(target_date, board_key)
+        self._save_term_stats(resolved_stats, target_date, board_key)
         
         metrics.end_time = datetime.now()
         
@@ -184,8 +554,7 @@ class DailyProcessor:
             filtered_tokens=metrics.filtered_tokens,
             filtered_rate=metrics.filtered_rate,
             duration_sec=metrics.duration_sec,
+            scraper_stats=scraper_stats.summary() if scraper_stats is not None else None,
+            crawl_coverage=crawl_coverage.to_dict() if crawl_coverage is not None else None,
         )
         self.metrics_repo.upsert(pipeline_metrics)
-        
-        return metrics
-
@@ -1,9 +1,21 @@
 from __future__ import annotations
 
-import re
 import unicodedata
+from functools import lru_cache
+from typing import Iterable, List
 
+# 削除する文字（NFKC・小文字化の後に適用する）
+# - 記号：`_` / `-` / `.` / `,` / `:` / `;` / `/` / `\` / `()` / `[]` / `!` / `?`
+#   ただし、日本語の句読点（。、）は残す（必要に応じて削除対象に追加可能）
+# - 長音/波ダッシュ：`ー` / `〜` / `~`
+_DELETE_CHARS = "_-.,:;/\\()[]!?" + "ー〜~"
+_DELETE_TABLE = str.maketrans("", "", _DELETE_CHARS)
 
+# 同じ表層形は1日に何百回も出現するため、正規化の結果をメモする
+NORMALIZE_CACHE_SIZE = 65536
+
+
+@lru_cache(maxsize=NORMALIZE_CACHE_SIZE)
 def normalize_term(term: str) -> str:
     # 正規化ルール:
     # - Unicode正規化：NFKC
@@ -22,18 +34,12 @@ def normalize_term(term: str) -> str:
     # 英字を小文字化
     normalized = normalized.lower()
     
-    # 記号を削除（`_` / `-` / `.` / `,` / `:` / `/` / `\` / `()` / `[]` / `!` / `?` など）
-    # ただし、日本語の句読点（。、）は残す（必要に応じて削除対象に追加可能）
-    normalized = re.sub(r'[_\-\.,:;/\\\(\)\[\]!?]', '', normalized)
-    
-    # 長音/波ダッシュを削除（`ー` / `〜` / `~`）
-    normalized = re.sub(r'[ー〜~]', '', normalized)
+    # 記号・長音/波ダッシュを削除（1回のtranslateでまとめて削除する）
+    normalized = normalized.translate(_DELETE_TABLE)
     
-    # 連続空白を1つに
-    normalized = re.sub(r'\s+', ' ', normalized)
-    
-    # 前後の空白を削除
-    normalized = normalized.strip()
+    # 連続空白を1つにして、前後の空白を削除
+    # （str.split() の空白は正規表現の \s と同じく str.isspace() の文字）
+    normalized = " ".join(normalized.split())
     
     # 1文字語は除外（空文字列を返す）
     if len(normalized) <= 1:
@@ -41,3 +47,7 @@ def normalize_term(term: str) -> str:
     
     return normalized
 
+
+def normalize_terms(terms: Iterable[str]) -> List[str]:
+    # 複数の語をまとめて正規化する（terms と同じ順序。除外された語は空文字列）
+    return [normalize_term(term) for term in terms]
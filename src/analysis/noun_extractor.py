@@ -1,7 +1,8 @@
 from __future__ import annotations
 
+import threading
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional, Tuple
 
 try:
     import MeCab
@@ -11,6 +12,12 @@ except ImportError:
 # NEologd辞書のインストール先（neologd_updater.pyと同じパスを使用）
 from src.utils.neologd_updater import NEOLOGD_DICTIONARY_PATH
 
+# Tagger.parse() の出力フォーマット（1形態素1行の "品詞\t表層形"）
+# extract_nouns() はこの出力だけから名詞を取り出す
+# （MeCabの引数では "\\" が "\" に置き換わるため、フォーマットの "\t" "\n" は "\\t" "\\n" と書く）
+NOUN_OUTPUT_FORMAT = r"--node-format=%f[0]\\t%m\\n --unk-format=%f[0]\\t%m\\n"
+NOUN_LINE_PREFIX = "名詞\t"
+
 
 class NounExtractor:
     def __init__(self, dictionary_path: Optional[str] = None):
@@ -29,11 +36,11 @@ class NounExtractor:
         try:
             if dict_path:
                 # カスタム辞書を指定（mecabrcも明示的に指定）
-                mecab_args = f'-r /etc/mecabrc -d {dict_path}'
+                mecab_args = f'-r /etc/mecabrc -d {dict_path} {NOUN_OUTPUT_FORMAT}'
                 self.tagger = MeCab.Tagger(mecab_args)
             else:
                 # デフォルト設定を使用
-                self.tagger = MeCab.Tagger('-r /etc/mecabrc')
+                self.tagger = MeCab.Tagger(f'-r /etc/mecabrc {NOUN_OUTPUT_FORMAT}')
         except RuntimeError as e:
             raise RuntimeError(
                 "MeCab initialization failed. Make sure MeCab is installed on your system. "
@@ -49,32 +56,73 @@ class NounExtractor:
         if not text:
             return []
         
-        nouns: List[str] = []
-        
         try:
-            # MeCabで形態素解析
-            node = self.tagger.parseToNode(text)
-            
-            while node:
-                # 品詞情報を取得
-                features = node.feature.split(',')
-                
-                # 品詞が「名詞」で始まる場合のみ抽出
-                if len(features) > 0 and features[0] == "名詞":
-                    # 表層形を取得
-                    surface = node.surface
-                    if surface:
-                        nouns.append(surface)
-                
-                node = node.next
+            return self._parse_nouns(text)
         except Exception:
             # トークン化に失敗した場合は空リストを返す
-            pass
-        
-        return nouns
+            return []
+    
+    def _parse_nouns(self, text: str) -> List[str]:
+        # MeCabで形態素解析し、1形態素1行の "品詞\t表層形" から
+        # 行頭の比較だけで名詞の表層形を取り出す（ノードをPythonから1つずつ辿らない）
+        prefix_len = len(NOUN_LINE_PREFIX)
+        return [
+            line[prefix_len:] for line in self.tagger.parse(text).split("\n")
+            if line.startswith(NOUN_LINE_PREFIX) and len(line) > prefix_len
+        ]
+
+
+class NounExtractorRegistry:
+    """辞書パスごとにNounExtractorを1つだけ作って使い回すレジストリ（スレッドセーフ）
+
+    MeCab.Taggerの作成は辞書の読み込みを伴い、NEologdでは数百ミリ秒かかるため、
+    プロセス内で辞書パスごとに1回だけ作成する。
+    Taggerは複数スレッドから同時に解析できないため、解析はNounExtractorごとのロックで直列化する。
+    """
+    
+    # 解析しておく文字列（Taggerの初回の解析で行われる初期化を済ませる）
+    WARM_UP_TEXT = "辞書の読み込みを確認する"
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        # 辞書パス（Noneは自動検出）-> (NounExtractor, 解析用のロック)
+        self._entries: Dict[Optional[str], Tuple[NounExtractor, threading.Lock]] = {}
+    
+    def _entry(self, dictionary_path: Optional[str]) -> Tuple[NounExtractor, threading.Lock]:
+        # 同じ辞書を並行して二重に読み込まないよう、作成中もロックを保持する
+        with self._lock:
+            entry = self._entries.get(dictionary_path)
+            if entry is None:
+                entry = (NounExtractor(dictionary_path=dictionary_path), threading.Lock())
+                self._entries[dictionary_path] = entry
+            return entry
+    
+    def extract_nouns(self, text: str, dictionary_path: Optional[str] = None) -> List[str]:
+        extractor, lock = self._entry(dictionary_path)
+        with lock:
+            return extractor.extract_nouns(text)
+    
+    def warm_up(self, dictionary_path: Optional[str] = None) -> None:
+        # 最初の呼び出しを待たずに辞書を読み込んでおく（起動時に呼び出す）
+        self.extract_nouns(self.WARM_UP_TEXT, dictionary_path)
+    
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+    
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+
+# extract_nouns_from_text() が使うプロセス全体のレジストリ
+_registry = NounExtractorRegistry()
+
 
+def warm_up_noun_extractor(dictionary_path: Optional[str] = None) -> None:
+    _registry.warm_up(dictionary_path)
 
-def extract_nouns_from_text(text: str) -> List[str]:
-    extractor = NounExtractor()
-    return extractor.extract_nouns(text)
 
+def extract_nouns_from_text(text: str, dictionary_path: Optional[str] = None) -> List[str]:
+    # 辞書の読み込みはプロセス内で辞書パスごとに1回だけ行う
+    return _registry.extract_nouns(text, dictionary_path)
@@ -0,0 +1,65 @@
+"""保存した名詞抽出の結果から daily_term_stats を作り直すコマンド
+
+実行方法（リポジトリのルートで）:
+    python -m src.analysis.reprocess --board prog --start 2025-01-01 --end 2025-01-31
+
+正規化ルールやブロックリストを変更した後に、日次処理で TokenStore に記録した名詞から
+正規化と集計だけをやり直す（スクレイピング・名詞抽出は行わない）。
+"""
+from __future__ import annotations
+
+import argparse
+import logging
+import os
+from datetime import date
+
+from src.analysis.daily_processor import DailyProcessor
+from src.analysis.token_store import TokenStore
+from src.database.session import get_db
+
+logger = logging.getLogger(__name__)
+
+# 日次DAGが名詞抽出の結果を記録するファイル
+DEFAULT_TOKEN_STORE_PATH = os.path.join(
+    os.getenv("SCRAPING_DATA_DIR", "/opt/airflow/data"), "token_store.sqlite3"
+)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--board", required=True, help='板キー（例: "prog"）')
+    parser.add_argument("--start", required=True, type=date.fromisoformat)
+    parser.add_argument("--end", required=True, type=date.fromisoformat)
+    parser.add_argument("--token-store", default=DEFAULT_TOKEN_STORE_PATH)
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if not os.path.exists(args.token_store):
+        raise SystemExit(f"TokenStoreが見つかりません: {args.token_store}")
+
+    with TokenStore(args.token_store) as token_store:
+        target_dates = token_store.dates(args.board, args.start, args.end)
+        if not target_dates:
+            logger.warning(
+                f"期間内に記録された投稿がありません: board={args.board}, "
+                f"{args.start}〜{args.end}"
+            )
+
+        # 日付ごとにコミットする（途中で失敗しても処理済みの日付はそのまま残る）
+        for target_date in target_dates:
+            with get_db() as session:
+                processor = DailyProcessor(session)
+                metrics = processor.reprocess(target_date, args.board, token_store)
+                session.commit()
+
+            logger.info(
+                f"再集計完了: date={target_date}, board={args.board}, "
+                f"fetched_posts={metrics.fetched_posts}, "
+                f"total_tokens={metrics.total_tokens}, "
+                f"filtered_tokens={metrics.filtered_tokens}"
+            )
+
+
+if __name__ == "__main__":
+    main()
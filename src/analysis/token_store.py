@@ -0,0 +1,191 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import sqlite3
+import threading
+from datetime import date
+from pathlib import Path
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
+
+from src.analysis.tokenize_pool import NounCounts
+from src.utils.neologd_updater import NeologdUpdater
+
+# NEologdがインストールされていない場合（システム辞書で解析した場合）の辞書バージョン
+SYSTEM_DICTIONARY_VERSION = "system"
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tokens (
+    content_hash BLOB NOT NULL,
+    dictionary_version TEXT NOT NULL,
+    nouns TEXT NOT NULL,
+    PRIMARY KEY (content_hash, dictionary_version)
+);
+CREATE TABLE IF NOT EXISTS posts (
+    date TEXT NOT NULL,
+    board_key TEXT NOT NULL,
+    seq INTEGER NOT NULL,
+    thread_path TEXT NOT NULL,
+    content_hash BLOB NOT NULL,
+    dictionary_version TEXT NOT NULL,
+    PRIMARY KEY (date, board_key, seq)
+);
+"""
+
+
+def current_dictionary_version() -> str:
+    # NeologdUpdaterが記録しているNEologdのバージョン（未インストールの場合はシステム辞書）
+    return NeologdUpdater().get_current_version() or SYSTEM_DICTIONARY_VERSION
+
+
+class TokenStore:
+    """投稿ごとの名詞抽出の結果をSQLiteに保存するストア（スレッドセーフ）
+
+    名詞の出現回数は「本文のハッシュ × 辞書バージョン」ごとに1件だけ保存し、
+    日付・板ごとに、処理した投稿の順序（スレッド・本文のハッシュ）を記録する。
+    正規化ルールやブロックリストを変更した場合は、保存した名詞から
+    正規化と集計だけをやり直して daily_term_stats を作り直せる（再取得・再解析は不要）。
+
+    テーブル:
+      tokens (content_hash, dictionary_version) -> nouns（名詞ごとの出現回数のJSON）
+      posts  (date, board_key, seq) -> thread_path, content_hash, dictionary_version
+    """
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        dictionary_version: Optional[str] = None,
+    ):
+        self.path = Path(path)
+        self.dictionary_version = (
+            dictionary_version if dictionary_version is not None
+            else current_dictionary_version()
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._lock = threading.Lock()
+        # 複数の板を並行して処理するスレッドから共有する（書き込みは_lockで直列化する）
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        with self._lock:
+            self._conn.executescript(_SCHEMA)
+            self._conn.commit()
+
+    @staticmethod
+    def _key(content: str) -> bytes:
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+    def begin_day(self, target_date: date, board_key: str) -> None:
+        # 日付・板の記録を消して最初から記録し直す（リトライ・再実行時に二重に記録しない）
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM posts WHERE date = ? AND board_key = ?",
+                (target_date.isoformat(), board_key),
+            )
+            self._conn.commit()
+
+    def record_thread(
+        self,
+        target_date: date,
+        board_key: str,
+        thread_path: str,
+        contents: Sequence[str],
+        tokenized: Sequence[Optional[NounCounts]],
+    ) -> None:
+        """
+        1スレッド分の投稿の名詞抽出の結果を記録する。
+
+        Parameters
+        ----------
+        target_date : date
+            対象日付
+        board_key : str
+            板キー
+        thread_path : str
+            スレッドのパス
+        contents : Sequence[str]
+            投稿本文
+        tokenized : Sequence[Optional[NounCounts]]
+            contents と同じ順序の、投稿ごとの名詞の出現回数（名詞抽出に失敗した投稿は None）
+        """
+        day = target_date.isoformat()
+        version = self.dictionary_version
+        token_rows = []
+        post_keys = []
+        for content, noun_counts in zip(contents, tokenized):
+            key = self._key(content)
+            post_keys.append(key)
+            if noun_counts is not None:
+                token_rows.append(
+                    (key, version, json.dumps(noun_counts, ensure_ascii=False))
+                )
+
+        with self._lock:
+            next_seq = self._conn.execute(
+                "SELECT COALESCE(MAX(seq) + 1, 0) FROM posts WHERE date = ? AND board_key = ?",
+                (day, board_key),
+            ).fetchone()[0]
+            self._conn.executemany(
+                "INSERT OR IGNORE INTO tokens VALUES (?, ?, ?)", token_rows
+            )
+            # 名詞抽出に失敗した投稿も記録する（tokensに対応する行がないため失敗として数え直す）
+            self._conn.executemany(
+                "INSERT INTO posts VALUES (?, ?, ?, ?, ?, ?)",
+                [
+                    (day, board_key, next_seq + i, thread_path, key, version)
+                    for i, key in enumerate(post_keys)
+                ],
+            )
+            self._conn.commit()
+
+    def iter_threads(
+        self, target_date: date, board_key: str
+    ) -> Iterator[Tuple[str, List[Optional[NounCounts]]]]:
+        """
+        記録した順に (スレッドのパス, 投稿ごとの名詞の出現回数) を返す。
+
+        名詞は投稿を記録したときの辞書バージョンで抽出した結果を返す。
+        名詞抽出に失敗した投稿は None になる。
+        """
+        with self._lock:
+            rows = self._conn.execute(
+                """
+                SELECT posts.thread_path, tokens.nouns
+                FROM posts
+                LEFT JOIN tokens
+                  ON tokens.content_hash = posts.content_hash
+                 AND tokens.dictionary_version = posts.dictionary_version
+                WHERE posts.date = ? AND posts.board_key = ?
+                ORDER BY posts.seq
+                """,
+                (target_date.isoformat(), board_key),
+            ).fetchall()
+
+        thread_path: Optional[str] = None
+        tokenized: List[Optional[NounCounts]] = []
+        for path, nouns in rows:
+            if path != thread_path:
+                if thread_path is not None:
+                    yield thread_path, tokenized
+                thread_path, tokenized = path, []
+            tokenized.append(json.loads(nouns) if nouns is not None else None)
+        if thread_path is not None:
+            yield thread_path, tokenized
+
+    def dates(self, board_key: str, start_date: date, end_date: date) -> List[date]:
+        # 期間内で投稿を記録した日付
+        with self._lock:
+            rows = self._conn.execute(
+                "SELECT DISTINCT date FROM posts "
+                "WHERE board_key = ? AND date >= ? AND date <= ? ORDER BY date",
+                (board_key, start_date.isoformat(), end_date.isoformat()),
+            ).fetchall()
+        return [date.fromisoformat(row[0]) for row in rows]
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,57 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Optional
+
+from src.analysis.tokenize_pool import NounCounts
+
+DEFAULT_MAX_ENTRIES = 50_000
+
+
+class TokenizeMemo:
+    """投稿本文のハッシュをキーに、名詞抽出の結果を保持するLRUキャッシュ（スレッドセーフ）
+
+    5chではテンプレ・AA・コピペが同じ本文のまま多数のスレッドに投稿されるため、
+    同じ本文の名詞抽出（MeCabの解析）を1回だけにする。
+    キーは本文そのものではなく blake2b の128bitダイジェストにして、長いAAでもメモリを抑える。
+    max_entries を超えたら、最も長く使われていない結果から削除する。
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if max_entries <= 0:
+            raise ValueError(f"max_entries must be positive: {max_entries}")
+
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[bytes, NounCounts]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _key(content: str) -> bytes:
+        return hashlib.blake2b(content.encode("utf-8"), digest_size=16).digest()
+
+    def get(self, content: str) -> Optional[NounCounts]:
+        # 記録済みの本文なら名詞の出現回数を返す（呼び出し側で変更しないこと）
+        key = self._key(content)
+        with self._lock:
+            noun_counts = self._entries.get(key)
+            if noun_counts is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return noun_counts
+
+    def put(self, content: str, noun_counts: NounCounts) -> None:
+        key = self._key(content)
+        with self._lock:
+            self._entries[key] = noun_counts
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def __len__(self) -> int:
+        return len(self._entries)
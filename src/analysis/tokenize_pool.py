@@ -0,0 +1,152 @@
+from __future__ import annotations
+
+import multiprocessing
+from collections import Counter, deque
+from concurrent.futures import Future, ProcessPoolExecutor
+from multiprocessing.context import BaseContext
+from typing import Deque, Dict, Iterable, Iterator, List, Optional, Tuple, TypeVar
+
+from src.analysis.noun_extractor import NounExtractor
+
+# スレッドごとの投稿の型（CollectedPost のリストなど。ワーカーには本文だけを送る）
+T = TypeVar("T")
+
+# 投稿ごとの名詞と出現回数（投稿内で最初に出現した順）。名詞抽出に失敗した投稿は None
+NounCounts = Dict[str, int]
+
+DEFAULT_CHUNK_POSTS = 500
+
+# ワーカーの起動方式。スクレイピングのスレッドが動いているプロセスから fork すると、
+# 他スレッドが保持していたロック（logging・urllib3 など）を保持したままの状態が
+# ワーカーに複製されてデッドロックしうるため、既定では forkserver を使う
+DEFAULT_START_METHOD = "forkserver"
+
+
+# ワーカープロセスごとに1つだけ作るNounExtractor（MeCabの辞書読み込みはワーカーの起動時に1回だけ）
+_worker_extractor: Optional[NounExtractor] = None
+
+
+def count_nouns(nouns: Iterable[str]) -> NounCounts:
+    # 名詞リストを名詞ごとの出現回数にまとめる（Counterは最初に出現した順を保つ）
+    return dict(Counter(nouns))
+
+
+def _init_worker(dictionary_path: Optional[str]) -> None:
+    global _worker_extractor
+    _worker_extractor = NounExtractor(dictionary_path=dictionary_path)
+
+
+def _tokenize_chunk(chunk: List[List[str]]) -> List[List[Optional[NounCounts]]]:
+    # スレッドごとの投稿本文から、投稿ごとの名詞の出現回数を返す（ワーカープロセスで実行）
+    results: List[List[Optional[NounCounts]]] = []
+    for contents in chunk:
+        thread_results: List[Optional[NounCounts]] = []
+        for content in contents:
+            try:
+                thread_results.append(count_nouns(_worker_extractor.extract_nouns(content)))
+            except Exception:
+                thread_results.append(None)
+        results.append(thread_results)
+    return results
+
+
+class TokenizePool:
+    """名詞抽出を複数のワーカープロセスで並行して行うプール
+
+    各ワーカーは起動時に NounExtractor（MeCab.Tagger）を1つ作り、以降の名詞抽出で使い回す。
+    スレッド単位の投稿を chunk_posts 件程度ずつまとめてワーカーに送り、
+    投稿ごとの名詞の出現回数（dict）を受け取る。
+    mp_context を省略した場合、ワーカーは forkserver で起動する（スレッドから fork しない）。
+
+    結果は必ず受け取ったスレッドの順序で返すため、
+    post_hits / thread_hits の集計は1プロセスで処理した場合と同じになる。
+    同時にワーカーへ送るチャンクは max_workers * 2 件までのため、
+    ジェネレータから受け取る場合もメモリに載る投稿数は一定に抑えられる。
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        dictionary_path: Optional[str] = None,
+        chunk_posts: int = DEFAULT_CHUNK_POSTS,
+        mp_context: Optional[BaseContext] = None,
+    ):
+        if max_workers <= 0:
+            raise ValueError(f"max_workers must be positive: {max_workers}")
+        if chunk_posts <= 0:
+            raise ValueError(f"chunk_posts must be positive: {chunk_posts}")
+
+        self.max_workers = max_workers
+        self.chunk_posts = chunk_posts
+        self._executor = ProcessPoolExecutor(
+            max_workers=max_workers,
+            mp_context=mp_context or multiprocessing.get_context(DEFAULT_START_METHOD),
+            initializer=_init_worker,
+            initargs=(dictionary_path,),
+        )
+
+    def _iter_chunks(
+        self, threads: Iterable[Tuple[T, List[str]]]
+    ) -> Iterator[Tuple[List[T], List[List[str]]]]:
+        # 投稿数が chunk_posts 以上になるまでスレッドをまとめる（スレッドは分割しない）
+        keys: List[T] = []
+        chunk: List[List[str]] = []
+        num_posts = 0
+        for key, contents in threads:
+            keys.append(key)
+            chunk.append(contents)
+            num_posts += len(contents)
+            if num_posts >= self.chunk_posts:
+                yield keys, chunk
+                keys, chunk, num_posts = [], [], 0
+        if chunk:
+            yield keys, chunk
+
+    def map_threads(
+        self, threads: Iterable[Tuple[T, List[str]]]
+    ) -> Iterator[Tuple[T, List[Optional[NounCounts]]]]:
+        """
+        (キー, 投稿本文のリスト) をスレッドごとに受け取り、
+        (キー, 投稿ごとの名詞の出現回数のリスト) を受け取った順に返す。
+
+        Parameters
+        ----------
+        threads : Iterable[Tuple[T, List[str]]]
+            スレッドごとのキー（呼び出し側で結果と対応付ける値）と投稿本文
+
+        Returns
+        -------
+        Iterator[Tuple[T, List[Optional[NounCounts]]]]
+            キーと、投稿本文と同じ順序の名詞の出現回数（名詞抽出に失敗した投稿は None）
+        """
+        pending: Deque[Tuple[List[T], Future]] = deque()
+        chunk_iter = self._iter_chunks(threads)
+
+        def submit_next() -> None:
+            item = next(chunk_iter, None)
+            if item is not None:
+                keys, chunk = item
+                pending.append((keys, self._executor.submit(_tokenize_chunk, chunk)))
+
+        try:
+            for _ in range(self.max_workers * 2):
+                submit_next()
+
+            while pending:
+                keys, future = pending.popleft()
+                results = future.result()
+                submit_next()
+                yield from zip(keys, results)
+        finally:
+            # 中断（またはエラー）時は未着手のチャンクをキャンセルする
+            for _, future in pending:
+                future.cancel()
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -15,6 +15,7 @@ from src.database.repositories import (
     TermRegressionResultRepository,
     PipelineMetricsDailyRepository,
 )
+from src.database.term_cache import TermCache, get_shared_term_cache
 
 __all__ = [
     "PipelineRun",
@@ -31,5 +32,7 @@ __all__ = [
     "WeeklyTermTrendsRepository",
     "TermRegressionResultRepository",
     "PipelineMetricsDailyRepository",
+    "TermCache",
+    "get_shared_term_cache",
 ]
 
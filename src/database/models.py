@@ -251,6 +251,10 @@ class PipelineMetricsDaily(Base):
     total_tokens: Mapped[int] = mapped_column(Integer, nullable=False)
     filtered_rate: Mapped[float] = mapped_column(Double, nullable=False)
     duration_sec: Mapped[int] = mapped_column(Integer, nullable=False)
+    # スクレイピングのリクエスト計測の集計（ScraperStats.summary()）
+    scraper_stats: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
+    # 時間予算付きの巡回の網羅状況（CrawlCoverage.to_dict()）
+    crawl_coverage: Mapped[Optional[dict]] = mapped_column(JSONB, nullable=True)
     created_at: Mapped[datetime] = mapped_column(
         server_default=func.now(),
         nullable=False,
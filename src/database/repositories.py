@@ -1,8 +1,9 @@
 from datetime import date
-from typing import Optional
+from typing import Dict, Iterable, List, Optional, Set, Tuple
 from uuid import UUID
 
-from sqlalchemy import and_, desc, func
+from sqlalchemy import Text, and_, any_, desc, event, func, literal
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session
 
 from src.database.models import (
@@ -13,6 +14,7 @@ from src.database.models import (
     TermRegressionResult,
     WeeklyTermTrends,
 )
+from src.database.term_cache import CachedTerm, TermCache, get_shared_term_cache
 
 
 class PipelineRunRepository:
@@ -70,9 +72,16 @@ class PipelineRunRepository:
         ).all()
 
 
+# resolve_many() で1回のINSERT / SELECTに含める語の数
+RESOLVE_CHUNK_SIZE = 1000
+
+
 class TermRepository:
-    def __init__(self, session: Session):
+    def __init__(self, session: Session, term_cache: Optional[TermCache] = None):
         self.session = session
+        # update_blocked() で変更した語はこのキャッシュから削除する
+        # （指定しない場合はプロセス全体で共有するキャッシュ）
+        self.term_cache = term_cache if term_cache is not None else get_shared_term_cache()
     
     def create(self, term: Term) -> Term:
         self.session.add(term)
@@ -96,6 +105,105 @@ class TermRepository:
             self.create(term)
         return term
     
+    def resolve_many(
+        self,
+        normalized_strings: Iterable[str],
+        chunk_size: int = RESOLVE_CHUNK_SIZE,
+    ) -> Dict[str, Term]:
+        # 正規化後の語をまとめてTermに対応付ける（存在しない語は作成する）
+        # 存在しない語だけを INSERT ... ON CONFLICT (normalized) DO NOTHING で作成するため、
+        # 複数の板を並行して処理していても一意制約違反にならない
+        terms, _ = self._resolve(list(dict.fromkeys(normalized_strings)), chunk_size)
+        return terms
+    
+    def resolve_cached(
+        self,
+        normalized_strings: Iterable[str],
+        chunk_size: int = RESOLVE_CHUNK_SIZE,
+    ) -> Dict[str, CachedTerm]:
+        # resolve_many() と同じく語をまとめて対応付けるが、term_cacheにある語はDBに問い合わせない
+        vocabulary = list(dict.fromkeys(normalized_strings))
+        cached = self.term_cache.get_many(vocabulary)
+        missing = [normalized for normalized in vocabulary if normalized not in cached]
+        terms, created = self._resolve(missing, chunk_size)
+        
+        resolved: Dict[str, CachedTerm] = {}
+        for normalized in vocabulary:
+            if normalized in cached:
+                resolved[normalized] = cached[normalized]
+                continue
+            term = terms[normalized]
+            resolved[normalized] = CachedTerm(term_id=term.term_id, is_blocked=term.is_blocked)
+            # このトランザクションで作成した語は、ロールバックされる場合があるためキャッシュしない
+            # （次回の実行で warm_load される）
+            if normalized not in created:
+                self.term_cache.put(normalized, term.term_id, term.is_blocked)
+        return resolved
+    
+    def _resolve(
+        self,
+        vocabulary: List[str],
+        chunk_size: int,
+    ) -> Tuple[Dict[str, Term], Set[str]]:
+        # (語 -> Term, このトランザクションで作成した語) を返す
+        if not vocabulary:
+            return {}, set()
+        
+        dialect = self.session.get_bind().dialect.name
+        insert = postgresql.insert if dialect == "postgresql" else sqlite.insert
+        
+        # 既存の語を先に取得し、存在しない語だけをINSERTする
+        terms = self._select_terms(vocabulary, chunk_size, dialect)
+        missing = sorted(normalized for normalized in vocabulary if normalized not in terms)
+        
+        # 複数の板を並行して処理する場合に、トランザクション同士が互いの語の行ロックを
+        # 逆順に待ってデッドロックしないよう、INSERTする語は正規化後の語の順に並べる
+        # （ON CONFLICT DO NOTHING で衝突した語もシーケンスを消費するため、term_idは連番にならない）
+        created: Set[str] = set()
+        for i in range(0, len(missing), chunk_size):
+            result = self.session.execute(
+                insert(Term)
+                .values([{"normalized": normalized} for normalized in missing[i:i + chunk_size]])
+                .on_conflict_do_nothing(index_elements=["normalized"])
+                .returning(Term.normalized)
+            )
+            created.update(result.scalars())
+        
+        # 作成した語と、他のトランザクションが先に作成した語を取得する
+        if missing:
+            terms.update(self._select_terms(missing, chunk_size, dialect))
+        return terms, created
+    
+    def _select_terms(
+        self,
+        vocabulary: List[str],
+        chunk_size: int,
+        dialect: str,
+    ) -> Dict[str, Term]:
+        # 語彙のうちDBに存在する語を chunk_size 件ずつ取得する
+        terms: Dict[str, Term] = {}
+        for i in range(0, len(vocabulary), chunk_size):
+            chunk = vocabulary[i:i + chunk_size]
+            if dialect == "postgresql":
+                condition = Term.normalized == any_(
+                    literal(chunk, postgresql.ARRAY(Text))
+                )
+            else:
+                condition = Term.normalized.in_(chunk)
+            for term in self.session.query(Term).filter(condition):
+                terms[term.normalized] = term
+        return terms
+    
+    def get_recently_active(self, since: date, limit: int) -> list[Term]:
+        # since以降に出現した語を、出現したレス数の少ない順に返す（TermCacheのwarm_load用）
+        post_hits = func.sum(DailyTermStats.post_hits)
+        rows = self.session.query(Term).join(
+            DailyTermStats, DailyTermStats.term_id == Term.term_id
+        ).filter(
+            DailyTermStats.date >= since
+        ).group_by(Term.term_id).order_by(desc(post_hits)).limit(limit).all()
+        return list(reversed(rows))
+    
     def update_blocked(
         self,
         term_id: int,
@@ -107,6 +215,16 @@ class TermRepository:
             term.is_blocked = is_blocked
             term.blocked_reason = blocked_reason
             self.session.flush()
+            # コミットまでの間に他のスレッドが変更前の値をキャッシュし直す場合があるため、
+            # コミット後にもう一度削除する
+            normalized = term.normalized
+            self.term_cache.invalidate(normalized)
+            event.listen(
+                self.session,
+                "after_commit",
+                lambda session: self.term_cache.invalidate(normalized),
+                once=True,
+            )
         return term
 
 
@@ -155,6 +273,16 @@ class DailyTermStatsRepository:
         else:
             return self.create(stats)
     
+    def delete_by_date_and_board(self, target_date: date, board_key: str) -> int:
+        deleted = self.session.query(DailyTermStats).filter(
+            and_(
+                DailyTermStats.date == target_date,
+                DailyTermStats.board_key == board_key,
+            )
+        ).delete(synchronize_session=False)
+        self.session.flush()
+        return deleted
+    
     def get_weekly_aggregation(
         self,
         start_date: date,
@@ -360,6 +488,11 @@ class PipelineMetricsDailyRepository:
             existing.total_tokens = metrics.total_tokens
             existing.filtered_rate = metrics.filtered_rate
             existing.duration_sec = metrics.duration_sec
+            # リプレイ（リクエストを行わない再処理）では計測値がないため、元の巡回の値を残す
+            if metrics.scraper_stats is not None:
+                existing.scraper_stats = metrics.scraper_stats
+            if metrics.crawl_coverage is not None:
+                existing.crawl_coverage = metrics.crawl_coverage
             self.session.flush()
             return existing
         else:
@@ -0,0 +1,112 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+from src.database.models import Term
+
+DEFAULT_MAX_ENTRIES = 200_000
+
+
+@dataclass(frozen=True)
+class CachedTerm:
+    # キャッシュする terms の行（集計に必要な term_id と is_blocked だけ）
+    term_id: int
+    is_blocked: bool
+
+
+class TermCache:
+    """正規化後の語 -> (term_id, is_blocked) をプロセス内に保持するLRUキャッシュ（スレッドセーフ）
+
+    日次処理の開始時に最近出現した語を読み込み（warm_load）、語彙の解決はキャッシュにない語だけ
+    DBに問い合わせる。max_entries を超えたら最も長く使われていない語から削除するため、
+    terms テーブルが大きくなってもメモリ使用量は一定に抑えられる。
+
+    TermRepository.update_blocked() で語のブロック状態を変更すると、その語は変更時とコミット後に
+    キャッシュから削除される。
+    別のプロセスでの変更は反映されないが、日次処理はタスクごとに別プロセスで起動して
+    読み込み直すため、前回の実行までの変更は反映される。
+    """
+
+    def __init__(self, max_entries: int = DEFAULT_MAX_ENTRIES):
+        if max_entries <= 0:
+            raise ValueError(f"max_entries must be positive: {max_entries}")
+
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, CachedTerm]" = OrderedDict()
+        self.warmed = False
+        self.hits = 0
+        self.misses = 0
+
+    def get_many(self, normalized_strings: Iterable[str]) -> Dict[str, CachedTerm]:
+        # キャッシュにある語だけを返す
+        found: Dict[str, CachedTerm] = {}
+        with self._lock:
+            for normalized in normalized_strings:
+                term = self._entries.get(normalized)
+                if term is None:
+                    self.misses += 1
+                    continue
+                self._entries.move_to_end(normalized)
+                self.hits += 1
+                found[normalized] = term
+        return found
+
+    def get(self, normalized: str) -> Optional[CachedTerm]:
+        return self.get_many([normalized]).get(normalized)
+
+    def put(self, normalized: str, term_id: int, is_blocked: bool) -> None:
+        with self._lock:
+            self._put(normalized, CachedTerm(term_id=term_id, is_blocked=is_blocked))
+
+    def _put(self, normalized: str, term: CachedTerm) -> None:
+        # ロックを取得した状態で呼び出す
+        self._entries[normalized] = term
+        self._entries.move_to_end(normalized)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def warm_load(self, terms: Iterable[Term]) -> int:
+        # 最近出現した語をまとめて読み込む（よく使われる語ほど後に渡すと削除されにくい）
+        loaded = 0
+        with self._lock:
+            for term in terms:
+                self._put(
+                    term.normalized,
+                    CachedTerm(term_id=term.term_id, is_blocked=term.is_blocked),
+                )
+                loaded += 1
+            self.warmed = True
+        return loaded
+
+    def invalidate(self, normalized: str) -> None:
+        with self._lock:
+            self._entries.pop(normalized, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.warmed = False
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._entries)
+
+    def summary(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "entries": len(self._entries),
+            }
+
+
+# プロセス全体で共有するキャッシュ（update_blocked() による削除を日次処理にも反映するため）
+_shared_term_cache = TermCache()
+
+
+def get_shared_term_cache() -> TermCache:
+    return _shared_term_cache
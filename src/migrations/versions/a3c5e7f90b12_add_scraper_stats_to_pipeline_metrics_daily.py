@@ -0,0 +1,32 @@
+"""add scraper_stats to pipeline_metrics_daily
+
+Revision ID: a3c5e7f90b12
+Revises: 79f81805fb52
+Create Date: 2026-10-17 12:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a3c5e7f90b12'
+down_revision: Union[str, Sequence[str], None] = '79f81805fb52'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'pipeline_metrics_daily',
+        sa.Column('scraper_stats', postgresql.JSONB(astext_type=sa.Text()), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('pipeline_metrics_daily', 'scraper_stats')
@@ -0,0 +1,32 @@
+"""add crawl_coverage to pipeline_metrics_daily
+
+Revision ID: c7d2e4a61f35
+Revises: a3c5e7f90b12
+Create Date: 2026-10-17 15:00:00.000000
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7d2e4a61f35'
+down_revision: Union[str, Sequence[str], None] = 'a3c5e7f90b12'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column(
+        'pipeline_metrics_daily',
+        sa.Column('crawl_coverage', postgresql.JSONB(astext_type=sa.Text()), nullable=True)
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('pipeline_metrics_daily', 'crawl_coverage')
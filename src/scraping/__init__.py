@@ -1,12 +1,22 @@
 from src.scraping.scraper import Scraper
-from src.scraping.parser import ThreadInfo, PostInfo, parse_board_page, parse_thread_page
+from src.scraping.archive import RawHtmlArchive, ReplayScraper
+from src.scraping.parser import (
+    ThreadInfo,
+    PostInfo,
+    parse_board_page,
+    parse_subject_txt,
+    parse_thread_page,
+)
 from src.scraping import utils
 
 __all__ = [
     'Scraper',
+    'RawHtmlArchive',
+    'ReplayScraper',
     'ThreadInfo',
     'PostInfo',
     'parse_board_page',
+    'parse_subject_txt',
     'parse_thread_page',
     'utils',
 ]
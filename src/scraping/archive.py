@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+DEFAULT_COMPRESSION_LEVEL = 10
+
+
+def _require_zstandard() -> None:
+    if zstandard is None:
+        raise ImportError(
+            "zstandard is not installed. Install it with: pip install zstandard"
+        )
+
+
+class RawHtmlArchive:
+    """取得したページの生バイト列をzstd圧縮して内容アドレス方式で保存するアーカイブ
+
+    ディレクトリ構成:
+      objects/<sha256の先頭2文字>/<sha256>.zst  ページ本体（同一内容は1つだけ保存）
+      manifests/<run_name>.json                  実行ごとの URL -> sha256 の対応表
+    """
+
+    def __init__(
+        self,
+        root_dir: Union[str, Path],
+        compression_level: int = DEFAULT_COMPRESSION_LEVEL,
+    ):
+        _require_zstandard()
+        self.root_dir = Path(root_dir)
+        self.compression_level = compression_level
+
+    def _object_path(self, digest: str) -> Path:
+        return self.root_dir / "objects" / digest[:2] / f"{digest}.zst"
+
+    def _manifest_path(self, run_name: str) -> Path:
+        return self.root_dir / "manifests" / f"{run_name}.json"
+
+    def put(self, data: bytes) -> str:
+        # 内容のsha256をキーに保存し、キーを返す（保存済みの内容は書き込まない）
+        digest = hashlib.sha256(data).hexdigest()
+        path = self._object_path(digest)
+        if path.exists():
+            return digest
+
+        compressed = zstandard.ZstdCompressor(level=self.compression_level).compress(data)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        # 並行して同じ内容を書き込んでも壊れないよう、スレッドごとの一時ファイルから置き換える
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+        with open(tmp_path, "wb") as f:
+            f.write(compressed)
+        os.replace(tmp_path, path)
+        return digest
+
+    def get(self, digest: str) -> bytes:
+        with open(self._object_path(digest), "rb") as f:
+            return zstandard.ZstdDecompressor().decompress(f.read())
+
+    def open_run(self, run_name: str, resume: bool = False) -> "ArchiveRun":
+        # 新しい実行の記録を開始する（同名のマニフェストは保存時に上書きされる）
+        # resume=True の場合は保存済みのマニフェストがあればその続きに記録する
+        if resume and self._manifest_path(run_name).exists():
+            return self.load_run(run_name)
+        return ArchiveRun(self, run_name)
+
+    def load_run(self, run_name: str) -> "ArchiveRun":
+        # 保存済みのマニフェストを読み込む（リプレイ用）
+        path = self._manifest_path(run_name)
+        if not path.exists():
+            raise FileNotFoundError(f"Archive manifest not found: {path}")
+
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return ArchiveRun(self, run_name, entries=data["entries"])
+
+    def list_runs(self) -> List[str]:
+        manifest_dir = self.root_dir / "manifests"
+        if not manifest_dir.exists():
+            return []
+        return sorted(path.stem for path in manifest_dir.glob("*.json"))
+
+
+class ArchiveRun:
+    """1回の収集で取得したページの記録（マニフェスト）"""
+
+    def __init__(
+        self,
+        archive: RawHtmlArchive,
+        run_name: str,
+        entries: Optional[List[Dict[str, object]]] = None,
+    ):
+        self.archive = archive
+        self.run_name = run_name
+        self._lock = threading.Lock()
+        # 取得順の {"url", "sha256", "size", "fetched_at"} のリスト
+        self._entries: List[Dict[str, object]] = list(entries or [])
+        # URL -> 最後に取得した内容のsha256（取得順。getでマニフェストを走査しないための索引）
+        self._digests: Dict[str, str] = {}
+        for entry in self._entries:
+            self._digests[entry["url"]] = entry["sha256"]
+
+    def record(self, url: str, data: bytes) -> str:
+        digest = self.archive.put(data)
+        entry = {
+            "url": url,
+            "sha256": digest,
+            "size": len(data),
+            "fetched_at": datetime.now(timezone.utc).isoformat(),
+        }
+        with self._lock:
+            self._entries.append(entry)
+            self._digests[url] = digest
+        return digest
+
+    def urls(self) -> List[str]:
+        # 記録されたURLを取得順に重複なく返す
+        with self._lock:
+            return list(self._digests)
+
+    def get(self, url: str) -> Optional[bytes]:
+        # 同じURLを複数回取得した場合は最後に取得した内容を返す
+        with self._lock:
+            digest = self._digests.get(url)
+        if digest is None:
+            return None
+        return self.archive.get(digest)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def save(self) -> None:
+        with self._lock:
+            data = {"run_name": self.run_name, "entries": list(self._entries)}
+
+        path = self.archive._manifest_path(self.run_name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_name(path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+
+
+# スレッドのページURL（/l50, /{start}-{end} など）からスレッドのURLを取り出す
+_THREAD_URL_PATTERN = re.compile(r'^(.*?/test/read\.cgi/[^/]+/[^/]+)(?:/|$)')
+
+
+class ReplayScraper:
+    """アーカイブからページを返す Scraper 互換のオブジェクト（ネットワークには接続しない）"""
+
+    def __init__(self, run: ArchiveRun):
+        self.run = run
+        # スレッドのURL -> 記録されたそのスレッドのページURL（取得順）
+        # スレッドごとにマニフェスト全体を走査しないよう、リプレイ開始時に1回だけ作る
+        self._thread_pages: Dict[str, List[str]] = {}
+        for url in run.urls():
+            match = _THREAD_URL_PATTERN.match(url)
+            if match:
+                self._thread_pages.setdefault(match.group(1), []).append(url)
+
+    def thread_page_urls(self, thread_url: str) -> List[str]:
+        # 記録されたスレッドのページURL（記録時に巡回しなかったスレッドは空）
+        return list(self._thread_pages.get(thread_url, ()))
+
+    def fetch_bytes(self, url: str) -> Optional[bytes]:
+        # アーカイブにないページは取得できなかったもの（None）として扱う
+        return self.run.get(url)
+
+    def fetch(self, url: str, encoding: str = 'cp932') -> Optional[str]:
+        data = self.fetch_bytes(url)
+        if data is None:
+            return None
+        return data.decode(encoding, errors="replace")
+
+    def close(self) -> None:
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import json
+import logging
+import threading
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, List, Optional, Union
+
+from src.scraping.parser import PostInfo, ThreadInfo, parse_post_datetime
+
+logger = logging.getLogger(__name__)
+
+
+def _post_to_record(post: PostInfo) -> dict:
+    record = asdict(post)
+    # 投稿日時はJSONにそのまま書けないため date から復元し、記録しない
+    del record["posted_at"]
+    return record
+
+
+def _post_from_record(record: dict) -> PostInfo:
+    return PostInfo(**record, posted_at=parse_post_datetime(record["date"]))
+
+
+class CollectionCheckpoint:
+    """1回の収集（run_id）の途中経過をJSONLファイルに記録するチェックポイント
+
+    1行目にスレッド一覧、以降は取得が完了したスレッドごとに解析済みの投稿を追記する。
+    リトライ時はスレッド一覧と取得済みのスレッドを読み込み、未取得のスレッドから再開する。
+    """
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._threads: Optional[List[ThreadInfo]] = None
+        self._posts: Dict[str, List[PostInfo]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        if not self.path.exists():
+            return
+
+        with open(self.path, "r", encoding="utf-8") as f:
+            for line_no, line in enumerate(f, start=1):
+                try:
+                    record = json.loads(line)
+                    if record["type"] == "threads":
+                        self._threads = [ThreadInfo(**t) for t in record["threads"]]
+                    elif record["type"] == "thread":
+                        self._posts[record["path"]] = [
+                            _post_from_record(p) for p in record["posts"]
+                        ]
+                except Exception as e:
+                    # 書き込み途中で中断された行は無視する（そのスレッドは取得し直す）
+                    logger.warning(
+                        f"チェックポイントの読み込みに失敗: {self.path}:{line_no}: {e}"
+                    )
+
+    def _append(self, record: dict) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    @property
+    def threads(self) -> Optional[List[ThreadInfo]]:
+        return self._threads
+
+    def save_threads(self, threads: List[ThreadInfo]) -> None:
+        with self._lock:
+            self._threads = list(threads)
+            self._append({
+                "type": "threads",
+                "threads": [asdict(thread) for thread in threads],
+            })
+
+    def get(self, thread_path: str) -> Optional[List[PostInfo]]:
+        with self._lock:
+            return self._posts.get(thread_path)
+
+    def record(self, thread_path: str, posts: List[PostInfo]) -> None:
+        with self._lock:
+            self._posts[thread_path] = list(posts)
+            self._append({
+                "type": "thread",
+                "path": thread_path,
+                "posts": [_post_to_record(post) for post in posts],
+            })
+
+    def __len__(self) -> int:
+        return len(self._posts)
+
+    def delete(self) -> None:
+        # 収集が正常に完了したらチェックポイントを削除する
+        with self._lock:
+            self._threads = None
+            self._posts = {}
+            self.path.unlink(missing_ok=True)
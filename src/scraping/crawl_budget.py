@@ -0,0 +1,183 @@
+from __future__ import annotations
+
+import time
+from dataclasses import asdict, dataclass
+from datetime import date as Date, datetime, time as Time, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+
+from src.scraping.parser import ThreadInfo
+
+
+JST = timezone(timedelta(hours=9))
+
+SECONDS_PER_DAY = 24 * 60 * 60
+# 立って間もないスレッドの勢いを過大に見積もらないための最小経過時間
+MIN_THREAD_AGE_SEC = 60 * 60
+
+
+def _thread_created_at(thread: ThreadInfo) -> Optional[int]:
+    # スレッドキーはスレッド作成時刻のUNIX時間
+    if thread.key is None or not thread.key.isdecimal():
+        return None
+    return int(thread.key)
+
+
+def expected_yield(thread: ThreadInfo, target_date: Date, now: float) -> Optional[float]:
+    """
+    スレッドから得られる対象日の投稿数の見積もりを返す。
+
+    スレッドの勢い（レス数 / 作成からの経過日数）に、作成から現在までのうち
+    対象日と重なる日数を掛けたもの。対象日より後に立ったスレッドは0。
+    レス数・スレッドキーがなく見積もれない場合は None。
+    """
+    created_at = _thread_created_at(thread)
+    if created_at is None or thread.reply_count is None:
+        return None
+
+    day_start = datetime.combine(target_date, Time.min, tzinfo=JST).timestamp()
+    day_end = day_start + SECONDS_PER_DAY
+    overlap = min(day_end, now) - max(day_start, created_at)
+    if overlap <= 0:
+        return 0.0
+
+    age = max(now - created_at, MIN_THREAD_AGE_SEC)
+    posts_per_sec = thread.reply_count / age
+    return posts_per_sec * overlap
+
+
+def prioritize_threads(
+    threads: List[ThreadInfo],
+    target_date: Date,
+    now: float,
+) -> Tuple[List[ThreadInfo], Dict[str, float]]:
+    """
+    見積もり投稿数の多い順に並べたスレッド一覧と、スレッドパスごとの見積もりを返す。
+
+    対象日より後に立ったスレッドは除外する。見積もれないスレッドは、
+    見積もれたスレッドの後ろに板の並び順のまま置く（見積もりは0として扱う）。
+    """
+    estimated: List[Tuple[float, int, ThreadInfo]] = []
+    unknown: List[ThreadInfo] = []
+    for position, thread in enumerate(threads):
+        value = expected_yield(thread, target_date, now)
+        if value is None:
+            unknown.append(thread)
+        elif value > 0:
+            estimated.append((value, position, thread))
+
+    estimated.sort(key=lambda item: (-item[0], item[1]))
+    ordered = [thread for _, _, thread in estimated] + unknown
+    yields = {thread.path: value for value, _, thread in estimated}
+    yields.update({thread.path: 0.0 for thread in unknown})
+    return ordered, yields
+
+
+@dataclass
+class CrawlCoverage:
+    """時間予算付きの巡回で、どこまでスレッドを巡回できたかの記録"""
+
+    time_budget_sec: Optional[float] = None
+    elapsed_sec: float = 0.0
+    budget_exhausted: bool = False
+    # 板一覧のスレッド数
+    threads_listed: int = 0
+    # 対象日より後に立ったため除外したスレッド数
+    threads_excluded: int = 0
+    # 取得したスレッド数
+    threads_fetched: int = 0
+    # 板の並びで打ち切り対象より後ろにあるため取得不要と判断したスレッド数
+    threads_pruned: int = 0
+    # 時間予算が尽きた・取得に失敗したため取得できなかったスレッド数
+    threads_unvisited: int = 0
+    # 見積もり投稿数の合計と、取得したスレッドの見積もり投稿数の合計
+    expected_posts_total: float = 0.0
+    expected_posts_fetched: float = 0.0
+    collected_posts: int = 0
+
+    @property
+    def coverage_ratio(self) -> float:
+        # 取得不要と判断したスレッドを除いた、見積もり投稿数の網羅率
+        if self.expected_posts_total <= 0:
+            return 1.0
+        return min(1.0, self.expected_posts_fetched / self.expected_posts_total)
+
+    def to_dict(self) -> Dict[str, object]:
+        data = asdict(self)
+        data["elapsed_sec"] = round(self.elapsed_sec, 3)
+        data["expected_posts_total"] = round(self.expected_posts_total, 3)
+        data["expected_posts_fetched"] = round(self.expected_posts_fetched, 3)
+        data["coverage_ratio"] = round(self.coverage_ratio, 4)
+        return data
+
+
+class CrawlBudget:
+    """時間予算付きの巡回で、残り時間と打ち切り位置を管理するクラス
+
+    板一覧はスレッドの最終書き込み順に並んでいるため、板の並びで i 番目のスレッドに
+    対象日・翌日の投稿がなければ、i 番目より後ろのスレッドにもない。
+    優先度順に巡回する場合は、この位置（cutoff）が分かった後はそれより後ろのスレッドを取得しない
+    （cutoff が分かる前に取得した後ろのスレッドは取得済みとして扱う）。
+    """
+
+    def __init__(
+        self,
+        threads: List[ThreadInfo],
+        yields: Dict[str, float],
+        time_budget_sec: float,
+        coverage: CrawlCoverage,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        if time_budget_sec <= 0:
+            raise ValueError(f"time_budget_sec must be positive: {time_budget_sec}")
+
+        self.coverage = coverage
+        self._clock = clock
+        self._started = clock()
+        self._deadline = self._started + time_budget_sec
+        self._positions = {thread.path: i for i, thread in enumerate(threads)}
+        self._yields = yields
+        self.cutoff = len(threads)
+
+        coverage.time_budget_sec = time_budget_sec
+        coverage.expected_posts_total = sum(yields.values())
+
+    def exhausted(self) -> bool:
+        return self._clock() >= self._deadline
+
+    def is_pruned(self, thread: ThreadInfo) -> bool:
+        return self._positions[thread.path] > self.cutoff
+
+    def should_fetch(self, thread: ThreadInfo) -> bool:
+        # 並行取得のワーカーからも呼ばれる（cutoff は読み取るだけ）
+        if self.is_pruned(thread):
+            return False
+        if self.exhausted():
+            self.coverage.budget_exhausted = True
+            return False
+        return True
+
+    def prune_after(self, thread: ThreadInfo) -> None:
+        # このスレッドより板の並びで後ろのスレッドを巡回対象から外す
+        position = self._positions[thread.path]
+        if position < self.cutoff:
+            self.cutoff = position
+            self.coverage.expected_posts_total = sum(
+                value for path, value in self._yields.items()
+                if self._positions[path] <= position
+            )
+
+    def record_fetched(self, thread: ThreadInfo, collected_posts: int) -> None:
+        self.coverage.threads_fetched += 1
+        self.coverage.expected_posts_fetched += self._yields.get(thread.path, 0.0)
+        self.coverage.collected_posts += collected_posts
+
+    def finish(self, remaining: List[ThreadInfo]) -> CrawlCoverage:
+        # 取得しなかったスレッドを、打ち切り対象とそれ以外（時間切れ・取得失敗）に分けて記録する
+        coverage = self.coverage
+        coverage.elapsed_sec = self._clock() - self._started
+        for thread in remaining:
+            if self.is_pruned(thread):
+                coverage.threads_pruned += 1
+            else:
+                coverage.threads_unvisited += 1
+        return coverage
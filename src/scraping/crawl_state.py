@@ -0,0 +1,87 @@
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+from dataclasses import asdict, dataclass
+from datetime import date as Date
+from pathlib import Path
+from typing import Dict, Iterable, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class ThreadCrawlState:
+    # スレッドごとの巡回状態
+    # last_post_number: 収集済み（対象日以前に投稿された）レスの最大レス番号
+    # reply_count: 前回巡回時に板一覧に表示されていたレス数
+    # target_date: 前回巡回の対象日（ISO形式）
+    last_post_number: int
+    reply_count: Optional[int]
+    target_date: str
+
+    def is_usable_for(self, target_date: Date) -> bool:
+        # 同じ対象日の再実行（リトライ等）では状態を使わず、最初から取得し直す
+        return self.target_date < target_date.isoformat()
+
+
+class CrawlStateStore:
+    """スレッドパスをキーにした巡回状態をJSONファイルに永続化するストア"""
+
+    def __init__(self, path: Union[str, Path]):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._states: Dict[str, ThreadCrawlState] = self._load()
+
+    def _load(self) -> Dict[str, ThreadCrawlState]:
+        if not self.path.exists():
+            return {}
+
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            return {
+                thread_path: ThreadCrawlState(**state)
+                for thread_path, state in data.items()
+            }
+        except Exception as e:
+            # 壊れた状態ファイルは無視して最初から取得する
+            logger.warning(f"巡回状態ファイルの読み込みに失敗: {self.path}: {e}")
+            return {}
+
+    def get(self, thread_path: str) -> Optional[ThreadCrawlState]:
+        with self._lock:
+            return self._states.get(thread_path)
+
+    def update(self, thread_path: str, state: ThreadCrawlState) -> None:
+        with self._lock:
+            self._states[thread_path] = state
+
+    def retain(self, thread_paths: Iterable[str]) -> None:
+        # 板一覧から消えた（dat落ちした）スレッドの状態を削除する
+        keep = set(thread_paths)
+        with self._lock:
+            self._states = {
+                thread_path: state
+                for thread_path, state in self._states.items()
+                if thread_path in keep
+            }
+
+    def __len__(self) -> int:
+        return len(self._states)
+
+    def save(self) -> None:
+        # 一時ファイルに書き出してから置き換える（書き込み途中のファイルを残さない）
+        with self._lock:
+            data = {
+                thread_path: asdict(state)
+                for thread_path, state in self._states.items()
+            }
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_name(self.path.name + ".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(tmp_path, self.path)
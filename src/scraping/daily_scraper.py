@@ -1,16 +1,39 @@
 from __future__ import annotations
 
+import logging
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
 from dataclasses import dataclass
 from datetime import date as Date, datetime, timedelta, timezone
-from typing import List, Optional
+from functools import partial
+from typing import Callable, Deque, Iterator, List, Optional, Tuple, Union
 
-from src.scraping.parser import PostInfo, ThreadInfo, parse_board_page, parse_thread_page
+import requests
+
+from src.scraping.archive import ArchiveRun, RawHtmlArchive, ReplayScraper
+from src.scraping.checkpoint import CollectionCheckpoint
+from src.scraping.crawl_budget import CrawlBudget, CrawlCoverage, prioritize_threads
+from src.scraping.crawl_state import CrawlStateStore, ThreadCrawlState
+from src.scraping.http_cache import HttpValidatorCache
+from src.scraping.parser import (
+    PostInfo,
+    ThreadInfo,
+    parse_board_page,
+    parse_subject_txt,
+    parse_thread_page,
+)
+from src.scraping.pacer import AimdPacer
+from src.scraping.rate_limiter import TokenBucketRateLimiter
 from src.scraping.scraper import Scraper
-from src.scraping.utils import build_url
+from src.scraping.stats import ScraperStats
+from src.scraping.utils import build_url, get_board_key
 
 
 JST = timezone(timedelta(hours=9))
 
+logger = logging.getLogger(__name__)
+
 
 @dataclass
 class CollectedPost:
@@ -28,11 +51,303 @@ def _get_target_date_jst(target_date: Optional[Date] = None) -> Date:
     return now_jst.date() - timedelta(days=1)
 
 
-def _build_date_prefix(target_date: Date) -> str:
-    return target_date.strftime("%Y/%m/%d(")
+def _posted_date(post: PostInfo) -> Optional[Date]:
+    # 投稿日（日本時間）。日時を解析できない投稿（あぼーん等）はNone
+    return post.posted_at.date() if post.posted_at is not None else None
 
 
-def collect_posts_for_date(
+def _fetch_board_threads(
+    scraper: Union[Scraper, ReplayScraper],
+    base_url: str,
+    board_path: str,
+    board_index: str,
+) -> Optional[List[ThreadInfo]]:
+    if board_index == "subject":
+        # subject.txt（1行1スレッドのテキスト）からスレッド一覧を取得する
+        board_key = get_board_key(board_path)
+        subject_url = build_url(base_url, f"/{board_key}/subject.txt")
+        try:
+            subject_text = scraper.fetch_bytes(subject_url)
+        except requests.RequestException as e:
+            logger.warning(f"subject.txtの取得に失敗したため板ページを使用: {e}")
+            subject_text = None
+
+        if subject_text:
+            threads = parse_subject_txt(subject_text, board_key)
+            if threads:
+                return threads
+        logger.warning(f"subject.txtからスレッド一覧を取得できないため板ページを使用: {subject_url}")
+    elif board_index != "html":
+        raise ValueError(f"Invalid board_index: {board_index}")
+
+    # 板トップページのHTMLからスレッド一覧を取得する
+    board_url = build_url(base_url, board_path)
+    board_html = scraper.fetch_bytes(board_url)
+
+    if board_html is None:
+        return None
+
+    return parse_board_page(board_html)
+
+
+def _fetch_posts(
+    scraper: Union[Scraper, ReplayScraper],
+    base_url: str,
+    thread_path: str,
+) -> Optional[List[PostInfo]]:
+    # バイト列で取得し、パーサーでcp932としてデコードする
+    thread_html = scraper.fetch_bytes(build_url(base_url, thread_path))
+
+    if thread_html is None:
+        return None
+
+    posts = parse_thread_page(thread_html)
+
+    # デバッグ: 取得したHTMLのサイズと投稿数を確認
+    # コンテナ内とコンテナ外で取得できるHTMLのサイズが異なる可能性がある
+    logger.info(
+        f"Thread {thread_path}: HTML size={len(thread_html)} bytes, "
+        f"Posts parsed={len(posts)}"
+    )
+    return posts
+
+
+def _fetch_thread_posts(
+    scraper: Scraper,
+    base_url: str,
+    thread: ThreadInfo,
+    max_posts: Optional[int],
+) -> Optional[List[PostInfo]]:
+    # max_postsが指定されている場合は、URLに/l{max_posts}を付ける
+    if max_posts is not None:
+        return _fetch_posts(scraper, base_url, f"{thread.path}/l{max_posts}")
+    return _fetch_posts(scraper, base_url, thread.path)
+
+
+def _fetch_thread_posts_since(
+    scraper: Scraper,
+    base_url: str,
+    thread: ThreadInfo,
+    last_post_number: int,
+) -> Optional[List[PostInfo]]:
+    # 前回収集済みのレス番号より後ろだけを /{n}- で取得する
+    posts = _fetch_posts(scraper, base_url, f"{thread.path}/{last_post_number + 1}-")
+    if posts is None:
+        return None
+    return [
+        post for post in posts
+        if post.number is None or post.number > last_post_number
+    ]
+
+
+def _window_start(posts: List[PostInfo]) -> Optional[int]:
+    # 取得した範囲の先頭レス番号を返す
+    # 5chは範囲指定しても>>1を必ず含めるため、>>1は範囲の判定から除外する
+    numbers = sorted(post.number for post in posts if post.number is not None)
+    if not numbers:
+        return None
+    if len(numbers) > 1 and numbers[0] == 1 and numbers[1] > 2:
+        return numbers[1]
+    return numbers[0]
+
+
+def _fetch_thread_posts_adaptive(
+    scraper: Scraper,
+    base_url: str,
+    thread: ThreadInfo,
+    target_date: Date,
+    initial_tail: int,
+) -> Optional[List[PostInfo]]:
+    # 末尾の少数のレス（/l{initial_tail}）から取得し、
+    # 取得範囲の最古のレスが対象日より前になるまで /{start}-{end} で範囲を遡って広げる
+    if thread.reply_count is not None and thread.reply_count <= initial_tail:
+        # 板一覧のレス数が少なければスレ全体を1回で取得する
+        return _fetch_posts(scraper, base_url, thread.path)
+
+    posts = _fetch_posts(scraper, base_url, f"{thread.path}/l{initial_tail}")
+    if posts is None:
+        return None
+
+    by_number = {post.number: post for post in posts if post.number is not None}
+    start = _window_start(posts)
+    window = initial_tail
+
+    while start is not None and start > 1:
+        # 取得範囲内で最も古いレス（範囲先頭のレスが削除されている場合に備える）
+        oldest_number = min((n for n in by_number if n >= start), default=None)
+        if oldest_number is None:
+            break
+        oldest_date = _posted_date(by_number[oldest_number])
+        if oldest_date is not None and oldest_date < target_date:
+            break
+
+        end = start - 1
+        window *= 2
+        start = max(1, end - window + 1)
+        wider = _fetch_posts(scraper, base_url, f"{thread.path}/{start}-{end}")
+        if not wider:
+            break
+        for post in wider:
+            if post.number is not None:
+                by_number.setdefault(post.number, post)
+
+    if not by_number:
+        return posts
+    return [by_number[number] for number in sorted(by_number)]
+
+
+def _fetch_thread_posts_incremental(
+    scraper: Scraper,
+    base_url: str,
+    thread: ThreadInfo,
+    fetch_thread: Callable[[ThreadInfo], Optional[List[PostInfo]]],
+    crawl_state: CrawlStateStore,
+    target_date: Date,
+) -> Optional[List[PostInfo]]:
+    state = crawl_state.get(thread.path)
+    if state is None or not state.is_usable_for(target_date):
+        return fetch_thread(thread)
+
+    if thread.reply_count is not None and thread.reply_count <= state.last_post_number:
+        # 収集済みのレス以降に書き込みがない（＝対象日以降のレスがない）
+        logger.info(f"Thread {thread.path}: no new posts since #{state.last_post_number}")
+        return []
+
+    return _fetch_thread_posts_since(
+        scraper, base_url, thread, state.last_post_number
+    )
+
+
+def _replay_thread_posts(
+    scraper: ReplayScraper,
+    base_url: str,
+    thread: ThreadInfo,
+) -> Optional[List[PostInfo]]:
+    # アーカイブに記録されたこのスレッドのページ（/l50, /{start}-{end}, /{n}- など）を
+    # すべて解析し、レス番号で重複を除いて結合する
+    # 取得方法（max_posts / adaptive_tail / crawl_state）に関係なく記録時と同じ投稿が得られる
+    thread_url = build_url(base_url, thread.path)
+    page_urls = scraper.thread_page_urls(thread_url)
+    if not page_urls:
+        # 記録時に巡回しなかったスレッドは取得できなかったものとしてスキップする
+        # （時間予算付きの巡回は板の並び順に取得しないため、未取得のスレッドを
+        # 「対象日の投稿なし」として打ち切ると、以降の記録済みのスレッドを返せない。
+        # 打ち切り位置のスレッド自体は記録されているため、板の並び順の巡回も同じ位置で終わる）
+        return None
+
+    by_number = {}
+    unnumbered: List[PostInfo] = []
+    for url in page_urls:
+        posts = parse_thread_page(scraper.fetch_bytes(url))
+        for post in posts:
+            if post.number is None:
+                unnumbered.append(post)
+            else:
+                by_number.setdefault(post.number, post)
+
+    return [by_number[number] for number in sorted(by_number)] + unnumbered
+
+
+def _fetch_thread_posts_checkpointed(
+    thread: ThreadInfo,
+    fetch_thread: Callable[[ThreadInfo], Optional[List[PostInfo]]],
+    checkpoint: CollectionCheckpoint,
+) -> Optional[List[PostInfo]]:
+    # 前回の試行で取得済みのスレッドはチェックポイントから返し、取得しない
+    posts = checkpoint.get(thread.path)
+    if posts is not None:
+        logger.info(f"Thread {thread.path}: restored {len(posts)} posts from checkpoint")
+        return posts
+
+    posts = fetch_thread(thread)
+    if posts is not None:
+        checkpoint.record(thread.path, posts)
+    return posts
+
+
+def _fetch_thread_posts_budgeted(
+    thread: ThreadInfo,
+    fetch_thread: Callable[[ThreadInfo], Optional[List[PostInfo]]],
+    budget: CrawlBudget,
+) -> Optional[List[PostInfo]]:
+    # 時間予算が尽きた後・打ち切り位置より後ろのスレッドは取得しない（未取得として None を返す）
+    if not budget.should_fetch(thread):
+        return None
+    return fetch_thread(thread)
+
+
+def _update_crawl_state(
+    crawl_state: CrawlStateStore,
+    thread: ThreadInfo,
+    posts: List[PostInfo],
+    target_date: Date,
+) -> None:
+    # 対象日以前に投稿されたレスまでを収集済みとして記録する
+    # （対象日の翌日のレスは翌日の巡回で収集するため含めない）
+    consumed = []
+    for post in posts:
+        posted_date = _posted_date(post)
+        if post.number is not None and posted_date is not None and posted_date <= target_date:
+            consumed.append(post.number)
+    state_date = target_date.isoformat()
+    previous = crawl_state.get(thread.path)
+    if previous is not None:
+        # 過去日の再取得で状態が巻き戻らないようにする
+        consumed.append(previous.last_post_number)
+        state_date = max(state_date, previous.target_date)
+    if not consumed:
+        return
+
+    crawl_state.update(
+        thread.path,
+        ThreadCrawlState(
+            last_post_number=max(consumed),
+            reply_count=thread.reply_count,
+            target_date=state_date,
+        ),
+    )
+
+
+def _iter_thread_posts(
+    threads: List[ThreadInfo],
+    fetch_thread: Callable[[ThreadInfo], Optional[List[PostInfo]]],
+    concurrency: int,
+) -> Iterator[Tuple[ThreadInfo, Optional[List[PostInfo]]]]:
+    # スレッド一覧の順序どおりに (スレッド, 投稿一覧) を返す
+    # concurrency > 1 の場合は先読みで最大concurrency件を並行取得するが、
+    # 結果は必ず板の並び順で返すため、呼び出し側の打ち切り判定は逐次版と同じになる
+    if concurrency <= 1:
+        for thread in threads:
+            yield thread, fetch_thread(thread)
+        return
+
+    executor = ThreadPoolExecutor(max_workers=concurrency)
+    pending: Deque[Tuple[ThreadInfo, Future]] = deque()
+    thread_iter = iter(threads)
+
+    def submit_next() -> None:
+        thread = next(thread_iter, None)
+        if thread is not None:
+            future = executor.submit(fetch_thread, thread)
+            pending.append((thread, future))
+
+    try:
+        for _ in range(concurrency):
+            submit_next()
+
+        while pending:
+            thread, future = pending.popleft()
+            posts = future.result()
+            yield thread, posts
+            submit_next()
+    finally:
+        # 打ち切り（またはエラー）時は未着手の取得をキャンセルする
+        for _, future in pending:
+            future.cancel()
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+def iter_posts_for_date(
     base_url: str,
     board_path: str,
     target_date: Optional[Date] = None,
@@ -42,10 +357,29 @@ def collect_posts_for_date(
     backoff_factor: float = 1.0,
     request_delay: float = 2.0,
     max_posts: Optional[int] = None,
-) -> List[CollectedPost]:
+    adaptive_tail: Optional[int] = None,
+    concurrency: int = 1,
+    rate_limiter: Optional[TokenBucketRateLimiter] = None,
+    crawl_state: Optional[CrawlStateStore] = None,
+    board_index: str = "html",
+    archive: Optional[RawHtmlArchive] = None,
+    replay: bool = False,
+    run_name: Optional[str] = None,
+    checkpoint: Optional[CollectionCheckpoint] = None,
+    stats: Optional[ScraperStats] = None,
+    pacer: Optional[AimdPacer] = None,
+    time_budget_sec: Optional[float] = None,
+    coverage: Optional[CrawlCoverage] = None,
+    clock: Callable[[], float] = time.time,
+    http_cache: Optional[HttpValidatorCache] = None,
+) -> Iterator[CollectedPost]:
     """
     指定した板トップページからスレッド一覧を取得し、
-    「昨日（日本時間）に投稿されたレス」だけを収集する。
+    「昨日（日本時間）に投稿されたレス」をスレッド単位で逐次返すジェネレータ。
+
+    スレッドを1件取得・解析するごとに、そのスレッドの対象日の投稿を返すため、
+    呼び出し側は全スレッドの取得完了を待たずに処理を始められる。
+    同じスレッドの投稿は必ず連続して返される。
 
     処理フロー（memo/ロジック/日次データ収集.md に対応）:
       1. トップページをスクレイピングしスレッド一覧を取得
@@ -68,82 +402,327 @@ def collect_posts_for_date(
         取得する最大投稿数。指定した場合、URLに/l{max_posts}を付けて最新の投稿のみを取得。
         例: max_posts=300 の場合、URLは /test/read.cgi/prog/1765368460/l300 となる。
         省略時は全件取得を試みる。
+    adaptive_tail : int, optional
+        指定した場合は max_posts の代わりに可変範囲で取得する。
+        まず /l{adaptive_tail} で末尾のみを取得し、取得範囲の最古のレスが対象日より前に
+        なるまで /{start}-{end} で範囲を倍々に遡って追加取得する。
+        板一覧のレス数が adaptive_tail 以下のスレは最初からスレ全体を取得する。
+    concurrency : int, default 1
+        同時に取得するスレッド数。2以上を指定すると、板の並び順に先読みしながら
+        並行取得する。打ち切り条件（4.）に到達した時点で未着手の取得はキャンセルされる。
+    rate_limiter : TokenBucketRateLimiter, optional
+        ホスト単位のレート制限。concurrency > 1 で省略した場合は
+        1 / request_delay 回/秒のリミッタを生成して全スレッドで共有する。
+    crawl_state : CrawlStateStore, optional
+        スレッドごとの巡回状態（収集済みの最大レス番号・板一覧のレス数）。
+        指定した場合、前回より前の対象日で巡回済みのスレッドは前回の続きのレスだけを
+        /{n}- で取得し、板一覧のレス数が収集済みのレス番号を超えていないスレッドは
+        取得せずに「対象日の投稿なし」として扱う。巡回完了時に状態を保存する。
+    board_index : {"html", "subject"}, default "html"
+        スレッド一覧の取得元。"subject" の場合は板の subject.txt から
+        スレッドキー・タイトル・レス数を取得し、取得・解析できなかった場合は
+        板トップページのHTMLにフォールバックする。
+    archive : RawHtmlArchive, optional
+        指定した場合、取得した板ページ・スレッドページをすべてアーカイブに保存し、
+        run_name のマニフェストに URL と内容のハッシュを記録する。
+    replay : bool, default False
+        True の場合はネットワークに接続せず、archive に記録された run_name の
+        ページから収集する（トークナイズ・正規化の変更後の再処理用）。
+        スレッドごとに記録されたページをすべて結合するため、記録時の取得方法に
+        関係なく同じ投稿が得られる。crawl_state とは併用できない。
+    run_name : str, optional
+        アーカイブの実行名。省略時は "{板キー}_{対象日YYYYMMDD}"。
+    checkpoint : CollectionCheckpoint, optional
+        指定した場合、スレッド一覧と取得が完了したスレッドの投稿を記録する。
+        前回の試行のチェックポイントが残っていれば、記録済みのスレッド一覧を使い
+        （板ページは取得しない）、取得済みのスレッドは取得せずに記録から返すため、
+        未取得のスレッドから再開できる。archive を指定した場合は前回のマニフェストに追記する。
+        replay とは併用できない。
+    stats : ScraperStats, optional
+        リクエストごとのレイテンシ・転送量・リトライ回数・待機時間の集計先。
+        巡回の完了時に集計結果をログに出力する。
+    pacer : AimdPacer, optional
+        指定した場合は request_delay の固定待機の代わりに、応答が速く正常な間は間隔を縮め、
+        429/5xx や応答時間の悪化で間隔を広げる適応的な待機を行う（Retry-After を尊重する）。
+        concurrency > 1 の場合も pacer が全スレッドで共有され、既定のレート制限は生成しない。
+    time_budget_sec : float, optional
+        指定した場合は巡回に使う時間（秒）の上限とし、板の並び順ではなく
+        対象日の見積もり投稿数（レス数 / スレッドキーの作成時刻からの経過時間 ×
+        経過時間のうち対象日と重なる時間）の多い順にスレッドを取得する。
+        対象日より後に立ったスレッドは取得しない。打ち切り条件（4.）に該当したスレッドが
+        見つかった後は、板の並びでそれより後ろのスレッドを取得対象から外し、
+        時間予算が尽きた時点で以降の取得をやめる。
+        打ち切り位置は取得してみるまで分からないため、それより前に優先度順で取得した
+        後ろのスレッドの投稿も返される。収集される投稿は板の並び順の巡回と一致するとは限らない。
+    coverage : CrawlCoverage, optional
+        time_budget_sec を指定した場合の巡回の網羅状況の記録先。
+        巡回の完了時に、取得・打ち切り・未取得のスレッド数と見積もり投稿数の網羅率を記録する。
+    clock : callable, default time.time
+        時間予算の計測と、スレッドの見積もり投稿数の計算に使う現在時刻（UNIX時間。テスト用）。
+    http_cache : HttpValidatorCache, optional
+        指定した場合、ETag / Last-Modified を返したページをディスクに保存し、
+        再取得時は条件付きリクエストで変更がなければ（304）保存したページを使う。
+        同じ対象日の再実行やリトライで変更のないページを再ダウンロードしない。
 
-    Returns
-    -------
-    List[CollectedPost]
-        スレッドパス・日付文字列・本文を含む投稿一覧。
+    Yields
+    ------
+    CollectedPost
+        スレッドパス・日付文字列・本文を含む投稿（板の並び順、スレッド内は投稿順）。
+        time_budget_sec を指定した場合はスレッドの優先度順。
     """
     target = _get_target_date_jst(target_date)
-    date_prefix = _build_date_prefix(target)
     today = target + timedelta(days=1)
-    today_prefix = _build_date_prefix(today)
 
-    collected: List[CollectedPost] = []
+    if replay:
+        if archive is None:
+            raise ValueError("archive is required for replay")
+        if crawl_state is not None:
+            raise ValueError("crawl_state cannot be used with replay")
+        if checkpoint is not None:
+            raise ValueError("checkpoint cannot be used with replay")
 
-    with Scraper(
-        timeout=timeout,
-        max_retries=max_retries,
-        backoff_factor=backoff_factor,
-        request_delay=request_delay,
-    ) as scraper:
-        # 1. トップページ（板ページ）を取得
-        board_url = build_url(base_url, board_path)
-        board_html = scraper.fetch(board_url)
+    if time_budget_sec is not None and time_budget_sec <= 0:
+        raise ValueError(f"time_budget_sec must be positive: {time_budget_sec}")
 
-        if board_html is None:
-            return collected
+    if run_name is None:
+        run_name = f"{get_board_key(board_path)}_{target:%Y%m%d}"
 
-        threads: List[ThreadInfo] = parse_board_page(board_html)
+    archive_run: Optional[ArchiveRun] = None
+    if replay:
+        scraper = ReplayScraper(archive.load_run(run_name))
+    else:
+        if archive is not None:
+            # チェックポイントから再開する場合は前回の試行で取得したページの記録を残す
+            archive_run = archive.open_run(run_name, resume=checkpoint is not None)
 
-        # 2. スレッドを新しい順に巡回
-        for thread in threads:
-            # max_postsが指定されている場合は、URLに/l{max_posts}を付ける
-            if max_posts is not None:
-                thread_path_with_limit = f"{thread.path}/l{max_posts}"
-                thread_url = build_url(base_url, thread_path_with_limit)
+        if (
+            concurrency > 1
+            and rate_limiter is None
+            and pacer is None
+            and request_delay > 0
+        ):
+            rate_limiter = TokenBucketRateLimiter(rate=1.0 / request_delay)
+
+        scraper = Scraper(
+            timeout=timeout,
+            max_retries=max_retries,
+            backoff_factor=backoff_factor,
+            request_delay=request_delay,
+            rate_limiter=rate_limiter,
+            pool_maxsize=max(10, concurrency),
+            archive_run=archive_run,
+            stats=stats,
+            pacer=pacer,
+            http_cache=http_cache,
+        )
+
+    try:
+        with scraper:
+            # 1. トップページ（板ページ）を取得（再開時は前回の試行のスレッド一覧を使う）
+            threads = checkpoint.threads if checkpoint is not None else None
+            if threads is None:
+                threads = _fetch_board_threads(scraper, base_url, board_path, board_index)
+
+                if threads is None:
+                    return
+
+                if checkpoint is not None:
+                    checkpoint.save_threads(threads)
+
+            # 2. スレッドを新しい順に巡回
+            if replay:
+                fetch_thread = partial(_replay_thread_posts, scraper, base_url)
+            elif adaptive_tail is not None:
+                fetch_thread = partial(
+                    _fetch_thread_posts_adaptive,
+                    scraper,
+                    base_url,
+                    target_date=target,
+                    initial_tail=adaptive_tail,
+                )
             else:
-                thread_url = build_url(base_url, thread.path)
-            thread_html = scraper.fetch(thread_url)
-
-            if thread_html is None:
-                # このスレが取得できなかった場合はスキップして次へ
-                continue
-
-            posts: List[PostInfo] = parse_thread_page(thread_html)
-            
-            # デバッグ: 取得したHTMLのサイズと投稿数を確認
-            # コンテナ内とコンテナ外で取得できるHTMLのサイズが異なる可能性がある
-            import logging
-            logger = logging.getLogger(__name__)
-            logger.info(
-                f"Thread {thread.path}: HTML size={len(thread_html)} chars, "
-                f"Posts parsed={len(posts)}"
-            )
-
-            # 3. 昨日の日付に一致する投稿のみ抽出
-            target_posts = [
-                post for post in posts if post.date.startswith(date_prefix)
-            ]
-
-            # 今日の投稿もチェック
-            today_posts = [
-                post for post in posts if post.date.startswith(today_prefix)
-            ]
-
-            if not target_posts and not today_posts:
-                # 4. 昨日の投稿が存在しないかつ今日の投稿が存在しないスレに到達したらループを終了
-                break
-
-            for post in target_posts:
-                collected.append(
-                    CollectedPost(
-                        thread_path=thread.path,
-                        date=post.date,
-                        content=post.content,
-                    )
+                fetch_thread = partial(
+                    _fetch_thread_posts, scraper, base_url, max_posts=max_posts
+                )
+            if crawl_state is not None:
+                fetch_thread = partial(
+                    _fetch_thread_posts_incremental,
+                    scraper,
+                    base_url,
+                    fetch_thread=fetch_thread,
+                    crawl_state=crawl_state,
+                    target_date=target,
+                )
+
+            budget: Optional[CrawlBudget] = None
+            crawl_order = threads
+            if time_budget_sec is not None:
+                # 見積もり投稿数の多い順に巡回する
+                crawl_order, yields = prioritize_threads(threads, target, clock())
+                if coverage is None:
+                    coverage = CrawlCoverage()
+                coverage.threads_listed = len(threads)
+                coverage.threads_excluded = len(threads) - len(crawl_order)
+                budget = CrawlBudget(
+                    threads, yields, time_budget_sec, coverage, clock=clock
+                )
+                # チェックポイントに記録済みのスレッドは予算に関係なく記録から返す
+                fetch_thread = partial(
+                    _fetch_thread_posts_budgeted,
+                    fetch_thread=fetch_thread,
+                    budget=budget,
+                )
+            if checkpoint is not None:
+                fetch_thread = partial(
+                    _fetch_thread_posts_checkpointed,
+                    fetch_thread=fetch_thread,
+                    checkpoint=checkpoint,
+                )
+            thread_results = _iter_thread_posts(crawl_order, fetch_thread, concurrency)
+            fetched_paths = set()
+            try:
+                for thread, posts in thread_results:
+                    if posts is None:
+                        # このスレが取得できなかった場合はスキップして次へ
+                        continue
+
+                    # 3. 昨日の日付に一致する投稿のみ抽出（投稿日時は日本時間）
+                    posted_dates = [_posted_date(post) for post in posts]
+                    target_posts = [
+                        post for post, posted_date in zip(posts, posted_dates)
+                        if posted_date == target
+                    ]
+
+                    # 今日の投稿もチェック
+                    has_today_posts = today in posted_dates
+
+                    if crawl_state is not None:
+                        _update_crawl_state(crawl_state, thread, posts, target)
+
+                    if budget is not None:
+                        fetched_paths.add(thread.path)
+                        budget.record_fetched(thread, len(target_posts))
+
+                    if not target_posts and not has_today_posts:
+                        if budget is not None:
+                            # 優先度順の巡回では、板の並びでこのスレより後ろのスレッドだけを外して続ける
+                            budget.prune_after(thread)
+                            continue
+                        # 4. 昨日の投稿が存在しないかつ今日の投稿が存在しないスレに到達したらループを終了
+                        break
+
+                    for post in target_posts:
+                        yield CollectedPost(
+                            thread_path=thread.path,
+                            date=post.date,
+                            content=post.content,
+                        )
+            finally:
+                thread_results.close()
+
+            if budget is not None:
+                budget.finish(
+                    [thread for thread in crawl_order if thread.path not in fetched_paths]
                 )
+                logger.info(
+                    f"Crawl coverage: fetched={coverage.threads_fetched}/{len(crawl_order)}, "
+                    f"pruned={coverage.threads_pruned}, unvisited={coverage.threads_unvisited}, "
+                    f"coverage_ratio={coverage.coverage_ratio:.3f}, "
+                    f"budget_exhausted={coverage.budget_exhausted}, "
+                    f"elapsed={coverage.elapsed_sec:.1f}s"
+                )
+    finally:
+        # 途中で失敗しても、それまでに取得したページはマニフェストに残す
+        if archive_run is not None:
+            archive_run.save()
+
+    # リプレイ時はリクエストを行わないため計測値はない
+    scraper_stats = getattr(scraper, "stats", None)
+    if scraper_stats is not None:
+        summary = scraper_stats.summary()
+        logger.info(
+            f"Scraper stats: requests={summary['requests']}, errors={summary['errors']}, "
+            f"bytes={summary['total_bytes']}, retries={summary['total_retries']}, "
+            f"retry_statuses={summary['retry_statuses']}, "
+            f"ttfb_p50={summary['ttfb_ms']['p50']}ms, total_p90={summary['total_ms']['p90']}ms, "
+            f"sleep={summary['sleep_sec']}s, rate_limit_wait={summary['rate_limit_wait_sec']}s"
+        )
+
+    if http_cache is not None and not replay:
+        cache_summary = http_cache.summary()
+        logger.info(
+            f"HTTP cache: hits={cache_summary['hits']}, misses={cache_summary['misses']}, "
+            f"evictions={cache_summary['evictions']}, entries={cache_summary['entries']}, "
+            f"size={cache_summary['size_bytes']} bytes"
+        )
 
-    return collected
+    if crawl_state is not None:
+        crawl_state.retain(thread.path for thread in threads)
+        crawl_state.save()
 
 
+def collect_posts_for_date(
+    base_url: str,
+    board_path: str,
+    target_date: Optional[Date] = None,
+    *,
+    timeout: int = 30,
+    max_retries: int = 3,
+    backoff_factor: float = 1.0,
+    request_delay: float = 2.0,
+    max_posts: Optional[int] = None,
+    adaptive_tail: Optional[int] = None,
+    concurrency: int = 1,
+    rate_limiter: Optional[TokenBucketRateLimiter] = None,
+    crawl_state: Optional[CrawlStateStore] = None,
+    board_index: str = "html",
+    archive: Optional[RawHtmlArchive] = None,
+    replay: bool = False,
+    run_name: Optional[str] = None,
+    checkpoint: Optional[CollectionCheckpoint] = None,
+    stats: Optional[ScraperStats] = None,
+    pacer: Optional[AimdPacer] = None,
+    time_budget_sec: Optional[float] = None,
+    coverage: Optional[CrawlCoverage] = None,
+    clock: Callable[[], float] = time.time,
+    http_cache: Optional[HttpValidatorCache] = None,
+) -> List[CollectedPost]:
+    """
+    指定した板トップページからスレッド一覧を取得し、
+    「昨日（日本時間）に投稿されたレス」だけを収集する。
+
+    iter_posts_for_date() で逐次返される投稿をリストにまとめて返す。
+    引数の説明は iter_posts_for_date() を参照。
+
+    Returns
+    -------
+    List[CollectedPost]
+        スレッドパス・日付文字列・本文を含む投稿一覧（iter_posts_for_date() と同じ順序）
+    """
+    return list(
+        iter_posts_for_date(
+            base_url,
+            board_path,
+            target_date,
+            timeout=timeout,
+            max_retries=max_retries,
+            backoff_factor=backoff_factor,
+            request_delay=request_delay,
+            max_posts=max_posts,
+            adaptive_tail=adaptive_tail,
+            concurrency=concurrency,
+            rate_limiter=rate_limiter,
+            crawl_state=crawl_state,
+            board_index=board_index,
+            archive=archive,
+            replay=replay,
+            run_name=run_name,
+            checkpoint=checkpoint,
+            stats=stats,
+            pacer=pacer,
+            time_budget_sec=time_budget_sec,
+            coverage=coverage,
+            clock=clock,
+            http_cache=http_cache,
+        )
+    )
@@ -0,0 +1,192 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Dict, Mapping, Optional, Union
+
+logger = logging.getLogger(__name__)
+
+
+DEFAULT_MAX_BYTES = 512 * 1024 * 1024
+
+
+@dataclass
+class CacheEntry:
+    # キャッシュしたレスポンスの検証子（ETag / Last-Modified）とボディのバイト数
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    size: int
+
+
+class HttpValidatorCache:
+    """URLごとのレスポンスボディと検証子をディスクに保存するキャッシュ（スレッドセーフ）
+
+    ETag / Last-Modified を返したレスポンスだけを保存し、同じURLの再取得時は
+    If-None-Match / If-Modified-Since を付けた条件付きリクエストにする。
+    304 Not Modified が返された場合はボディをキャッシュから返す。
+
+    ボディの合計が max_bytes を超えたら、最後に使われてから最も時間が経ったものから削除する
+    （使用順はファイルの更新時刻に残すため、実行をまたいでも引き継がれる）。
+
+    ディレクトリ構成:
+      <sha256(URL)の先頭2文字>/<sha256(URL)>.json  検証子
+      <sha256(URL)の先頭2文字>/<sha256(URL)>.body  レスポンスボディ
+    """
+
+    def __init__(
+        self,
+        root_dir: Union[str, Path],
+        max_bytes: int = DEFAULT_MAX_BYTES,
+    ):
+        if max_bytes <= 0:
+            raise ValueError(f"max_bytes must be positive: {max_bytes}")
+
+        self.root_dir = Path(root_dir)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        # キー -> CacheEntry（先頭ほど長く使われていない）
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._load()
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+    def _meta_path(self, key: str) -> Path:
+        return self.root_dir / key[:2] / f"{key}.json"
+
+    def _body_path(self, key: str) -> Path:
+        return self.root_dir / key[:2] / f"{key}.body"
+
+    def _load(self) -> None:
+        if not self.root_dir.exists():
+            return
+
+        loaded = []
+        for meta_path in self.root_dir.glob("*/*.json"):
+            key = meta_path.stem
+            try:
+                with open(meta_path, "r", encoding="utf-8") as f:
+                    entry = CacheEntry(**json.load(f))
+                used_at = os.stat(self._body_path(key)).st_mtime
+            except Exception as e:
+                # 書き込み途中で中断されたエントリは使わない（次回の取得で上書きされる）
+                logger.warning(f"HTTPキャッシュの読み込みに失敗: {meta_path}: {e}")
+                continue
+            loaded.append((used_at, key, entry))
+
+        for _, key, entry in sorted(loaded, key=lambda item: item[0]):
+            self._entries[key] = entry
+            self.size_bytes += entry.size
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        # キャッシュ済みのURLなら条件付きリクエストのヘッダを返す
+        with self._lock:
+            entry = self._entries.get(self._key(url))
+        if entry is None:
+            return {}
+
+        headers = {}
+        if entry.etag is not None:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified is not None:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def get(self, url: str) -> Optional[bytes]:
+        # 304 Not Modified を受け取ったURLのボディを返す（削除済みの場合は None）
+        key = self._key(url)
+        try:
+            with open(self._body_path(key), "rb") as f:
+                data = f.read()
+            os.utime(self._body_path(key))
+        except OSError:
+            with self._lock:
+                self._discard(key)
+            return None
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self.hits += 1
+        return data
+
+    def store(self, url: str, content: bytes, headers: Mapping[str, str]) -> None:
+        # 全体を取得したレスポンスを記録する（検証子がなければ保存しない）
+        key = self._key(url)
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+
+        with self._lock:
+            self.misses += 1
+            if (etag is None and last_modified is None) or len(content) > self.max_bytes:
+                # 再検証できない（または大きすぎる）レスポンスは古い記録も消す
+                self._discard(key)
+                return
+
+        entry = CacheEntry(
+            url=url, etag=etag, last_modified=last_modified, size=len(content)
+        )
+        body_path = self._body_path(key)
+        body_path.parent.mkdir(parents=True, exist_ok=True)
+        # 並行して同じURLを書き込んでも壊れないよう、スレッドごとの一時ファイルから置き換える
+        suffix = f".{os.getpid()}.{threading.get_ident()}.tmp"
+        tmp_body = body_path.with_name(body_path.name + suffix)
+        with open(tmp_body, "wb") as f:
+            f.write(content)
+        meta_path = self._meta_path(key)
+        tmp_meta = meta_path.with_name(meta_path.name + suffix)
+        with open(tmp_meta, "w", encoding="utf-8") as f:
+            json.dump(asdict(entry), f, ensure_ascii=False)
+
+        with self._lock:
+            os.replace(tmp_body, body_path)
+            os.replace(tmp_meta, meta_path)
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self.size_bytes -= previous.size
+            self._entries[key] = entry
+            self.size_bytes += entry.size
+            self._evict()
+
+    def _discard(self, key: str) -> None:
+        # ロックを取得した状態で呼び出す
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.size_bytes -= entry.size
+        for path in (self._meta_path(key), self._body_path(key)):
+            try:
+                os.remove(path)
+            except FileNotFoundError:
+                pass
+
+    def _evict(self) -> None:
+        # ロックを取得した状態で呼び出す
+        while self.size_bytes > self.max_bytes and self._entries:
+            key = next(iter(self._entries))
+            self._discard(key)
+            self.evictions += 1
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def summary(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "size_bytes": self.size_bytes,
+            }
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from datetime import date as Date
+from typing import Any, Callable, Dict, List, Mapping, Optional, Sequence, TypeVar
+from urllib.parse import urlparse
+
+from src.scraping.daily_scraper import CollectedPost, collect_posts_for_date
+from src.scraping.pacer import AimdPacer
+from src.scraping.rate_limiter import TokenBucketRateLimiter
+from src.scraping.utils import get_board_key, get_host
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 板ごとに別のインスタンスを渡す必要がある collect_posts_for_date() の引数
+# （全板で共有すると巡回状態・アーカイブの実行名・チェックポイント・網羅状況が混ざる）
+PER_BOARD_KWARGS = frozenset({
+    "crawl_state", "archive", "run_name", "checkpoint", "coverage",
+})
+
+
+@dataclass(frozen=True)
+class BoardTarget:
+    """収集対象の板"""
+
+    base_url: str
+    board_path: str
+    board_key: str
+
+    @classmethod
+    def from_url(cls, board_url: str) -> "BoardTarget":
+        # 板トップページのURL（例: "https://medaka.5ch.net/prog/"）から生成する
+        parsed = urlparse(board_url.strip())
+        if not parsed.scheme or not parsed.netloc:
+            raise ValueError(f"Invalid board URL: {board_url}")
+
+        board_path = parsed.path if parsed.path.endswith("/") else parsed.path + "/"
+        board_key = get_board_key(board_path)
+        if not board_key:
+            raise ValueError(f"Invalid board URL: {board_url}")
+
+        return cls(
+            base_url=f"{parsed.scheme}://{parsed.netloc}",
+            board_path=board_path,
+            board_key=board_key,
+        )
+
+    @property
+    def host(self) -> str:
+        return get_host(self.base_url)
+
+
+def parse_board_urls(value: str) -> List[BoardTarget]:
+    # カンマ・空白区切りの板URLの一覧を BoardTarget のリストに変換する
+    boards = [
+        BoardTarget.from_url(url)
+        for url in value.replace(",", " ").split()
+    ]
+    keys = [board.board_key for board in boards]
+    duplicates = sorted({key for key in keys if keys.count(key) > 1})
+    if duplicates:
+        raise ValueError(f"Duplicate board keys: {duplicates}")
+    return boards
+
+
+def run_for_boards(
+    boards: Sequence[BoardTarget],
+    task: Callable[[BoardTarget], T],
+    max_workers: Optional[int] = None,
+) -> Dict[str, T]:
+    """
+    板ごとの処理を並行して実行し、板キーごとの結果を返す。
+
+    板ごとに1つのワーカーで task を実行する。別ホストの板は互いに待たずに並行して進み、
+    同じホストの板は task 内で共有するホスト単位のレート制限（TokenBucketRateLimiter /
+    AimdPacer はいずれも到着順に払い出す）によって公平にリクエストを分け合う。
+
+    Raises
+    ------
+    RuntimeError
+        いずれかの板の処理が失敗した場合（他の板の処理がすべて終わってから送出する）
+    """
+    if not boards:
+        return {}
+
+    results: Dict[str, T] = {}
+    errors: Dict[str, BaseException] = {}
+
+    with ThreadPoolExecutor(max_workers=max_workers or len(boards)) as executor:
+        futures = {board.board_key: executor.submit(task, board) for board in boards}
+        for board_key, future in futures.items():
+            try:
+                results[board_key] = future.result()
+            except Exception as e:
+                logger.error(f"板の収集に失敗: board_key={board_key}: {e}", exc_info=True)
+                errors[board_key] = e
+
+    if errors:
+        first_error = next(iter(errors.values()))
+        raise RuntimeError(
+            f"Collection failed for boards: {sorted(errors)}"
+        ) from first_error
+
+    return results
+
+
+def collect_posts_for_boards(
+    boards: Sequence[BoardTarget],
+    target_date: Optional[Date] = None,
+    *,
+    request_delay: float = 2.0,
+    rate_limiter: Optional[TokenBucketRateLimiter] = None,
+    pacer: Optional[AimdPacer] = None,
+    max_workers: Optional[int] = None,
+    board_kwargs: Optional[Mapping[str, Dict[str, Any]]] = None,
+    **kwargs,
+) -> Dict[str, List[CollectedPost]]:
+    """
+    複数の板から「昨日（日本時間）に投稿されたレス」を収集し、板キーごとに返す。
+
+    各板は collect_posts_for_date() で収集する。rate_limiter / pacer は全板で共有し、
+    省略時は 1 / request_delay 回/秒のホスト単位のレート制限を生成する。
+    その他のキーワード引数は全板の collect_posts_for_date() にそのまま渡す。
+    crawl_state / archive / checkpoint など板ごとの状態（PER_BOARD_KWARGS）は
+    board_kwargs に板キーごとに指定する。
+
+    Raises
+    ------
+    ValueError
+        板ごとの状態をキーワード引数で全板に共有しようとした場合、
+        または board_kwargs に PER_BOARD_KWARGS 以外の引数が含まれる場合
+    """
+    shared = sorted(PER_BOARD_KWARGS & kwargs.keys())
+    if shared:
+        raise ValueError(f"Per-board arguments must be given in board_kwargs: {shared}")
+    board_kwargs = board_kwargs or {}
+    for board_key, extra in board_kwargs.items():
+        unknown = sorted(extra.keys() - PER_BOARD_KWARGS)
+        if unknown:
+            raise ValueError(f"Invalid board_kwargs for {board_key}: {unknown}")
+
+    if rate_limiter is None and pacer is None and request_delay > 0:
+        rate_limiter = TokenBucketRateLimiter(rate=1.0 / request_delay)
+
+    hosts = sorted({board.host for board in boards})
+    logger.info(f"複数板の収集開始: boards={len(boards)}, hosts={hosts}")
+
+    def task(board: BoardTarget) -> List[CollectedPost]:
+        return collect_posts_for_date(
+            board.base_url,
+            board.board_path,
+            target_date,
+            request_delay=request_delay,
+            rate_limiter=rate_limiter,
+            pacer=pacer,
+            **kwargs,
+            **board_kwargs.get(board.board_key, {}),
+        )
+
+    return run_for_boards(boards, task, max_workers=max_workers)
@@ -0,0 +1,140 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Optional
+
+
+# サーバーが過負荷・制限中であることを示すステータスコード
+# Retry-After を伴うことが多いため、urllib3のリトライではなくペーサーの待機で再試行する
+PACED_RETRY_STATUSES = (429, 503)
+
+
+@dataclass
+class _HostPace:
+    delay: float
+    next_at: float
+    # Retry-After で指定された、リクエストを再開してよい時刻
+    blocked_until: float = 0.0
+    latency_ewma: Optional[float] = None
+
+
+class AimdPacer:
+    """AIMD（加算的減少・乗算的増加）方式でホストごとのリクエスト間隔を調整するペーサー（スレッドセーフ）
+
+    応答が速く正常な間はリクエスト間隔を decrease_step ずつ縮め、
+    429/5xx・リトライの発生・応答時間の悪化（slow_response_sec 超過、または
+    正常時の平均応答時間の latency_ratio 倍超過）を検知したら backoff_factor 倍に広げる。
+    間隔は min_delay（下限）〜 max_delay（上限）の範囲に収め、
+    Retry-After ヘッダが返された場合はその時刻まで同じホストへのリクエストを止める。
+    """
+
+    def __init__(
+        self,
+        initial_delay: float = 2.0,
+        min_delay: float = 1.0,
+        max_delay: float = 60.0,
+        decrease_step: float = 0.1,
+        backoff_factor: float = 2.0,
+        slow_response_sec: float = 5.0,
+        latency_ratio: float = 2.0,
+        latency_floor_sec: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if min_delay <= 0:
+            raise ValueError(f"min_delay must be positive: {min_delay}")
+        if max_delay < min_delay:
+            raise ValueError(f"max_delay must be >= min_delay: {max_delay}")
+        if backoff_factor <= 1:
+            raise ValueError(f"backoff_factor must be > 1: {backoff_factor}")
+
+        self.initial_delay = min(max(initial_delay, min_delay), max_delay)
+        self.min_delay = min_delay
+        self.max_delay = max_delay
+        self.decrease_step = decrease_step
+        self.backoff_factor = backoff_factor
+        self.slow_response_sec = slow_response_sec
+        self.latency_ratio = latency_ratio
+        # 応答時間がこれより短い間は、平均からの悪化を輻輳とみなさない
+        self.latency_floor_sec = latency_floor_sec
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        self._hosts: Dict[str, _HostPace] = {}
+
+    def _pace(self, host: str, now: float) -> _HostPace:
+        pace = self._hosts.get(host)
+        if pace is None:
+            pace = _HostPace(delay=self.initial_delay, next_at=now)
+            self._hosts[host] = pace
+        return pace
+
+    def delay(self, host: str) -> float:
+        # 現在のリクエスト間隔（秒）
+        with self._lock:
+            return self._pace(host, self._clock()).delay
+
+    def _reserve(self, host: str) -> float:
+        # 次のリクエストの開始時刻を予約し、それまでの待ち時間を返す
+        with self._lock:
+            now = self._clock()
+            pace = self._pace(host, now)
+            start = max(now, pace.next_at, pace.blocked_until)
+            pace.next_at = start + pace.delay
+        return start - now
+
+    def _remaining_block(self, host: str) -> float:
+        with self._lock:
+            now = self._clock()
+            return self._pace(host, now).blocked_until - now
+
+    def acquire(self, host: str) -> float:
+        # リクエストを送ってよい時刻までブロックし、実際に待機した秒数を返す
+        waited = 0.0
+        wait = self._reserve(host)
+        while wait > 0:
+            self._sleep(wait)
+            waited += wait
+            # 待機中に Retry-After を受け取った場合は、その時刻まで待機を延ばす
+            wait = self._remaining_block(host)
+        return waited
+
+    def observe(
+        self,
+        host: str,
+        status_code: int,
+        elapsed_sec: float,
+        retry_after: Optional[float] = None,
+        retried_statuses: Iterable[int] = (),
+    ) -> None:
+        # レスポンスの結果からリクエスト間隔を調整する
+        # retried_statuses: urllib3のリトライで再試行したレスポンスのステータスコード
+        with self._lock:
+            now = self._clock()
+            pace = self._pace(host, now)
+
+            congested = (
+                status_code == 429
+                or status_code >= 500
+                or any(s == 429 or s >= 500 for s in retried_statuses if s is not None)
+                or elapsed_sec > self.slow_response_sec
+                or (
+                    pace.latency_ewma is not None
+                    and elapsed_sec > self.latency_floor_sec
+                    and elapsed_sec > self.latency_ratio * pace.latency_ewma
+                )
+            )
+
+            if congested:
+                pace.delay = min(self.max_delay, pace.delay * self.backoff_factor)
+            else:
+                pace.delay = max(self.min_delay, pace.delay - self.decrease_step)
+                # 応答時間の基準は正常な応答だけで更新する
+                if pace.latency_ewma is None:
+                    pace.latency_ewma = elapsed_sec
+                else:
+                    pace.latency_ewma = 0.8 * pace.latency_ewma + 0.2 * elapsed_sec
+
+            if retry_after is not None and retry_after > 0:
+                # Retry-After の時刻までは（待機中のものも含めて）リクエストを送らない
+                pace.blocked_until = max(pace.blocked_until, now + retry_after)
@@ -1,6 +1,9 @@
-from typing import List, Optional
+from typing import List, Optional, Union
 from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
 from bs4 import BeautifulSoup
+from lxml import etree
+import html as html_lib
 import re
 
 from src.scraping.utils import get_excluded_thread_titles
@@ -10,17 +13,100 @@ from src.scraping.utils import get_excluded_thread_titles
 class ThreadInfo:
     # スレッド情報を格納するデータクラス
     path: str
+    # 板一覧に表示されているレス数（取得できない場合はNone）
+    reply_count: Optional[int] = None
+    # スレッドキー（スレ立て時刻のUNIX時間。例: "1765368460"）
+    key: Optional[str] = None
+    # スレッドタイトル
+    title: Optional[str] = None
 
 
-@dataclass
+@dataclass(slots=True)
 class PostInfo:
     # 投稿情報を格納するデータクラス
+    # 1スレッドで数百件生成されるため、インスタンスごとの__dict__を持たない__slots__にする
     date: str
     content: str
+    # レス番号（取得できない場合はNone）
+    number: Optional[int] = None
+    # 投稿者ID（"ID:AbCd1234" の "AbCd1234"。表示されていない場合はNone）
+    poster_id: Optional[str] = None
+    # 投稿日時（日本時間のaware datetime。date を解析できない場合（あぼーん等）はNone）
+    posted_at: Optional[datetime] = None
+
+
+JST = timezone(timedelta(hours=9))
+
+
+def parse_post_datetime(value: str) -> Optional[datetime]:
+    # 5chの投稿日時 "YYYY/MM/DD(曜) HH:MM:SS.ff" を日本時間のdatetimeに変換する
+    # 1レスごとに呼ばれるため、strptime（書式の解釈・ロケール処理）を使わず位置で切り出す
+    # 曜日の表記（"水"、"水曜"など）と時刻の前の空白の有無は問わない。解析できなければNone
+    if len(value) < 18 or value[4] != '/' or value[7] != '/' or value[10] != '(':
+        return None
+    close = value.find(')', 11)
+    if close < 0:
+        return None
+    time_part = value[close + 1:].lstrip()
+    if len(time_part) < 8 or time_part[2] != ':' or time_part[5] != ':':
+        return None
+
+    digits = (
+        value[0:4], value[5:7], value[8:10],
+        time_part[0:2], time_part[3:5], time_part[6:8],
+    )
+    if not all(d.isdigit() for d in digits):
+        return None
+
+    microsecond = 0
+    if len(time_part) > 9 and time_part[8] == '.':
+        end = 9
+        while end < len(time_part) and end < 15 and time_part[end].isdigit():
+            end += 1
+        if end > 9:
+            microsecond = int(time_part[9:end].ljust(6, '0'))
+
+    try:
+        return datetime(
+            int(digits[0]), int(digits[1]), int(digits[2]),
+            int(digits[3]), int(digits[4]), int(digits[5]),
+            microsecond, tzinfo=JST,
+        )
+    except ValueError:
+        # 存在しない日付・時刻
+        return None
+
+
+def _poster_id(uid_text: str) -> Optional[str]:
+    # <span class="uid"> の "ID:AbCd1234" から "AbCd1234" を取り出す
+    if uid_text.startswith('ID:'):
+        uid_text = uid_text[3:]
+    return uid_text or None
+
+
+# 5chのページのエンコーディング（Shift_JISのMicrosoft拡張。①、髙 などを含む）
+DEFAULT_ENCODING = 'cp932'
+
 
+def _decode(html: Union[str, bytes], encoding: str) -> str:
+    # バイト列はPythonのコーデックで文字列にしてからパーサーに渡す
+    # （libxml2(iconv)のCP932変換は 〜 − ¬ など6文字の対応がPythonのcp932と異なり、
+    # 文字参照で書かれた同じ文字と区別できなくなるため、パーサーにデコードさせない）
+    if isinstance(html, bytes):
+        return html.decode(encoding, errors='replace')
+    return html
 
-def parse_board_page(html: str) -> List[ThreadInfo]:
-    soup = BeautifulSoup(html, 'lxml')
+
+# 先頭のXML宣言（<?xml version="1.0" encoding="Shift_JIS"?>）
+_XML_DECLARATION = re.compile(r'^\s*<\?xml[^>]*\?>')
+
+
+def parse_board_page(
+    html: Union[str, bytes],
+    encoding: str = DEFAULT_ENCODING,
+) -> List[ThreadInfo]:
+    # バイト列が渡された場合は encoding でデコードして解析する
+    soup = BeautifulSoup(_decode(html, encoding), 'lxml')
     thread_list: List[ThreadInfo] = []
 
     # 取得対象外スレッドタイトルをユーティリティ関数から取得
@@ -37,6 +123,8 @@ def parse_board_page(html: str) -> List[ThreadInfo]:
             # 先頭の「数字:  」と末尾の「(数字)」を除去して実際のスレッドタイトルを取得
             # 例: "1:  ★ UPLIFT プレミアム・サービスのお知らせ (2)" -> "★ UPLIFT プレミアム・サービスのお知らせ"
             title = re.sub(r'^\d+:\s*', '', raw_title)  # 先頭の「数字:  」を除去
+            reply_match = re.search(r'\((\d+)\)$', title)
+            reply_count = int(reply_match.group(1)) if reply_match else None
             title = re.sub(r'\s*\(\d+\)$', '', title)   # 末尾の「(数字)」を除去
 
             # 取得対象外のスレッドタイトルはスキップ
@@ -47,13 +135,149 @@ def parse_board_page(html: str) -> List[ThreadInfo]:
             # /test/read.cgi/prog/1607671811/l50 -> /test/read.cgi/prog/1607671811
             path = re.sub(r'/l\d+/?$', '', href).rstrip('/')
             if path:
-                thread_list.append(ThreadInfo(path=path))
+                key = path.rsplit('/', 1)[-1]
+                thread_list.append(
+                    ThreadInfo(
+                        path=path,
+                        reply_count=reply_count,
+                        key=key if key.isdecimal() else None,
+                        title=title,
+                    )
+                )
 
     return thread_list
 
 
-def parse_thread_page(html: str) -> List[PostInfo]:
-    soup = BeautifulSoup(html, 'lxml')
+# subject.txtの1行: "1765368460.dat<>スレッドタイトル (123)"
+SUBJECT_LINE_PATTERN = re.compile(r'^(\d+)\.dat<>(.*?)\s*\((\d+)\)\s*$')
+
+
+def parse_subject_txt(
+    text: Union[str, bytes],
+    board_key: str,
+    encoding: str = DEFAULT_ENCODING,
+) -> List[ThreadInfo]:
+    # 板のsubject.txt（1行1スレッドのテキスト）からスレッド一覧を取得する
+    # 並び順は板トップページと同じ（最終書き込みの新しい順）
+    if isinstance(text, bytes):
+        text = text.decode(encoding, errors='replace')
+    thread_list: List[ThreadInfo] = []
+    excluded_titles = set(get_excluded_thread_titles())
+
+    for line in text.splitlines():
+        match = SUBJECT_LINE_PATTERN.match(line)
+        if not match:
+            continue
+
+        key, raw_title, reply_count = match.groups()
+        # タイトル中の文字参照（&amp; など）を戻す
+        title = html_lib.unescape(raw_title)
+        if title in excluded_titles:
+            continue
+
+        thread_list.append(
+            ThreadInfo(
+                path=f"/test/read.cgi/{board_key}/{key}",
+                reply_count=int(reply_count),
+                key=key,
+                title=title,
+            )
+        )
+
+    return thread_list
+
+
+# parse_thread_page のパーサーエンジン
+THREAD_PARSER_ENGINES = ('lxml', 'bs4')
+
+
+def _class_xpath(class_name: str) -> str:
+    # class属性に指定したクラスを含む要素（BeautifulSoupのclass_指定と同じ判定）
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {class_name} ')"
+
+
+# lxmlエンジン用のコンパイル済みXPath
+_POST_DIVS = etree.XPath("//div[normalize-space(@class)='clear post']")
+_DATE_SPAN = etree.XPath(f"(.//span[{_class_xpath('date')}])[1]")
+_CONTENT_DIV = etree.XPath(f"(.//div[{_class_xpath('post-content')}])[1]")
+_POSTID_SPAN = etree.XPath(f"(.//span[{_class_xpath('postid')}])[1]")
+_UID_SPAN = etree.XPath(f"(.//span[{_class_xpath('uid')}])[1]")
+# BeautifulSoupのget_text()が除外する要素（bs4のHTMLTreeBuilder.string_containers）内のテキストは
+# 同様に除外する（<rt>/<rp> はルビの読み・括弧）
+_EXCLUDED_TEXT_ELEMENTS = ('script', 'style', 'template', 'rt', 'rp')
+_TEXT_NODES = etree.XPath(
+    ".//text()[not(ancestor::*[{}])]".format(
+        ' or '.join(f"self::{name}" for name in _EXCLUDED_TEXT_ELEMENTS)
+    ),
+    smart_strings=False,
+)
+
+
+def _stripped_texts(element) -> List[str]:
+    # get_text(strip=True)と同様に、各テキストノードを前後の空白を除去して空のものを捨てる
+    texts = []
+    for text in _TEXT_NODES(element):
+        text = text.strip()
+        if text:
+            texts.append(text)
+    return texts
+
+
+def parse_thread_page(
+    html: Union[str, bytes],
+    engine: str = 'lxml',
+    encoding: str = DEFAULT_ENCODING,
+) -> List[PostInfo]:
+    # engine="lxml"（既定）はコンパイル済みXPathで直接解析する高速版、
+    # engine="bs4" はBeautifulSoupによる従来の実装。どちらも同じ結果を返す
+    # html にはバイト列（Scraper.fetch_bytes の戻り値）も渡せる（encoding でデコードする）
+    if engine == 'lxml':
+        return _parse_thread_page_lxml(html, encoding)
+    if engine == 'bs4':
+        return _parse_thread_page_bs4(html, encoding)
+    raise ValueError(f"Invalid engine: {engine}")
+
+
+def _parse_thread_page_lxml(html: Union[str, bytes], encoding: str) -> List[PostInfo]:
+    # lxmlはエンコーディング宣言を含む文字列を受け付けない（ValueError）ため、
+    # デコード済みの文字列からXML宣言を取り除く（BeautifulSoupは宣言を無視する）
+    html = _XML_DECLARATION.sub('', _decode(html, encoding), count=1)
+    root = etree.HTML(html) if html else None
+    post_list: List[PostInfo] = []
+
+    if root is None:
+        return post_list
+
+    for post_div in _POST_DIVS(root):
+        date_spans = _DATE_SPAN(post_div)
+        date = ''.join(_stripped_texts(date_spans[0])) if date_spans else ''
+
+        content_divs = _CONTENT_DIV(post_div)
+        content = '\n'.join(_stripped_texts(content_divs[0])) if content_divs else ''
+
+        number_text = post_div.get('id', '')
+        if not number_text.isdecimal():
+            postid_spans = _POSTID_SPAN(post_div)
+            number_text = ''.join(_stripped_texts(postid_spans[0])) if postid_spans else ''
+        number = int(number_text) if number_text.isdecimal() else None
+
+        uid_spans = _UID_SPAN(post_div)
+        poster_id = _poster_id(''.join(_stripped_texts(uid_spans[0]))) if uid_spans else None
+
+        if date and content:
+            post_list.append(PostInfo(
+                date=date,
+                content=content,
+                number=number,
+                poster_id=poster_id,
+                posted_at=parse_post_datetime(date),
+            ))
+
+    return post_list
+
+
+def _parse_thread_page_bs4(html: Union[str, bytes], encoding: str) -> List[PostInfo]:
+    soup = BeautifulSoup(_decode(html, encoding), 'lxml')
     post_list: List[PostInfo] = []
 
     # class="clear post"を持つdiv要素を取得（各投稿）
@@ -70,8 +294,25 @@ def parse_thread_page(html: str) -> List[PostInfo]:
         else:
             content = ''
 
+        # レス番号を取得（div要素のid属性、なければ<span class="postid">）
+        number_text = post_div.get('id', '')
+        if not number_text.isdecimal():
+            postid_span = post_div.find('span', class_='postid')
+            number_text = postid_span.get_text(strip=True) if postid_span else ''
+        number = int(number_text) if number_text.isdecimal() else None
+
+        # 投稿者IDを取得（<span class="uid">）
+        uid_span = post_div.find('span', class_='uid')
+        poster_id = _poster_id(uid_span.get_text(strip=True)) if uid_span else None
+
         if date and content:
-            post_list.append(PostInfo(date=date, content=content))
+            post_list.append(PostInfo(
+                date=date,
+                content=content,
+                number=number,
+                poster_id=poster_id,
+                posted_at=parse_post_datetime(date),
+            ))
 
     return post_list
 
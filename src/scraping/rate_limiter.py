@@ -0,0 +1,48 @@
+import threading
+import time
+from typing import Callable, Dict
+
+
+class TokenBucketRateLimiter:
+    """ホストごとのトークンバケット方式のレート制限（スレッドセーフ）"""
+
+    def __init__(
+        self,
+        rate: float,
+        burst: int = 1,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        if rate <= 0:
+            raise ValueError(f"rate must be positive: {rate}")
+        if burst < 1:
+            raise ValueError(f"burst must be >= 1: {burst}")
+
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._sleep = sleep
+        self._lock = threading.Lock()
+        # host -> (残りトークン数, 最終更新時刻)
+        self._buckets: Dict[str, tuple[float, float]] = {}
+
+    def _reserve(self, host: str) -> float:
+        # トークンを1つ予約し、使えるようになるまでの待ち時間を返す
+        # トークンは負の値まで借りられるため、待機中のスレッドは到着順に払い出される
+        with self._lock:
+            now = self._clock()
+            tokens, last = self._buckets.get(host, (float(self.burst), now))
+            tokens = min(float(self.burst), tokens + (now - last) * self.rate)
+            tokens -= 1.0
+            self._buckets[host] = (tokens, now)
+
+        if tokens >= 0:
+            return 0.0
+        return -tokens / self.rate
+
+    def acquire(self, host: str) -> float:
+        # トークンが得られるまでブロックし、実際に待機した秒数を返す
+        wait = self._reserve(host)
+        if wait > 0:
+            self._sleep(wait)
+        return wait
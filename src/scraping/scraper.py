@@ -6,6 +6,11 @@ from requests.adapters import HTTPAdapter
 from urllib3.util.retry import Retry
 
 from src.scraping import utils
+from src.scraping.archive import ArchiveRun
+from src.scraping.http_cache import HttpValidatorCache
+from src.scraping.pacer import PACED_RETRY_STATUSES, AimdPacer
+from src.scraping.rate_limiter import TokenBucketRateLimiter
+from src.scraping.stats import ScraperStats
 
 
 class Scraper:
@@ -15,46 +20,169 @@ class Scraper:
         max_retries: int = 3,
         backoff_factor: float = 1.0,
         request_delay: float = 2.0,
+        rate_limiter: Optional[TokenBucketRateLimiter] = None,
+        pool_maxsize: int = 10,
+        archive_run: Optional[ArchiveRun] = None,
+        stats: Optional[ScraperStats] = None,
+        pacer: Optional[AimdPacer] = None,
+        http_cache: Optional[HttpValidatorCache] = None,
     ):
         self.timeout = timeout
         self.max_retries = max_retries
         self.backoff_factor = backoff_factor
         self.request_delay = request_delay
+        # rate_limiterが指定された場合は、リクエスト後の固定待機の代わりに
+        # リクエスト前にホスト単位でトークンを取得する（複数スレッドから共有可能）
+        self.rate_limiter = rate_limiter
+        # archive_runが指定された場合は、取得したページの生バイト列をアーカイブに記録する
+        self.archive_run = archive_run
+        # リクエストごとのレイテンシ・転送量・リトライ・待機時間の集計
+        self.stats = stats if stats is not None else ScraperStats()
+        # pacerが指定された場合は、固定待機の代わりにレスポンスに応じて調整される間隔で待機し、
+        # 429/503 は Retry-After を守ってpacer側で再試行する（urllib3のリトライ対象から外す）
+        self.pacer = pacer
+        # http_cacheが指定された場合は、ETag / Last-Modified を返したページを保存し、
+        # 再取得時は条件付きリクエストを送って 304 Not Modified ならキャッシュのボディを使う
+        self.http_cache = http_cache
 
         # セッションの設定
         self.session = requests.Session()
         self.session.headers.update(utils.get_default_headers())
 
         # リトライ戦略の設定
+        status_forcelist = [429, 500, 502, 503, 504]
+        if pacer is not None:
+            status_forcelist = [
+                status for status in status_forcelist
+                if status not in PACED_RETRY_STATUSES
+            ]
         retry_strategy = Retry(
             total=max_retries,
             backoff_factor=backoff_factor,
-            status_forcelist=[429, 500, 502, 503, 504],
+            status_forcelist=status_forcelist,
             allowed_methods=["GET", "POST"],
         )
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = HTTPAdapter(
+            max_retries=retry_strategy,
+            pool_maxsize=pool_maxsize,
+        )
         self.session.mount("http://", adapter)
         self.session.mount("https://", adapter)
 
-    def fetch(self, url: str, encoding: str = 'Shift_JIS') -> Optional[str]:
+    def _get(self, url: str) -> requests.Response:
         if not utils.is_valid_url(url):
             raise ValueError(f"Invalid URL: {url}")
 
-        try:
-            response = self.session.get(url, timeout=self.timeout)
-            # HTTPステータスコードが正常でない場合はエラーを発生させる
-            response.raise_for_status()
-
-            # エンコーディングを設定
-            response.encoding = encoding
-
-            # リクエスト間の待機
-            utils.sleep_with_jitter(self.request_delay)
-
-            return response.text
-
-        except requests.RequestException as e:
-            raise requests.RequestException(f"Failed to fetch {url}: {e}") from e
+        host = utils.get_host(url)
+        attempt = 0
+        # urllib3 と pacer による再試行回数の合計
+        retries = 0
+        use_validators = self.http_cache is not None
+        while True:
+            if self.rate_limiter is not None:
+                waited = self.rate_limiter.acquire(host)
+                self.stats.record_rate_limit_wait(waited)
+            if self.pacer is not None:
+                waited = self.pacer.acquire(host)
+                self.stats.record_sleep(waited)
+
+            try:
+                request_kwargs = {}
+                if use_validators:
+                    headers = self.http_cache.conditional_headers(url)
+                    if headers:
+                        request_kwargs["headers"] = headers
+
+                started = time.perf_counter()
+                response = self.session.get(url, timeout=self.timeout, **request_kwargs)
+                total_sec = time.perf_counter() - started
+
+                history = self._retry_history(response)
+                retried_statuses = [entry.status for entry in history if entry.status is not None]
+                retries += len(history)
+                self.stats.record_retry_statuses(retried_statuses)
+
+                if self.pacer is not None:
+                    self.pacer.observe(
+                        host,
+                        response.status_code,
+                        response.elapsed.total_seconds(),
+                        retry_after=utils.parse_retry_after(
+                            response.headers.get("Retry-After")
+                        ),
+                        retried_statuses=retried_statuses,
+                    )
+                    if (
+                        response.status_code in PACED_RETRY_STATUSES
+                        and attempt < self.max_retries
+                    ):
+                        # pacerが広げた間隔（Retry-After）だけ待ってから再試行する
+                        attempt += 1
+                        retries += 1
+                        self.stats.record_retry_statuses([response.status_code])
+                        continue
+
+                # HTTPステータスコードが正常でない場合はエラーを発生させる
+                response.raise_for_status()
+
+                # 転送量は 304 の場合も実際に受信したボディのバイト数
+                num_bytes = len(response.content)
+                if self.http_cache is not None:
+                    if response.status_code == 304:
+                        cached = self.http_cache.get(url)
+                        if cached is None:
+                            # 304を受け取る前にキャッシュから削除された場合は、条件なしで取得し直す
+                            use_validators = False
+                            continue
+                        response._content = cached
+                    else:
+                        self.http_cache.store(url, response.content, response.headers)
+
+                self.stats.record_request(
+                    ttfb_sec=response.elapsed.total_seconds(),
+                    total_sec=total_sec,
+                    num_bytes=num_bytes,
+                    retries=retries,
+                )
+
+                if self.archive_run is not None:
+                    self.archive_run.record(url, response.content)
+
+                # リクエスト間の待機（レート制限・pacerを使う場合は取得前に待機済み）
+                if self.rate_limiter is None and self.pacer is None:
+                    started = time.perf_counter()
+                    utils.sleep_with_jitter(self.request_delay)
+                    self.stats.record_sleep(time.perf_counter() - started)
+
+                return response
+
+            except requests.RequestException as e:
+                self.stats.record_error(retries=retries)
+                raise requests.RequestException(f"Failed to fetch {url}: {e}") from e
+
+    @staticmethod
+    def _retry_history(response: requests.Response) -> tuple:
+        # urllib3はリトライ後のレスポンスに、再試行の履歴（RequestHistory）を持つRetryを付与する
+        retries = getattr(response.raw, "retries", None)
+        history = getattr(retries, "history", None)
+        if not isinstance(history, tuple):
+            return ()
+        return history
+
+    def fetch(self, url: str, encoding: str = 'cp932') -> Optional[str]:
+        # 5chのページはShift_JISと宣言されているが、実際にはMicrosoft拡張文字（①、髙 など）を
+        # 含むため、厳密なShift_JISではなくcp932でデコードする
+        response = self._get(url)
+
+        # エンコーディングを設定
+        response.encoding = encoding
+
+        return response.text
+
+    def fetch_bytes(self, url: str) -> Optional[bytes]:
+        # デコードせずにレスポンスボディをそのまま返す
+        # （parse_thread_page などにバイト列とエンコーディングを渡し、パーサー側でデコードする）
+        return self._get(url).content
 
     def close(self) -> None:
         self.session.close()
@@ -0,0 +1,137 @@
+from __future__ import annotations
+
+import bisect
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+
+
+# ヒストグラムのバケット上限
+LATENCY_BUCKETS_MS = (50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000)
+BYTES_BUCKETS = (1_000, 10_000, 50_000, 100_000, 250_000, 500_000, 1_000_000)
+RETRY_BUCKETS = (0, 1, 2, 3)
+SLEEP_BUCKETS_MS = (0, 500, 1000, 1500, 2000, 2500, 3000, 5000, 10000)
+
+
+class Histogram:
+    """固定バケットのヒストグラム（件数・合計・最大値とバケットごとの件数を保持）"""
+
+    def __init__(self, bounds: Sequence[float]):
+        self.bounds = tuple(bounds)
+        # 最後の要素はいずれの上限も超えた値（+Inf）の件数
+        self.counts: List[int] = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        self.counts[bisect.bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> Optional[float]:
+        # バケット上限による近似値（+Infのバケットに入る場合は最大値）
+        if self.count == 0:
+            return None
+        rank = q * self.count
+        cumulative = 0
+        for bound, count in zip(self.bounds, self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return min(bound, self.max)
+        return self.max
+
+    def summary(self) -> Dict[str, object]:
+        labels = [f"le_{bound:g}" for bound in self.bounds] + ["le_inf"]
+        return {
+            "count": self.count,
+            "sum": round(self.total, 3),
+            "mean": round(self.total / self.count, 3) if self.count else None,
+            "max": round(self.max, 3),
+            "p50": self.quantile(0.5),
+            "p90": self.quantile(0.9),
+            "p99": self.quantile(0.99),
+            "buckets": dict(zip(labels, self.counts)),
+        }
+
+
+class ScraperStats:
+    """Scraperのリクエストごとの計測値を集計するクラス（スレッドセーフ）
+
+    計測項目:
+      ttfb_ms: レスポンスヘッダ受信までの時間（requestsの Response.elapsed）
+      total_ms: 本文の受信完了までの時間（リトライのバックオフを含む）
+      response_bytes: レスポンスボディのバイト数
+      retries: 再試行回数（urllib3のRetry と AimdPacer による 429/503 の再試行。失敗したリクエストも含む）
+      retry_statuses: 再試行したレスポンスのステータスコードごとの件数
+      sleep_ms: リクエスト間の待機（sleep_with_jitter または AimdPacer）の時間
+      rate_limit_wait_ms: レート制限のトークン待ちの時間
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.ttfb_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.total_ms = Histogram(LATENCY_BUCKETS_MS)
+        self.response_bytes = Histogram(BYTES_BUCKETS)
+        self.retries = Histogram(RETRY_BUCKETS)
+        self.retry_statuses: Dict[int, int] = {}
+        self.sleep_ms = Histogram(SLEEP_BUCKETS_MS)
+        self.rate_limit_wait_ms = Histogram(SLEEP_BUCKETS_MS)
+
+    def record_request(
+        self,
+        ttfb_sec: float,
+        total_sec: float,
+        num_bytes: int,
+        retries: int,
+    ) -> None:
+        with self._lock:
+            self.requests += 1
+            self.ttfb_ms.observe(ttfb_sec * 1000)
+            self.total_ms.observe(total_sec * 1000)
+            self.response_bytes.observe(num_bytes)
+            self.retries.observe(retries)
+
+    def record_error(self, retries: int = 0) -> None:
+        # 再試行しても取得できなかったリクエストの再試行回数もヒストグラムに含める
+        with self._lock:
+            self.errors += 1
+            self.retries.observe(retries)
+
+    def record_retry_statuses(self, statuses: Iterable[int]) -> None:
+        # 再試行したレスポンスのステータスコード（429・503 などのスロットリングの件数）
+        with self._lock:
+            for status in statuses:
+                self.retry_statuses[status] = self.retry_statuses.get(status, 0) + 1
+
+    def record_sleep(self, seconds: float) -> None:
+        with self._lock:
+            self.sleep_ms.observe(seconds * 1000)
+
+    def record_rate_limit_wait(self, seconds: float) -> None:
+        with self._lock:
+            self.rate_limit_wait_ms.observe(seconds * 1000)
+
+    def summary(self) -> Dict[str, object]:
+        # PipelineMetricsDaily.scraper_stats にそのまま保存できる辞書を返す
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "total_bytes": int(self.response_bytes.total),
+                "total_retries": int(self.retries.total),
+                "retry_statuses": {
+                    str(status): count
+                    for status, count in sorted(self.retry_statuses.items())
+                },
+                "sleep_sec": round(self.sleep_ms.total / 1000, 3),
+                "rate_limit_wait_sec": round(self.rate_limit_wait_ms.total / 1000, 3),
+                "ttfb_ms": self.ttfb_ms.summary(),
+                "total_ms": self.total_ms.summary(),
+                "response_bytes": self.response_bytes.summary(),
+                "retries": self.retries.summary(),
+                "sleep_ms": self.sleep_ms.summary(),
+                "rate_limit_wait_ms": self.rate_limit_wait_ms.summary(),
+            }
@@ -1,4 +1,6 @@
 import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from typing import Optional
 from urllib.parse import urljoin, urlparse
 
@@ -19,6 +21,17 @@ def is_valid_url(url: str) -> bool:
         return False
 
 
+def get_host(url: str) -> str:
+    # レート制限の単位となるホスト名（例: "medaka.5ch.net"）を返す
+    return urlparse(url).netloc.lower()
+
+
+def get_board_key(board_path: str) -> str:
+    # 板のパスから板キーを取得する（例: "/prog/" -> "prog"）
+    parts = [p for p in board_path.strip('/').split('/') if p]
+    return parts[-1] if parts else ''
+
+
 def get_default_headers() -> dict[str, str]:
     return {
         'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36',
@@ -32,6 +45,27 @@ def sleep_with_jitter(base_seconds: float, jitter_range: float = 0.5) -> None:
     time.sleep(max(0, sleep_time))
 
 
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    # Retry-After ヘッダ（秒数 または HTTP-date）を待機秒数に変換する
+    if not value:
+        return None
+
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+
+    if now is None:
+        now = datetime.now(timezone.utc)
+    return max(0.0, (retry_at - now).total_seconds())
+
+
 def get_excluded_thread_titles() -> list[str]:
     # プロジェクト共通の除外スレッドタイトルをここで管理する
     EXCLUDED_THREAD_TITLES: list[str] = [
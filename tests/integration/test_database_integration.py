@@ -9,6 +9,7 @@ from src.database.repositories import (
     PipelineRunRepository,
 )
 from src.database.models import Term, DailyTermStats, PipelineRun
+from src.database.term_cache import TermCache
 
 
 @pytest.mark.integration
@@ -103,6 +104,43 @@ class TestDatabaseIntegration:
         # 異なるIDが返される
         assert term3.term_id != term_id
     
+    def test_term_resolve_many(self, test_session):
+        """resolve_manyで既存の語を取得し、存在しない語だけを作成する"""
+        term_repo = TermRepository(test_session)
+        existing = term_repo.get_or_create("既存の名詞")
+        existing.is_blocked = True
+        test_session.commit()
+        
+        terms = term_repo.resolve_many(
+            ["新しい名詞1", "既存の名詞", "新しい名詞2", "新しい名詞1"], chunk_size=2
+        )
+        test_session.commit()
+        
+        assert set(terms) == {"新しい名詞1", "既存の名詞", "新しい名詞2"}
+        assert terms["既存の名詞"].term_id == existing.term_id
+        assert terms["既存の名詞"].is_blocked is True
+        assert terms["新しい名詞1"].term_id != terms["新しい名詞2"].term_id
+        
+        # 2回目は作成せずに同じTermを返す
+        again = term_repo.resolve_many(["新しい名詞2", "新しい名詞1"])
+        assert {k: v.term_id for k, v in again.items()} == {
+            k: terms[k].term_id for k in again
+        }
+    
+    def test_update_blocked_invalidates_cache_after_commit(self, test_session):
+        """コミット前に変更前の値がキャッシュされても、コミット後に削除される"""
+        cache = TermCache()
+        term_repo = TermRepository(test_session, term_cache=cache)
+        term = term_repo.get_or_create("ブロック対象")
+        test_session.commit()
+        
+        term_repo.update_blocked(term.term_id, True, "spam")
+        # コミット前に他のスレッドが変更前の値をキャッシュした
+        cache.put("ブロック対象", term.term_id, False)
+        test_session.commit()
+        
+        assert cache.get("ブロック対象") is None
+    
     def test_daily_stats_upsert(self, test_session):
         """DailyTermStatsのupsertが正しく動作するか"""
         term_repo = TermRepository(test_session)
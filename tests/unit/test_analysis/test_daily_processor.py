@@ -5,7 +5,9 @@ from uuid import uuid4
 
 from src.analysis.daily_processor import DailyProcessor, DailyProcessorMetrics
 from src.database.models import Term
+from src.scraping.crawl_budget import CrawlCoverage
 from src.scraping.daily_scraper import CollectedPost
+from src.scraping.stats import ScraperStats
 
 
 @pytest.fixture
@@ -22,8 +24,11 @@ def mock_session():
 
 @pytest.fixture
 def mock_term_repo():
-    """モックTermRepository"""
+    """モックTermRepository（resolve_manyは語ごとにget_or_createの結果を返す）"""
     repo = Mock()
+    repo.resolve_many.side_effect = lambda vocabulary: {
+        normalized: repo.get_or_create(normalized) for normalized in vocabulary
+    }
     return repo
 
 
@@ -53,14 +58,40 @@ def processor(mock_session, mock_term_repo, mock_daily_stats_repo, mock_metrics_
     """DailyProcessorのインスタンス（モック注入）"""
     with patch('src.analysis.daily_processor.TermRepository') as mock_term_repo_class, \
          patch('src.analysis.daily_processor.DailyTermStatsRepository') as mock_daily_stats_repo_class, \
-         patch('src.analysis.daily_processor.PipelineMetricsDailyRepository') as mock_metrics_repo_class, \
-         patch('src.analysis.daily_processor.NounExtractor', return_value=mock_noun_extractor):
+         patch('src.analysis.daily_processor.PipelineMetricsDailyRepository') as mock_metrics_repo_class:
         mock_term_repo_class.return_value = mock_term_repo
         mock_daily_stats_repo_class.return_value = mock_daily_stats_repo
         mock_metrics_repo_class.return_value = mock_metrics_repo
-        return DailyProcessor(mock_session)
+        return DailyProcessor(mock_session, noun_extractor=mock_noun_extractor)
 
 
+
+def _collected_posts(rows):
+    """(スレッド番号, 日付, 本文) の組から投稿リストを作る"""
+    return [
+        CollectedPost(f"/test/read.cgi/prog/{thread}", posted, content)
+        for thread, posted, content in rows
+    ]
+
+
+def _setup_split_nouns(mock_noun_extractor, mock_term_repo, normalized_terms):
+    """本文を空白で区切った語を名詞として返し、normalized_terms の順にterm_idを割り当てる"""
+    mock_noun_extractor.extract_nouns.side_effect = lambda content: content.split()
+    terms = {
+        normalized: Term(term_id=i, normalized=normalized, is_blocked=False)
+        for i, normalized in enumerate(normalized_terms, 1)
+    }
+    mock_term_repo.get_or_create.side_effect = lambda normalized: terms[normalized]
+    return terms
+
+
+def _saved_stats(mock_daily_stats_repo):
+    """daily_term_statsに保存した term_id -> (post_hits, thread_hits)"""
+    return {
+        call[0][0].term_id: (call[0][0].post_hits, call[0][0].thread_hits)
+        for call in mock_daily_stats_repo.upsert.call_args_list
+    }
+
 class TestDailyProcessorMetrics:
     def test_duration_sec_calculated(self):
         """処理時間が正しく計算される"""
@@ -344,6 +375,39 @@ class TestDailyProcessorProcessPosts:
         assert metrics.filtered_tokens == 1  # "blocked"がフィルタされた
         assert mock_daily_stats_repo.upsert.call_count == 1  # Pythonのみ保存
     
+    def test_process_posts_resolves_each_term_once(self, processor, mock_noun_extractor,
+                                                   mock_term_repo, mock_daily_stats_repo):
+        """Termの取得は集計の後に、正規化後の語ごとに1回だけ行う"""
+        posts = [
+            CollectedPost("/test/read.cgi/prog/1", "2025/01/01(水) 12:00:00.00", "a"),
+            CollectedPost("/test/read.cgi/prog/1", "2025/01/01(水) 12:01:00.00", "b"),
+            CollectedPost("/test/read.cgi/prog/2", "2025/01/01(水) 13:00:00.00", "c"),
+        ]
+        nouns = {
+            "a": ["Python", "ＰＹＴＨＯＮ", "blocked", "blocked"],
+            "b": ["Python", "学習"],
+            "c": ["python", "blocked"],
+        }
+        mock_noun_extractor.extract_nouns.side_effect = lambda content: nouns[content]
+        terms = {
+            "python": Term(term_id=1, normalized="python", is_blocked=False),
+            "blocked": Term(term_id=2, normalized="blocked", is_blocked=True),
+            "学習": Term(term_id=3, normalized="学習", is_blocked=False),
+        }
+        mock_term_repo.get_or_create.side_effect = lambda normalized: terms[normalized]
+        
+        metrics = processor.process_posts(posts, date(2025, 1, 1), "prog")
+        
+        # 語彙をまとめて、最初に出現した順に1回だけ
+        mock_term_repo.resolve_many.assert_called_once_with(["python", "blocked", "学習"])
+        assert metrics.total_tokens == 8
+        assert metrics.filtered_tokens == 3
+        saved = {
+            call[0][0].term_id: (call[0][0].post_hits, call[0][0].thread_hits)
+            for call in mock_daily_stats_repo.upsert.call_args_list
+        }
+        assert saved == {1: (3, 2), 3: (1, 1)}
+    
     def test_process_posts_no_nouns(self, processor, mock_noun_extractor, mock_term_repo,
                                     mock_daily_stats_repo, mock_metrics_repo):
         """名詞が抽出できない投稿が正しく処理される"""
@@ -433,4 +497,432 @@ class TestDailyProcessorProcessPosts:
         assert saved_metrics.fetched_posts == 1
         assert saved_metrics.parsed_posts == 1
         assert saved_metrics.total_tokens == 2
+        assert saved_metrics.scraper_stats is None
+        assert saved_metrics.crawl_coverage is None
+
+
+
+class TestDailyProcessorProcessPostsStream:
+    """DailyProcessor.process_posts_stream()のテスト"""
+    
+    POSTS = [
+        (1, "2025/01/01(水) 12:00:00.00", "Python 学習"),
+        (1, "2025/01/01(水) 12:01:00.00", "Python"),
+        (2, "2025/01/01(水) 13:00:00.00", "Python 学習"),
+    ]
+    TERMS = ["python", "学習"]
+    
+    def test_matches_process_posts(self, processor, mock_noun_extractor, mock_term_repo,
+                                   mock_daily_stats_repo, mock_metrics_repo):
+        """ジェネレータから受け取っても process_posts と同じ集計になる"""
+        _setup_split_nouns(mock_noun_extractor, mock_term_repo, self.TERMS)
+        target_date = date(2025, 1, 1)
+        
+        expected_metrics = processor.process_posts(_collected_posts(self.POSTS), target_date, "prog")
+        expected_stats = _saved_stats(mock_daily_stats_repo)
+        mock_daily_stats_repo.upsert.reset_mock()
+        
+        metrics = processor.process_posts_stream(
+            (post for post in _collected_posts(self.POSTS)), target_date, "prog"
+        )
+        
+        assert _saved_stats(mock_daily_stats_repo) == expected_stats
+        assert expected_stats == {1: (3, 2), 2: (2, 2)}
+        assert metrics.fetched_threads == expected_metrics.fetched_threads == 2
+        assert metrics.fetched_posts == expected_metrics.fetched_posts == 3
+        assert metrics.total_tokens == expected_metrics.total_tokens
+        assert mock_metrics_repo.upsert.call_count == 2
+    
+    def test_processes_posts_while_iterating(self, processor, mock_noun_extractor, mock_term_repo):
+        """全投稿を受け取る前に、受け取り済みのスレッドの名詞抽出が進む"""
+        _setup_split_nouns(mock_noun_extractor, mock_term_repo, self.TERMS)
+        extracted_counts = []
+        
+        def posts():
+            first, second, third = _collected_posts(self.POSTS)
+            yield first
+            yield second
+            yield third
+            # 2スレッド目の残りを要求された時点で1スレッド目は処理済み
+            extracted_counts.append(mock_noun_extractor.extract_nouns.call_count)
+        
+        processor.process_posts_stream(posts(), date(2025, 1, 1), "prog")
+        
+        assert extracted_counts == [2]
+        # 3件目は1件目と同じ本文のため、メモした名詞抽出の結果を使う
+        assert mock_noun_extractor.extract_nouns.call_count == 2
+    
+    def test_does_not_use_database_while_iterating(
+        self, processor, mock_session, mock_noun_extractor, mock_term_repo,
+        mock_daily_stats_repo, mock_metrics_repo,
+    ):
+        """投稿を受け取っている間はDBを使わない（巡回中にDB接続を保持しない）"""
+        _setup_split_nouns(mock_noun_extractor, mock_term_repo, self.TERMS)
+        repos = (mock_session, mock_term_repo, mock_daily_stats_repo, mock_metrics_repo)
+        for repo in repos:
+            repo.reset_mock(return_value=False, side_effect=False)
+        db_calls = []
+        
+        def posts():
+            for post in _collected_posts(self.POSTS):
+                yield post
+                db_calls.append(sum(len(repo.mock_calls) for repo in repos))
+        
+        processor.process_posts_stream(posts(), date(2025, 1, 1), "prog")
+        
+        assert db_calls == [0, 0, 0]
+        mock_daily_stats_repo.upsert.assert_called()
+    
+    def test_non_contiguous_thread_raises_value_error(self, processor, mock_noun_extractor,
+                                                      mock_term_repo):
+        """同じスレッドの投稿が連続していない場合はValueErrorが発生する"""
+        _setup_split_nouns(mock_noun_extractor, mock_term_repo, self.TERMS)
+        first, second, third = _collected_posts(self.POSTS)
+        
+        with pytest.raises(ValueError, match="not contiguous"):
+            processor.process_posts_stream(
+                [first, third, second], date(2025, 1, 1), "prog"
+            )
+    
+    def test_scraper_stats_saved(self, processor, mock_noun_extractor, mock_term_repo,
+                                 mock_metrics_repo):
+        """スクレイピングの計測の集計がメトリクスとともに保存される"""
+        _setup_split_nouns(mock_noun_extractor, mock_term_repo, self.TERMS)
+        scraper_stats = ScraperStats()
+        
+        def posts():
+            # 逐次処理では投稿を受け取り終えた時点の計測値を保存する
+            yield from _collected_posts(self.POSTS)
+            scraper_stats.record_request(ttfb_sec=0.1, total_sec=0.2, num_bytes=100, retries=1)
+        
+        processor.process_posts_stream(
+            posts(), date(2025, 1, 1), "prog", scraper_stats=scraper_stats
+        )
+        
+        saved_metrics = mock_metrics_repo.upsert.call_args[0][0]
+        assert saved_metrics.scraper_stats["requests"] == 1
+        assert saved_metrics.scraper_stats["total_retries"] == 1
+    
+    def test_crawl_coverage_saved(self, processor, mock_noun_extractor, mock_term_repo,
+                                  mock_metrics_repo):
+        """巡回の網羅状況がメトリクスとともに保存される"""
+        _setup_split_nouns(mock_noun_extractor, mock_term_repo, self.TERMS)
+        coverage = CrawlCoverage()
+        
+        def posts():
+            # 巡回の完了（ジェネレータの終了）時点の網羅状況を保存する
+            yield from _collected_posts(self.POSTS)
+            coverage.threads_fetched = 2
+            coverage.budget_exhausted = True
+        
+        processor.process_posts_stream(
+            posts(), date(2025, 1, 1), "prog", crawl_coverage=coverage
+        )
+        
+        saved_metrics = mock_metrics_repo.upsert.call_args[0][0]
+        assert saved_metrics.crawl_coverage["threads_fetched"] == 2
+        assert saved_metrics.crawl_coverage["budget_exhausted"] is True
+
+    
+    def test_replace_existing_deletes_stats_before_saving(
+        self, processor, mock_noun_extractor, mock_term_repo, mock_daily_stats_repo,
+    ):
+        """replace_existing=True の場合は既存の daily_term_stats を削除してから保存する"""
+        _setup_split_nouns(mock_noun_extractor, mock_term_repo, self.TERMS)
+        calls = []
+        mock_daily_stats_repo.delete_by_date_and_board.side_effect = (
+            lambda *args: calls.append("delete")
+        )
+        mock_daily_stats_repo.upsert.side_effect = lambda stats: calls.append("upsert")
+        
+        processor.process_posts_stream(
+            iter(_collected_posts(self.POSTS)), date(2025, 1, 1), "prog", replace_existing=True
+        )
+        
+        mock_daily_stats_repo.delete_by_date_and_board.assert_called_once_with(
+            date(2025, 1, 1), "prog"
+        )
+        assert calls == ["delete", "upsert", "upsert"]
+    
+    def test_keeps_existing_stats_by_default(self, processor, mock_noun_extractor,
+                                             mock_term_repo, mock_daily_stats_repo):
+        """既定では既存の daily_term_stats を削除しない"""
+        _setup_split_nouns(mock_noun_extractor, mock_term_repo, self.TERMS)
+        
+        processor.process_posts_stream(iter(_collected_posts(self.POSTS)), date(2025, 1, 1), "prog")
+        
+        mock_daily_stats_repo.delete_by_date_and_board.assert_not_called()
+
+
+class TestDailyProcessorTokenizePool:
+    """tokenize_poolを指定したDailyProcessorのテスト"""
+    
+    POSTS = [
+        (thread, "2025/01/01(水) 12:00:00.00", content)
+        for thread, content in [
+            (1, "Python 学習 Python"),
+            (1, "Python"),
+            (1, ""),
+            (2, "Python 学習"),
+            (2, "ブロック 学習"),
+            (3, "Rust Rust 学習"),
+        ]
+    ]
+    
+    def test_matches_single_process(self, processor, mock_noun_extractor, mock_term_repo,
+                                    mock_daily_stats_repo, monkeypatch):
+        """ワーカープロセスで名詞抽出しても、1プロセスの場合と同じ集計になる"""
+        import multiprocessing
+        
+        from src.analysis import tokenize_pool
+        from src.analysis.tokenize_memo import TokenizeMemo
+        from src.analysis.tokenize_pool import TokenizePool
+        
+        class SplitNounExtractor:
+            def __init__(self, dictionary_path=None):
+                pass
+            
+            def extract_nouns(self, text):
+                return text.split()
+        
+        mock_noun_extractor.extract_nouns.side_effect = lambda content: content.split()
+        terms = {}
+        
+        def get_or_create_side_effect(normalized):
+            # 最初に取得した順にterm_idを採番する
+            if normalized not in terms:
+                terms[normalized] = Term(
+                    term_id=len(terms) + 1,
+                    normalized=normalized,
+                    is_blocked=normalized == "ブロック",
+                )
+            return terms[normalized]
+        
+        mock_term_repo.get_or_create.side_effect = get_or_create_side_effect
+        target_date = date(2025, 1, 1)
+        
+        expected_metrics = processor.process_posts(_collected_posts(self.POSTS), target_date, "prog")
+        expected_stats = _saved_stats(mock_daily_stats_repo)
+        expected_term_ids = {normalized: term.term_id for normalized, term in terms.items()}
+        mock_daily_stats_repo.upsert.reset_mock()
+        mock_noun_extractor.extract_nouns.reset_mock()
+        terms.clear()
+        
+        # 1回目の結果をメモから返さないよう、空のメモにする
+        processor.tokenize_memo = TokenizeMemo()
+        monkeypatch.setattr(tokenize_pool, "NounExtractor", SplitNounExtractor)
+        with TokenizePool(
+            max_workers=2, chunk_posts=2, mp_context=multiprocessing.get_context("fork")
+        ) as pool:
+            processor.tokenize_pool = pool
+            metrics = processor.process_posts_stream(
+                (post for post in _collected_posts(self.POSTS)), target_date, "prog"
+            )
+        
+        assert _saved_stats(mock_daily_stats_repo) == expected_stats
+        assert expected_stats == {1: (3, 2), 2: (4, 3), 4: (1, 1)}
+        # term_idの採番順も同じ
+        assert {normalized: term.term_id for normalized, term in terms.items()} == expected_term_ids
+        mock_noun_extractor.extract_nouns.assert_not_called()
+        for name in ("fetched_threads", "fetched_posts", "parsed_posts",
+                     "tokenize_fail_posts", "total_tokens", "filtered_tokens"):
+            assert getattr(metrics, name) == getattr(expected_metrics, name)
+        assert metrics.total_tokens == 11
+        assert metrics.filtered_tokens == 1
+        # 同じ本文の投稿はワーカーに送らずメモの結果を使う
+        assert metrics.tokenize_cache_misses == 6
+        assert metrics.tokenize_cache_hits == 0
+
+
+class TestDailyProcessorTokenizeMemo:
+    """同じ本文の投稿の名詞抽出のメモのテスト"""
+    
+    # 2スレッドに同じコピペが投稿されている
+    POSTS = [
+        (1, "2025/01/01(水) 12:00:00.00", "コピペ 学習"),
+        (1, "2025/01/01(水) 12:01:00.00", "コピペ 学習"),
+        (2, "2025/01/01(水) 13:00:00.00", "コピペ 学習"),
+        (2, "2025/01/01(水) 13:01:00.00", "Python"),
+    ]
+    TERMS = ["コピペ", "学習", "python"]
+    
+    def test_duplicate_posts_tokenized_once(self, processor, mock_noun_extractor, mock_term_repo,
+                                            mock_daily_stats_repo):
+        """同じ本文の投稿は1回だけ名詞抽出し、各投稿のヒットは数える"""
+        _setup_split_nouns(mock_noun_extractor, mock_term_repo, self.TERMS)
+        
+        metrics = processor.process_posts(_collected_posts(self.POSTS), date(2025, 1, 1), "prog")
+        
+        assert mock_noun_extractor.extract_nouns.call_count == 2
+        assert metrics.tokenize_cache_hits == 2
+        assert metrics.tokenize_cache_misses == 2
+        assert metrics.tokenize_cache_hit_rate == 0.5
+        assert metrics.total_tokens == 7
+        assert _saved_stats(mock_daily_stats_repo) == {1: (3, 2), 2: (3, 2), 3: (1, 1)}
+    
+    def test_matches_without_memo(self, processor, mock_noun_extractor, mock_term_repo,
+                                  mock_daily_stats_repo):
+        """メモを使わない場合と同じ集計になる"""
+        _setup_split_nouns(mock_noun_extractor, mock_term_repo, self.TERMS)
+        expected_metrics = processor.process_posts(_collected_posts(self.POSTS), date(2025, 1, 1), "prog")
+        expected_stats = _saved_stats(mock_daily_stats_repo)
+        mock_daily_stats_repo.upsert.reset_mock()
+        mock_noun_extractor.extract_nouns.reset_mock()
+        
+        processor.tokenize_memo = None
+        metrics = processor.process_posts(_collected_posts(self.POSTS), date(2025, 1, 1), "prog")
+        
+        assert mock_noun_extractor.extract_nouns.call_count == 4
+        assert metrics.tokenize_cache_hits == metrics.tokenize_cache_misses == 0
+        assert _saved_stats(mock_daily_stats_repo) == expected_stats
+        assert metrics.total_tokens == expected_metrics.total_tokens
+    
+    def test_failed_tokenization_not_memoized(self, processor, mock_noun_extractor,
+                                              mock_term_repo):
+        """名詞抽出に失敗した本文はメモせず、次の投稿で再度抽出する"""
+        _setup_split_nouns(mock_noun_extractor, mock_term_repo, self.TERMS)
+        mock_noun_extractor.extract_nouns.side_effect = Exception("MeCab error")
+        
+        metrics = processor.process_posts(_collected_posts(self.POSTS)[:2], date(2025, 1, 1), "prog")
+        
+        assert mock_noun_extractor.extract_nouns.call_count == 2
+        assert metrics.tokenize_fail_posts == 2
+        assert metrics.tokenize_cache_hits == 0
+
 
+class TestDailyProcessorReprocess:
+    """名詞抽出の結果の記録とDailyProcessor.reprocess()のテスト"""
+    
+    POSTS = [
+        (1, "2025/01/01(水) 12:00:00.00", "Python 学習"),
+        (1, "2025/01/01(水) 12:01:00.00", "Python"),
+        (2, "2025/01/01(水) 13:00:00.00", "学習 学習"),
+    ]
+    
+    def test_reprocess_applies_blocklist_without_tokenizing(
+        self, processor, mock_noun_extractor, mock_term_repo, mock_daily_stats_repo,
+        mock_metrics_repo, tmp_path,
+    ):
+        """記録した名詞から、名詞抽出をせずに正規化・集計をやり直す"""
+        from src.analysis.token_store import TokenStore
+        
+        terms = _setup_split_nouns(mock_noun_extractor, mock_term_repo, ["python", "学習"])
+        target_date = date(2025, 1, 1)
+        
+        with TokenStore(tmp_path / "tokens.sqlite3", dictionary_version="v1") as store:
+            processor.token_store = store
+            processor.process_posts_stream(iter(_collected_posts(self.POSTS)), target_date, "prog")
+            assert _saved_stats(mock_daily_stats_repo) == {1: (2, 1), 2: (2, 2)}
+            
+            # 処理後に「学習」をブロックする
+            terms["学習"] = Term(term_id=2, normalized="学習", is_blocked=True)
+            mock_daily_stats_repo.upsert.reset_mock()
+            mock_noun_extractor.extract_nouns.reset_mock()
+            saved_metrics = Mock(total_tokens=5, filtered_tokens=0)
+            mock_metrics_repo.get_by_date_and_board.return_value = saved_metrics
+            
+            metrics = processor.reprocess(target_date, "prog", store)
+        
+        mock_noun_extractor.extract_nouns.assert_not_called()
+        mock_daily_stats_repo.delete_by_date_and_board.assert_called_once_with(
+            target_date, "prog"
+        )
+        assert _saved_stats(mock_daily_stats_repo) == {1: (2, 1)}
+        assert metrics.fetched_threads == 2
+        assert metrics.fetched_posts == 3
+        assert metrics.total_tokens == 5
+        assert metrics.filtered_tokens == 3
+        # 日次処理のメトリクスは集計に関わる値だけを更新する
+        assert saved_metrics.filtered_tokens == 3
+        assert saved_metrics.filtered_rate == 0.6
+        mock_metrics_repo.upsert.assert_called_once()
+
+    
+    def test_reprocess_without_mecab(self, mock_session, mock_term_repo, tmp_path):
+        """名詞抽出をしない reprocess() はMeCabを読み込まずに実行できる"""
+        from src.analysis.token_store import TokenStore
+        
+        with patch('src.analysis.daily_processor.TermRepository', return_value=mock_term_repo), \
+             patch('src.analysis.daily_processor.DailyTermStatsRepository'), \
+             patch('src.analysis.daily_processor.PipelineMetricsDailyRepository'), \
+             patch('src.analysis.daily_processor.NounExtractor',
+                   side_effect=ImportError("mecab-python3 is not installed")) as mock_class:
+            processor = DailyProcessor(mock_session)
+            with TokenStore(tmp_path / "tokens.sqlite3", dictionary_version="v1") as store:
+                metrics = processor.reprocess(date(2025, 1, 1), "prog", store)
+        
+        mock_class.assert_not_called()
+        assert metrics.fetched_posts == 0
+    
+    def test_noun_extractor_created_on_first_use(self, mock_session, mock_term_repo):
+        """noun_extractorを省略した場合は、最初に名詞抽出するときに1回だけ作成する"""
+        with patch('src.analysis.daily_processor.TermRepository', return_value=mock_term_repo), \
+             patch('src.analysis.daily_processor.DailyTermStatsRepository'), \
+             patch('src.analysis.daily_processor.PipelineMetricsDailyRepository'), \
+             patch('src.analysis.daily_processor.NounExtractor') as mock_class:
+            processor = DailyProcessor(mock_session)
+            mock_class.assert_not_called()
+            
+            _setup_split_nouns(mock_class.return_value, mock_term_repo, ["python", "学習"])
+            processor.process_posts(_collected_posts(self.POSTS), date(2025, 1, 1), "prog")
+        
+        mock_class.assert_called_once_with()
+
+
+class TestDailyProcessorTermCache:
+    """TermCacheを使う場合のDailyProcessorのテスト"""
+    
+    def _create_processor(self, mock_session, mock_term_repo, mock_noun_extractor, term_cache):
+        with patch('src.analysis.daily_processor.TermRepository', return_value=mock_term_repo), \
+             patch('src.analysis.daily_processor.DailyTermStatsRepository'), \
+             patch('src.analysis.daily_processor.PipelineMetricsDailyRepository'):
+            return DailyProcessor(
+                mock_session, term_cache=term_cache, noun_extractor=mock_noun_extractor
+            )
+    
+    def test_warm_loads_recently_active_terms_once(
+        self, mock_session, mock_term_repo, mock_noun_extractor,
+    ):
+        """初回だけ最近出現した語を読み込む"""
+        from src.database.term_cache import CachedTerm, TermCache
+        
+        cache = TermCache(max_entries=100)
+        mock_term_repo.get_recently_active.return_value = [
+            Term(term_id=1, normalized="python", is_blocked=False),
+        ]
+        
+        self._create_processor(mock_session, mock_term_repo, mock_noun_extractor, cache)
+        self._create_processor(mock_session, mock_term_repo, mock_noun_extractor, cache)
+        
+        mock_term_repo.get_recently_active.assert_called_once()
+        assert mock_term_repo.get_recently_active.call_args.kwargs["limit"] == 100
+        assert cache.warmed is True
+        assert cache.get("python") == CachedTerm(term_id=1, is_blocked=False)
+    
+    def test_resolves_terms_through_cache(
+        self, mock_session, mock_term_repo, mock_noun_extractor,
+    ):
+        """語彙はresolve_cached()で解決し、ブロックされた語は集計しない"""
+        from src.database.term_cache import CachedTerm, TermCache
+        
+        cache = TermCache()
+        mock_term_repo.get_recently_active.return_value = []
+        mock_term_repo.resolve_cached.return_value = {
+            "python": CachedTerm(term_id=1, is_blocked=False),
+            "spam": CachedTerm(term_id=2, is_blocked=True),
+        }
+        mock_noun_extractor.extract_nouns.return_value = ["Python", "spam"]
+        processor = self._create_processor(
+            mock_session, mock_term_repo, mock_noun_extractor, cache
+        )
+        posts = [
+            CollectedPost("/test/read.cgi/prog/1", "2025/01/01(水) 12:00:00.00", "Python spam"),
+        ]
+        
+        metrics = processor.process_posts(posts, date(2025, 1, 1), "prog")
+        
+        mock_term_repo.resolve_cached.assert_called_once()
+        mock_term_repo.resolve_many.assert_not_called()
+        saved = [call[0][0] for call in processor.daily_stats_repo.upsert.call_args_list]
+        assert [(stats.term_id, stats.post_hits) for stats in saved] == [(1, 1)]
+        assert metrics.filtered_tokens == 1
@@ -1,5 +1,22 @@
+import random
+import re
+import unicodedata
+
 import pytest
-from src.analysis.normalizer import normalize_term
+from src.analysis.normalizer import normalize_term, normalize_terms
+
+
+def _reference_normalize_term(term: str) -> str:
+    """str.translate を使う前の正規表現による実装（出力が変わらないことの確認用）"""
+    if not term:
+        return ""
+    normalized = unicodedata.normalize("NFKC", term).lower()
+    normalized = re.sub(r'[_\-\.,:;/\\\(\)\[\]!?]', '', normalized)
+    normalized = re.sub(r'[ー〜~]', '', normalized)
+    normalized = re.sub(r'\s+', ' ', normalized).strip()
+    if len(normalized) <= 1:
+        return ""
+    return normalized
 
 
 class TestNormalizeTerm:
@@ -108,3 +125,46 @@ class TestNormalizeTerm:
         result = normalize_term("Python3")
         assert result == "python3"
 
+
+
+
+class TestNormalizeTerms:
+    def test_normalize_terms(self):
+        """複数の語を同じ順序で正規化する"""
+        assert normalize_terms(["Python", "ー", "ＪａｖａＳｃｒｉｐｔ"]) == [
+            "python", "", "javascript",
+        ]
+    
+    def test_normalize_terms_empty(self):
+        """空のイテラブルは空リストを返す"""
+        assert normalize_terms(iter([])) == []
+
+
+class TestNormalizeTermFuzz:
+    # 記号・空白・全角/半角・互換文字・合字・結合文字・サロゲート外の文字などを混ぜる
+    ALPHABET = (
+        "aZ09_-.,:;/\\()[]!?~ー〜。、 \t\n\r\x0b\x0c\x1c\x85\u00a0\u2003\u3000"
+        "ＡＺａｚ０９＿－．，：；／＼（）［］！？～"
+        "ｱｶﾞﾊﾟｰｧ㍻㌔①Ⅻﬁ½ｶﾞ\u0301\u3099İßΣς"
+        "日本語のテストプログラム"
+        "\u2010\u2212\u301c\uff5e\u30fc\uff70"
+    )
+    
+    def test_matches_reference_implementation(self):
+        """ランダムな語で、正規表現による実装と同じ結果になる"""
+        rng = random.Random(0)
+        normalize_term.cache_clear()
+        
+        for _ in range(20000):
+            term = "".join(rng.choice(self.ALPHABET) for _ in range(rng.randint(0, 12)))
+            assert normalize_term(term) == _reference_normalize_term(term), repr(term)
+    
+    def test_cached_result_is_identical(self):
+        """メモした結果も初回と同じになる"""
+        normalize_term.cache_clear()
+        
+        first = normalize_term("Ｐｙｔｈｏｎ＿３．１０")
+        second = normalize_term("Ｐｙｔｈｏｎ＿３．１０")
+        
+        assert first == second == "python310"
+        assert normalize_term.cache_info().hits == 1
@@ -1,7 +1,15 @@
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 
-from src.analysis.noun_extractor import NounExtractor, extract_nouns_from_text
+import threading
+import time
+
+from src.analysis import noun_extractor
+from src.analysis.noun_extractor import (
+    NounExtractor,
+    extract_nouns_from_text,
+    warm_up_noun_extractor,
+)
 
 
 class TestNounExtractorInit:
@@ -29,6 +37,15 @@ class TestNounExtractorInit:
         
         with pytest.raises(RuntimeError, match="MeCab initialization failed"):
             NounExtractor()
+    
+    def test_tagger_uses_noun_output_format(self):
+        """Taggerに品詞と表層形だけを出力するフォーマットを指定する"""
+        with patch('src.analysis.noun_extractor.MeCab') as mock_mecab:
+            NounExtractor()
+        
+        args = mock_mecab.Tagger.call_args[0][0]
+        assert "--node-format=%f[0]\\\\t%m\\\\n" in args
+        assert "--unk-format=%f[0]\\\\t%m\\\\n" in args
 
 
 class TestNounExtractorExtractNouns:
@@ -50,54 +67,24 @@ class TestNounExtractorExtractNouns:
         """空文字列の場合は空リストを返す"""
         result = extractor.extract_nouns("")
         assert result == []
-        mock_tagger.parseToNode.assert_not_called()
+        mock_tagger.parse.assert_not_called()
     
     def test_extract_nouns_success(self, extractor, mock_tagger):
         """名詞が正しく抽出される"""
-        # モックノードを作成
-        node1 = Mock()
-        node1.feature = "名詞,一般,*,*,*,*,*"
-        node1.surface = "Python"
-        
-        node2 = Mock()
-        node2.feature = "動詞,自立,*,*,*,*,*"
-        node2.surface = "実行"
-        
-        node3 = Mock()
-        node3.feature = "名詞,一般,*,*,*,*,*"
-        node3.surface = "プログラム"
-        
-        node4 = Mock()
-        node4.feature = "BOS/EOS,*,*,*,*,*,*"
-        node4.surface = ""
-        
-        # ノードチェーンを構築
-        node1.next = node2
-        node2.next = node3
-        node3.next = node4
-        node4.next = None
-        
-        mock_tagger.parseToNode.return_value = node1
+        # Tagger.parse() の "品詞\t表層形" の出力
+        mock_tagger.parse.return_value = (
+            "名詞\tPython\n助詞\tで\n名詞\tプログラム\n助詞\tを\n動詞\t実行\nEOS\n"
+        )
         
         result = extractor.extract_nouns("Pythonでプログラムを実行")
         
         assert result == ["Python", "プログラム"]
-        mock_tagger.parseToNode.assert_called_once_with("Pythonでプログラムを実行")
+        mock_tagger.parse.assert_called_once_with("Pythonでプログラムを実行")
+        mock_tagger.parseToNode.assert_not_called()
     
     def test_extract_nouns_no_nouns(self, extractor, mock_tagger):
         """名詞が含まれていない場合は空リストを返す"""
-        node1 = Mock()
-        node1.feature = "動詞,自立,*,*,*,*,*"
-        node1.surface = "実行"
-        
-        node2 = Mock()
-        node2.feature = "BOS/EOS,*,*,*,*,*,*"
-        node2.surface = ""
-        
-        node1.next = node2
-        node2.next = None
-        
-        mock_tagger.parseToNode.return_value = node1
+        mock_tagger.parse.return_value = "動詞\t実行\n動詞\tする\nEOS\n"
         
         result = extractor.extract_nouns("実行する")
         
@@ -105,28 +92,10 @@ class TestNounExtractorExtractNouns:
     
     def test_extract_nouns_various_noun_types(self, extractor, mock_tagger):
         """様々な名詞の種類が抽出される"""
-        node1 = Mock()
-        node1.feature = "名詞,一般,*,*,*,*,*"
-        node1.surface = "Python"
-        
-        node2 = Mock()
-        node2.feature = "名詞,固有名詞,*,*,*,*,*"
-        node2.surface = "東京"
-        
-        node3 = Mock()
-        node3.feature = "名詞,サ変接続,*,*,*,*,*"
-        node3.surface = "プログラミング"
-        
-        node4 = Mock()
-        node4.feature = "BOS/EOS,*,*,*,*,*,*"
-        node4.surface = ""
-        
-        node1.next = node2
-        node2.next = node3
-        node3.next = node4
-        node4.next = None
-        
-        mock_tagger.parseToNode.return_value = node1
+        # 品詞細分類（一般・固有名詞・サ変接続）は出力せず、品詞の大分類だけで判定する
+        mock_tagger.parse.return_value = (
+            "名詞\tPython\n名詞\t東京\n名詞\tプログラミング\nEOS\n"
+        )
         
         result = extractor.extract_nouns("Python東京プログラミング")
         
@@ -134,23 +103,7 @@ class TestNounExtractorExtractNouns:
     
     def test_extract_nouns_empty_surface(self, extractor, mock_tagger):
         """表層形が空の名詞は除外される"""
-        node1 = Mock()
-        node1.feature = "名詞,一般,*,*,*,*,*"
-        node1.surface = "Python"
-        
-        node2 = Mock()
-        node2.feature = "名詞,一般,*,*,*,*,*"
-        node2.surface = ""  # 空の表層形
-        
-        node3 = Mock()
-        node3.feature = "BOS/EOS,*,*,*,*,*,*"
-        node3.surface = ""
-        
-        node1.next = node2
-        node2.next = node3
-        node3.next = None
-        
-        mock_tagger.parseToNode.return_value = node1
+        mock_tagger.parse.return_value = "名詞\tPython\n名詞\t\nEOS\n"
         
         result = extractor.extract_nouns("Python")
         
@@ -158,31 +111,15 @@ class TestNounExtractorExtractNouns:
     
     def test_extract_nouns_exception_handling(self, extractor, mock_tagger):
         """例外が発生した場合は空リストを返す"""
-        mock_tagger.parseToNode.side_effect = Exception("MeCab error")
+        mock_tagger.parse.side_effect = Exception("MeCab error")
         
         result = extractor.extract_nouns("テスト")
         
         assert result == []
     
     def test_extract_nouns_invalid_feature(self, extractor, mock_tagger):
-        """featureが空の場合はスキップされる"""
-        node1 = Mock()
-        node1.feature = ""  # 空のfeature
-        node1.surface = "test"
-        
-        node2 = Mock()
-        node2.feature = "名詞,一般,*,*,*,*,*"
-        node2.surface = "Python"
-        
-        node3 = Mock()
-        node3.feature = "BOS/EOS,*,*,*,*,*,*"
-        node3.surface = ""
-        
-        node1.next = node2
-        node2.next = node3
-        node3.next = None
-        
-        mock_tagger.parseToNode.return_value = node1
+        """品詞が空・名詞で始まらない行はスキップされる"""
+        mock_tagger.parse.return_value = "\ttest\n名詞接続\tx\n名詞\tPython\nEOS\n"
         
         result = extractor.extract_nouns("test Python")
         
@@ -192,6 +129,13 @@ class TestNounExtractorExtractNouns:
 class TestExtractNounsFromText:
     """extract_nouns_from_text()のテスト"""
     
+    @pytest.fixture(autouse=True)
+    def clear_registry(self):
+        """テストごとに作成済みのNounExtractorを破棄する"""
+        noun_extractor._registry.clear()
+        yield
+        noun_extractor._registry.clear()
+    
     @patch('src.analysis.noun_extractor.NounExtractor')
     def test_extract_nouns_from_text(self, mock_extractor_class):
         """簡易関数が正しく動作する"""
@@ -205,3 +149,66 @@ class TestExtractNounsFromText:
         mock_extractor_class.assert_called_once()
         mock_extractor.extract_nouns.assert_called_once_with("Pythonでプログラムを実行")
 
+    
+    @patch('src.analysis.noun_extractor.NounExtractor')
+    def test_reuses_extractor_per_dictionary_path(self, mock_extractor_class):
+        """辞書パスごとにNounExtractorを1回だけ作成して使い回す"""
+        mock_extractor_class.side_effect = lambda dictionary_path=None: Mock(
+            extract_nouns=Mock(return_value=[dictionary_path])
+        )
+        
+        assert extract_nouns_from_text("a") == [None]
+        assert extract_nouns_from_text("b") == [None]
+        assert extract_nouns_from_text("c", dictionary_path="/neologd") == ["/neologd"]
+        assert extract_nouns_from_text("d", dictionary_path="/neologd") == ["/neologd"]
+        
+        assert mock_extractor_class.call_count == 2
+        assert len(noun_extractor._registry) == 2
+    
+    @patch('src.analysis.noun_extractor.NounExtractor')
+    def test_warm_up_loads_dictionary(self, mock_extractor_class):
+        """warm_up後の呼び出しでは辞書を読み込まない"""
+        mock_extractor = Mock()
+        mock_extractor.extract_nouns.return_value = ["東京"]
+        mock_extractor_class.return_value = mock_extractor
+        
+        warm_up_noun_extractor()
+        mock_extractor_class.assert_called_once_with(dictionary_path=None)
+        
+        assert extract_nouns_from_text("東京") == ["東京"]
+        mock_extractor_class.assert_called_once()
+    
+    @patch('src.analysis.noun_extractor.NounExtractor')
+    def test_concurrent_first_calls_create_one_extractor(self, mock_extractor_class):
+        """複数スレッドから同時に呼び出しても作成は1回で、解析は直列に行われる"""
+        active = []
+        overlapped = []
+        
+        def extract_nouns(text):
+            active.append(text)
+            if len(active) > 1:
+                overlapped.append(text)
+            time.sleep(0.01)
+            active.remove(text)
+            return [text]
+        
+        def create(dictionary_path=None):
+            # 辞書の読み込みに時間がかかる場合
+            time.sleep(0.05)
+            return Mock(extract_nouns=Mock(side_effect=extract_nouns))
+        
+        mock_extractor_class.side_effect = create
+        results = {}
+        
+        def worker(i):
+            results[i] = extract_nouns_from_text(str(i))
+        
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        
+        assert mock_extractor_class.call_count == 1
+        assert results == {i: [str(i)] for i in range(4)}
+        assert overlapped == []
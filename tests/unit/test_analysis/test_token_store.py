@@ -0,0 +1,74 @@
+"""TokenStoreのテスト"""
+from datetime import date
+
+from src.analysis.token_store import TokenStore
+
+
+TARGET_DATE = date(2025, 1, 1)
+
+
+class TestTokenStore:
+    """TokenStoreのテスト"""
+
+    def test_record_and_iter_threads(self, tmp_path):
+        """記録した順にスレッドごとの名詞の出現回数を返す"""
+        with TokenStore(tmp_path / "tokens.sqlite3", dictionary_version="v1") as store:
+            store.record_thread(
+                TARGET_DATE, "prog", "/thread/1",
+                ["Python 学習", "Python"],
+                [{"Python": 1, "学習": 1}, {"Python": 1}],
+            )
+            store.record_thread(
+                TARGET_DATE, "prog", "/thread/2",
+                ["学習 学習", "失敗"],
+                [{"学習": 2}, None],
+            )
+
+            threads = list(store.iter_threads(TARGET_DATE, "prog"))
+
+        assert threads == [
+            ("/thread/1", [{"Python": 1, "学習": 1}, {"Python": 1}]),
+            # 名詞抽出に失敗した投稿はNone
+            ("/thread/2", [{"学習": 2}, None]),
+        ]
+        assert list(threads[0][1][0]) == ["Python", "学習"]
+
+    def test_persists_across_instances(self, tmp_path):
+        """記録した結果は別のインスタンスから読み込める"""
+        path = tmp_path / "tokens.sqlite3"
+        with TokenStore(path, dictionary_version="v1") as store:
+            store.record_thread(TARGET_DATE, "prog", "/thread/1", ["東京"], [{"東京": 1}])
+
+        # 辞書を更新した後も、記録したときの辞書バージョンの結果を返す
+        with TokenStore(path, dictionary_version="v2") as store:
+            assert list(store.iter_threads(TARGET_DATE, "prog")) == [
+                ("/thread/1", [{"東京": 1}]),
+            ]
+            assert store.dates("prog", TARGET_DATE, TARGET_DATE) == [TARGET_DATE]
+
+    def test_begin_day_replaces_previous_record(self, tmp_path):
+        """同じ日付・板を記録し直すと以前の記録は消える"""
+        with TokenStore(tmp_path / "tokens.sqlite3", dictionary_version="v1") as store:
+            store.record_thread(TARGET_DATE, "prog", "/thread/1", ["東京"], [{"東京": 1}])
+            store.record_thread(TARGET_DATE, "news", "/thread/9", ["大阪"], [{"大阪": 1}])
+
+            store.begin_day(TARGET_DATE, "prog")
+            store.record_thread(TARGET_DATE, "prog", "/thread/2", ["京都"], [{"京都": 1}])
+
+            assert list(store.iter_threads(TARGET_DATE, "prog")) == [
+                ("/thread/2", [{"京都": 1}]),
+            ]
+            assert list(store.iter_threads(TARGET_DATE, "news")) == [
+                ("/thread/9", [{"大阪": 1}]),
+            ]
+
+    def test_dates(self, tmp_path):
+        """期間内で記録した日付を返す"""
+        with TokenStore(tmp_path / "tokens.sqlite3", dictionary_version="v1") as store:
+            for day in (1, 3, 10):
+                store.record_thread(date(2025, 1, day), "prog", "/t", ["a"], [{"a": 1}])
+            store.record_thread(date(2025, 1, 2), "news", "/t", ["a"], [{"a": 1}])
+
+            assert store.dates("prog", date(2025, 1, 1), date(2025, 1, 5)) == [
+                date(2025, 1, 1), date(2025, 1, 3),
+            ]
@@ -0,0 +1,40 @@
+"""TokenizeMemoのテスト"""
+import pytest
+
+from src.analysis.tokenize_memo import TokenizeMemo
+
+
+class TestTokenizeMemo:
+    """TokenizeMemoのテスト"""
+
+    def test_invalid_max_entries_raises_value_error(self):
+        """max_entriesが0以下の場合はValueErrorが発生する"""
+        with pytest.raises(ValueError, match="max_entries must be positive"):
+            TokenizeMemo(max_entries=0)
+
+    def test_put_and_get(self):
+        """記録した本文の結果を返し、ヒット数・ミス数を数える"""
+        memo = TokenizeMemo()
+
+        assert memo.get("Python 学習") is None
+        memo.put("Python 学習", {"Python": 1, "学習": 1})
+
+        assert memo.get("Python 学習") == {"Python": 1, "学習": 1}
+        # 名詞のない本文（空の結果）も記録する
+        memo.put("ｗｗｗ", {})
+        assert memo.get("ｗｗｗ") == {}
+        assert (memo.hits, memo.misses) == (2, 1)
+
+    def test_evicts_least_recently_used(self):
+        """上限を超えたら最も長く使われていない結果から削除する"""
+        memo = TokenizeMemo(max_entries=2)
+        memo.put("a", {"a": 1})
+        memo.put("b", {"b": 1})
+        memo.get("a")
+
+        memo.put("c", {"c": 1})
+
+        assert len(memo) == 2
+        assert memo.get("b") is None
+        assert memo.get("a") == {"a": 1}
+        assert memo.get("c") == {"c": 1}
@@ -0,0 +1,91 @@
+"""TokenizePoolのテスト"""
+import multiprocessing
+
+import pytest
+
+from src.analysis import tokenize_pool
+from src.analysis.tokenize_pool import TokenizePool, count_nouns
+
+
+class FakeNounExtractor:
+    """空白区切りの単語を名詞として返すNounExtractor（ワーカープロセスで使う）"""
+
+    def __init__(self, dictionary_path=None):
+        pass
+
+    def extract_nouns(self, text):
+        if text == "失敗":
+            raise RuntimeError("MeCab error")
+        return text.split()
+
+
+@pytest.fixture
+def make_pool(monkeypatch):
+    """forkしたワーカーがFakeNounExtractorを使うTokenizePoolを作る"""
+    monkeypatch.setattr(tokenize_pool, "NounExtractor", FakeNounExtractor)
+    pools = []
+
+    def make(**kwargs):
+        pool = TokenizePool(mp_context=multiprocessing.get_context("fork"), **kwargs)
+        pools.append(pool)
+        return pool
+
+    yield make
+    for pool in pools:
+        pool.close()
+
+
+class TestCountNouns:
+    """count_nouns()のテスト"""
+
+    def test_keeps_first_occurrence_order(self):
+        """名詞ごとの出現回数を最初に出現した順に返す"""
+        result = count_nouns(["b", "a", "b", "c", "a", "b"])
+
+        assert result == {"b": 3, "a": 2, "c": 1}
+        assert list(result) == ["b", "a", "c"]
+
+
+class TestTokenizePool:
+    """TokenizePoolのテスト"""
+
+    def test_invalid_arguments_raise_value_error(self):
+        """ワーカー数・チャンクの投稿数が0以下の場合はValueErrorが発生する"""
+        with pytest.raises(ValueError, match="max_workers must be positive"):
+            TokenizePool(max_workers=0)
+        with pytest.raises(ValueError, match="chunk_posts must be positive"):
+            TokenizePool(max_workers=1, chunk_posts=0)
+
+    def test_results_in_thread_order(self, make_pool):
+        """複数のチャンクに分けても、受け取ったスレッドの順序で結果を返す"""
+        pool = make_pool(max_workers=2, chunk_posts=2)
+        threads = [
+            (f"thread{i}", [f"Python 学習 {i}", "Python Python", ""])
+            for i in range(10)
+        ]
+
+        results = list(pool.map_threads(iter(threads)))
+
+        assert [key for key, _ in results] == [key for key, _ in threads]
+        assert results[3][1] == [
+            {"Python": 1, "学習": 1, "3": 1},
+            {"Python": 2},
+            {},
+        ]
+
+    def test_failed_post_returns_none(self, make_pool):
+        """名詞抽出に失敗した投稿はNoneになり、他の投稿は処理される"""
+        pool = make_pool(max_workers=1)
+
+        results = list(pool.map_threads([("thread", ["東京", "失敗", "大阪"])]))
+
+        assert results == [("thread", [{"東京": 1}, None, {"大阪": 1}])]
+
+    def test_default_start_method_is_forkserver(self):
+        """mp_contextを省略した場合はforkserverでワーカーを起動し、名詞抽出できる"""
+        with TokenizePool(max_workers=1) as pool:
+            assert pool._executor._mp_context.get_start_method() == "forkserver"
+            results = list(pool.map_threads([("thread", ["東京タワーに行った"])]))
+
+        assert results[0][0] == "thread"
+        assert "東京" in results[0][1][0]
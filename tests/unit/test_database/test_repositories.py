@@ -3,6 +3,8 @@ import pytest
 from datetime import date
 from unittest.mock import Mock, MagicMock
 from uuid import uuid4, UUID
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.orm import Session
 
 from src.database.repositories import (
     PipelineRunRepository,
@@ -12,6 +14,7 @@ from src.database.repositories import (
     TermRegressionResultRepository,
     PipelineMetricsDailyRepository,
 )
+from src.database.term_cache import CachedTerm, TermCache
 from src.database.models import (
     PipelineRun,
     Term,
@@ -25,7 +28,7 @@ from src.database.models import (
 @pytest.fixture
 def mock_session():
     """モックセッション"""
-    session = Mock()
+    session = Mock(spec=Session)
     session.add = Mock()
     session.flush = Mock()
     session.commit = Mock()
@@ -226,6 +229,97 @@ class TestTermRepository:
         assert term.is_blocked is True
         assert term.blocked_reason == "spam"
         mock_session.flush.assert_called_once()
+    
+    def test_resolve_many(self, mock_session, mock_query):
+        """既存の語をチャンクごとに取得し、存在しない語だけを正規化後の語の順に作成する"""
+        repo = TermRepository(mock_session)
+        mock_session.get_bind.return_value.dialect.name = "postgresql"
+        terms = {
+            normalized: Term(term_id=i, normalized=normalized, is_blocked=False)
+            for i, normalized in enumerate(["a", "b", "c", "d"], 1)
+        }
+        # 既存の語 (d, b / a, c) の取得 -> 作成した語 (c, d) の取得
+        mock_query.__iter__ = Mock(side_effect=[
+            iter([terms["b"]]), iter([terms["a"]]), iter([terms["c"], terms["d"]]),
+        ])
+        mock_session.query.return_value = mock_query
+        # INSERT ... RETURNING で作成した語
+        mock_session.execute.return_value.scalars.return_value = ["c", "d"]
+        
+        result = repo.resolve_many(["d", "b", "a", "d", "c", "a"], chunk_size=2)
+        
+        assert result == terms
+        assert mock_session.query.call_count == 3
+        # 存在しない語 (c, d) だけを INSERT ... ON CONFLICT DO NOTHING
+        assert mock_session.execute.call_count == 1
+        compiled = mock_session.execute.call_args[0][0].compile(dialect=postgresql.dialect())
+        assert "ON CONFLICT (normalized) DO NOTHING" in str(compiled)
+        assert [v for v in compiled.params.values() if v is not None] == ["c", "d"]
+    
+    def test_resolve_many_skips_insert_for_existing_terms(self, mock_session, mock_query):
+        """すべての語が存在する場合はINSERTしない"""
+        repo = TermRepository(mock_session)
+        mock_session.get_bind.return_value.dialect.name = "postgresql"
+        terms = [
+            Term(term_id=i, normalized=normalized, is_blocked=False)
+            for i, normalized in enumerate(["a", "b"], 1)
+        ]
+        mock_query.__iter__ = Mock(return_value=iter(terms))
+        mock_session.query.return_value = mock_query
+        
+        result = repo.resolve_many(["b", "a"])
+        
+        assert result == {"a": terms[0], "b": terms[1]}
+        mock_session.execute.assert_not_called()
+        assert mock_session.query.call_count == 1
+    
+    def test_resolve_cached_queries_only_missing_terms(self, mock_session, mock_query):
+        """キャッシュにない語だけをDBから取得し、既存の語だけをキャッシュする"""
+        cache = TermCache()
+        cache.put("a", 1, False)
+        repo = TermRepository(mock_session, term_cache=cache)
+        mock_session.get_bind.return_value.dialect.name = "postgresql"
+        term_b = Term(term_id=2, normalized="b", is_blocked=True)
+        term_c = Term(term_id=3, normalized="c", is_blocked=False)
+        # 既存の語 (b) の取得 -> 作成した語 (c) の取得
+        mock_query.__iter__ = Mock(side_effect=[iter([term_b]), iter([term_c])])
+        mock_session.query.return_value = mock_query
+        # "c" はこのトランザクションで作成した
+        mock_session.execute.return_value.scalars.return_value = ["c"]
+        
+        result = repo.resolve_cached(["a", "b", "c"])
+        
+        assert result == {
+            "a": CachedTerm(term_id=1, is_blocked=False),
+            "b": CachedTerm(term_id=2, is_blocked=True),
+            "c": CachedTerm(term_id=3, is_blocked=False),
+        }
+        # キャッシュにある語・既存の語はINSERTしない
+        insert_stmt = mock_session.execute.call_args[0][0]
+        params = insert_stmt.compile(dialect=postgresql.dialect()).params
+        assert [v for v in params.values() if v is not None] == ["c"]
+        assert cache.get("b") == CachedTerm(term_id=2, is_blocked=True)
+        # ロールバックされる可能性があるため、作成した語はキャッシュしない
+        assert cache.get("c") is None
+    
+    def test_update_blocked_invalidates_cache(self, mock_session, mock_query):
+        """ブロック状態を変更した語はキャッシュから削除される"""
+        cache = TermCache()
+        cache.put("python", 1, False)
+        repo = TermRepository(mock_session, term_cache=cache)
+        mock_query.first.return_value = Term(term_id=1, normalized="python", is_blocked=False)
+        mock_session.query.return_value = mock_query
+        
+        repo.update_blocked(1, True, "spam")
+        
+        assert cache.get("python") is None
+    
+    def test_resolve_many_empty(self, mock_session):
+        """空の語彙ではクエリを発行しない"""
+        repo = TermRepository(mock_session)
+        
+        assert repo.resolve_many([]) == {}
+        mock_session.execute.assert_not_called()
 
 
 class TestDailyTermStatsRepository:
@@ -329,6 +423,19 @@ class TestDailyTermStatsRepository:
         assert result == new_stats
         mock_session.add.assert_called_once_with(new_stats)
         mock_session.flush.assert_called()
+    
+    def test_delete_by_date_and_board(self, mock_session, mock_query):
+        """日付とボードキーの集計を削除できる"""
+        repo = DailyTermStatsRepository(mock_session)
+        mock_query.delete.return_value = 3
+        mock_session.query.return_value = mock_query
+        
+        result = repo.delete_by_date_and_board(date(2025, 1, 1), "prog")
+        
+        assert result == 3
+        mock_session.query.assert_called_once_with(DailyTermStats)
+        mock_query.delete.assert_called_once_with(synchronize_session=False)
+        mock_session.flush.assert_called_once()
 
 
 class TestWeeklyTermTrendsRepository:
@@ -640,7 +747,9 @@ class TestPipelineMetricsDailyRepository:
             filtered_tokens=10000,
             total_tokens=20000,
             filtered_rate=0.5,
-            duration_sec=120
+            duration_sec=120,
+            scraper_stats={"requests": 30, "total_bytes": 123456},
+            crawl_coverage={"threads_fetched": 40, "budget_exhausted": True},
         )
         mock_query.first.return_value = existing_metrics
         mock_session.query.return_value = mock_query
@@ -650,9 +759,36 @@ class TestPipelineMetricsDailyRepository:
         assert result == existing_metrics
         assert existing_metrics.fetched_threads == 200
         assert existing_metrics.duration_sec == 120
+        assert existing_metrics.scraper_stats == {"requests": 30, "total_bytes": 123456}
+        assert existing_metrics.crawl_coverage == {"threads_fetched": 40, "budget_exhausted": True}
         mock_session.flush.assert_called_once()
         mock_session.add.assert_not_called()
 
+    def test_upsert_keeps_scraper_stats_without_new_values(self, mock_session, mock_query):
+        """計測値のない更新（リプレイ）では元の巡回の計測値を残す"""
+        repo = PipelineMetricsDailyRepository(mock_session)
+        existing_metrics = PipelineMetricsDaily(
+            date=date(2025, 1, 1),
+            board_key="prog",
+            fetched_threads=100,
+            scraper_stats={"requests": 30},
+            crawl_coverage={"threads_fetched": 40},
+        )
+        new_metrics = PipelineMetricsDaily(
+            date=date(2025, 1, 1),
+            board_key="prog",
+            fetched_threads=100,
+            total_tokens=500,
+        )
+        mock_query.first.return_value = existing_metrics
+        mock_session.query.return_value = mock_query
+        
+        repo.upsert(new_metrics)
+        
+        assert existing_metrics.total_tokens == 500
+        assert existing_metrics.scraper_stats == {"requests": 30}
+        assert existing_metrics.crawl_coverage == {"threads_fetched": 40}
+
     def test_upsert_new(self, mock_session, mock_query):
         """新しいメトリクスを作成できる"""
         repo = PipelineMetricsDailyRepository(mock_session)
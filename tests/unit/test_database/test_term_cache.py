@@ -0,0 +1,65 @@
+"""TermCacheのテスト"""
+import pytest
+
+from src.database.models import Term
+from src.database.term_cache import CachedTerm, TermCache
+
+
+class TestTermCache:
+    """TermCacheのテスト"""
+
+    def test_invalid_max_entries_raises_value_error(self):
+        """max_entriesが0以下の場合はValueErrorが発生する"""
+        with pytest.raises(ValueError, match="max_entries must be positive"):
+            TermCache(max_entries=0)
+
+    def test_put_and_get_many(self):
+        """キャッシュにある語だけを返し、ヒット数・ミス数を数える"""
+        cache = TermCache()
+        cache.put("python", 1, False)
+        cache.put("spam", 2, True)
+
+        result = cache.get_many(["python", "rust", "spam"])
+
+        assert result == {
+            "python": CachedTerm(term_id=1, is_blocked=False),
+            "spam": CachedTerm(term_id=2, is_blocked=True),
+        }
+        assert cache.summary() == {"hits": 2, "misses": 1, "entries": 2}
+
+    def test_evicts_least_recently_used(self):
+        """上限を超えたら最も長く使われていない語から削除する"""
+        cache = TermCache(max_entries=2)
+        cache.put("a", 1, False)
+        cache.put("b", 2, False)
+        cache.get("a")
+
+        cache.put("c", 3, False)
+
+        assert len(cache) == 2
+        assert cache.get("b") is None
+        assert cache.get("a") == CachedTerm(term_id=1, is_blocked=False)
+
+    def test_warm_load(self):
+        """Termをまとめて読み込み、後に渡した語ほど削除されにくい"""
+        cache = TermCache(max_entries=2)
+        terms = [
+            Term(term_id=i, normalized=f"term{i}", is_blocked=False) for i in range(1, 4)
+        ]
+
+        loaded = cache.warm_load(terms)
+
+        assert loaded == 3
+        assert cache.warmed is True
+        assert cache.get("term1") is None
+        assert cache.get("term3") == CachedTerm(term_id=3, is_blocked=False)
+
+    def test_invalidate(self):
+        """削除した語は次回DBから取得する"""
+        cache = TermCache()
+        cache.put("python", 1, False)
+
+        cache.invalidate("python")
+        cache.invalidate("unknown")
+
+        assert cache.get("python") is None
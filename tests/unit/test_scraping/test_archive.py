@@ -0,0 +1,115 @@
+"""archiveモジュールのテスト"""
+import pytest
+
+from src.scraping import archive as archive_module
+from src.scraping.archive import RawHtmlArchive, ReplayScraper
+
+
+PAGE = "<html>テスト①</html>".encode("cp932")
+
+
+@pytest.fixture
+def archive(tmp_path):
+    return RawHtmlArchive(tmp_path / "archive")
+
+
+class TestRawHtmlArchive:
+    """RawHtmlArchiveのテスト"""
+
+    def test_put_and_get_roundtrip(self, archive):
+        """保存した内容をそのまま取り出せる"""
+        digest = archive.put(PAGE)
+
+        assert archive.get(digest) == PAGE
+
+    def test_object_is_compressed_and_content_addressed(self, archive, tmp_path):
+        """sha256をキーにzstd圧縮して保存する"""
+        digest = archive.put(PAGE * 100)
+
+        path = tmp_path / "archive" / "objects" / digest[:2] / f"{digest}.zst"
+        assert path.exists()
+        assert path.stat().st_size < len(PAGE * 100)
+
+    def test_same_content_is_stored_once(self, archive, tmp_path):
+        """同じ内容は1つのオブジェクトとして保存される"""
+        first = archive.put(PAGE)
+        second = archive.put(PAGE)
+
+        assert first == second
+        assert len(list((tmp_path / "archive" / "objects").rglob("*.zst"))) == 1
+
+    def test_load_missing_run_raises_file_not_found(self, archive):
+        """存在しない実行名の読み込みでFileNotFoundErrorが発生する"""
+        with pytest.raises(FileNotFoundError):
+            archive.load_run("prog_20250101")
+
+    def test_missing_zstandard_raises_import_error(self, monkeypatch, tmp_path):
+        """zstandardがない場合はImportErrorが発生する"""
+        monkeypatch.setattr(archive_module, "zstandard", None)
+
+        with pytest.raises(ImportError, match="zstandard is not installed"):
+            RawHtmlArchive(tmp_path)
+
+
+class TestArchiveRun:
+    """ArchiveRunのテスト"""
+
+    def test_manifest_roundtrip(self, archive):
+        """保存したマニフェストを読み込むと記録したページを取得できる"""
+        run = archive.open_run("prog_20250101")
+        run.record("https://medaka.5ch.net/prog/", PAGE)
+        run.save()
+
+        loaded = archive.load_run("prog_20250101")
+
+        assert loaded.urls() == ["https://medaka.5ch.net/prog/"]
+        assert loaded.get("https://medaka.5ch.net/prog/") == PAGE
+        assert archive.list_runs() == ["prog_20250101"]
+
+    def test_get_returns_latest_recording(self, archive):
+        """同じURLを複数回記録した場合は最後の内容を返す"""
+        run = archive.open_run("prog_20250101")
+        run.record("https://medaka.5ch.net/prog/", b"old")
+        run.record("https://medaka.5ch.net/prog/", b"new")
+
+        assert run.get("https://medaka.5ch.net/prog/") == b"new"
+        assert run.urls() == ["https://medaka.5ch.net/prog/"]
+        assert len(run) == 2
+
+
+class TestReplayScraper:
+    """ReplayScraperのテスト"""
+
+    def test_fetch_from_archive(self, archive):
+        """記録したページをバイト列・文字列で返す"""
+        run = archive.open_run("prog_20250101")
+        run.record("https://medaka.5ch.net/prog/", PAGE)
+
+        with ReplayScraper(run) as scraper:
+            assert scraper.fetch_bytes("https://medaka.5ch.net/prog/") == PAGE
+            assert scraper.fetch("https://medaka.5ch.net/prog/") == "<html>テスト①</html>"
+
+    def test_missing_page_returns_none(self, archive):
+        """記録されていないページはNoneを返す"""
+        scraper = ReplayScraper(archive.open_run("prog_20250101"))
+
+        assert scraper.fetch_bytes("https://medaka.5ch.net/prog/") is None
+
+    def test_thread_page_urls(self, archive):
+        """スレッドごとに記録されたページURLを取得順に返す"""
+        run = archive.open_run("prog_20250101")
+        run.record("https://medaka.5ch.net/prog/", PAGE)
+        run.record("https://medaka.5ch.net/test/read.cgi/prog/123/l50", PAGE)
+        run.record("https://medaka.5ch.net/test/read.cgi/prog/1234", PAGE)
+        run.record("https://medaka.5ch.net/test/read.cgi/prog/123/1-100", PAGE)
+
+        scraper = ReplayScraper(run)
+
+        assert scraper.thread_page_urls("https://medaka.5ch.net/test/read.cgi/prog/123") == [
+            "https://medaka.5ch.net/test/read.cgi/prog/123/l50",
+            "https://medaka.5ch.net/test/read.cgi/prog/123/1-100",
+        ]
+        assert scraper.thread_page_urls("https://medaka.5ch.net/test/read.cgi/prog/1234") == [
+            "https://medaka.5ch.net/test/read.cgi/prog/1234",
+        ]
+        assert scraper.thread_page_urls("https://medaka.5ch.net/test/read.cgi/prog/9") == []
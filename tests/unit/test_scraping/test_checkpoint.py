@@ -0,0 +1,82 @@
+"""CollectionCheckpointのテスト"""
+from datetime import datetime
+
+from src.scraping.checkpoint import CollectionCheckpoint
+from src.scraping.parser import JST, PostInfo, ThreadInfo
+
+
+THREAD = "/test/read.cgi/prog/1000000001"
+THREADS = [ThreadInfo(path=THREAD, reply_count=10, key="1000000001", title="スレッド")]
+POSTS = [
+    PostInfo(
+        date="2025/01/01(水) 12:00:00.00",
+        content="テスト①",
+        number=1,
+        poster_id="AbCd1234",
+        posted_at=datetime(2025, 1, 1, 12, 0, 0, tzinfo=JST),
+    ),
+]
+
+
+class TestCollectionCheckpoint:
+    """CollectionCheckpointのテスト"""
+
+    def test_missing_file_is_empty(self, tmp_path):
+        """チェックポイントがない場合は空の状態になる"""
+        checkpoint = CollectionCheckpoint(tmp_path / "run.jsonl")
+
+        assert checkpoint.threads is None
+        assert checkpoint.get(THREAD) is None
+        assert len(checkpoint) == 0
+
+    def test_record_and_load(self, tmp_path):
+        """記録したスレッド一覧と投稿を読み込める"""
+        path = tmp_path / "checkpoints" / "run.jsonl"
+        checkpoint = CollectionCheckpoint(path)
+        checkpoint.save_threads(THREADS)
+        checkpoint.record(THREAD, POSTS)
+
+        loaded = CollectionCheckpoint(path)
+
+        assert loaded.threads == THREADS
+        assert loaded.get(THREAD) == POSTS
+        assert len(loaded) == 1
+
+    def test_loads_record_without_new_fields(self, tmp_path):
+        """投稿者ID・投稿日時のない記録も読み込み、投稿日時は日付から復元する"""
+        path = tmp_path / "run.jsonl"
+        path.write_text(
+            '{"type": "thread", "path": "%s", "posts": '
+            '[{"date": "2025/01/01(水) 12:00:00.00", "content": "本文", "number": 1}]}\n'
+            % THREAD,
+            encoding="utf-8",
+        )
+
+        posts = CollectionCheckpoint(path).get(THREAD)
+
+        assert posts[0].poster_id is None
+        assert posts[0].posted_at == datetime(2025, 1, 1, 12, 0, 0, tzinfo=JST)
+
+    def test_truncated_line_is_ignored(self, tmp_path):
+        """書き込み途中で中断された行は無視する"""
+        path = tmp_path / "run.jsonl"
+        checkpoint = CollectionCheckpoint(path)
+        checkpoint.save_threads(THREADS)
+        with open(path, "a", encoding="utf-8") as f:
+            f.write('{"type": "thread", "path": "/test/read.cgi/prog/2", "po')
+
+        loaded = CollectionCheckpoint(path)
+
+        assert loaded.threads == THREADS
+        assert len(loaded) == 0
+
+    def test_delete(self, tmp_path):
+        """削除するとファイルと記録が消える"""
+        path = tmp_path / "run.jsonl"
+        checkpoint = CollectionCheckpoint(path)
+        checkpoint.record(THREAD, POSTS)
+
+        checkpoint.delete()
+
+        assert not path.exists()
+        assert checkpoint.get(THREAD) is None
@@ -0,0 +1,155 @@
+"""crawl_budgetモジュールのテスト"""
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from src.scraping.crawl_budget import (
+    CrawlBudget,
+    CrawlCoverage,
+    expected_yield,
+    prioritize_threads,
+)
+from src.scraping.parser import ThreadInfo
+
+
+JST = timezone(timedelta(hours=9))
+TARGET_DATE = date(2025, 1, 1)
+DAY_START = datetime(2025, 1, 1, tzinfo=JST).timestamp()
+# 対象日の翌日の正午（日次DAGの実行時刻の想定）
+NOW = DAY_START + 36 * 3600
+
+
+def _thread(number, reply_count, created_at):
+    key = str(int(created_at)) if created_at is not None else None
+    return ThreadInfo(
+        path=f"/test/read.cgi/prog/{number}",
+        reply_count=reply_count,
+        key=key,
+        title=f"スレッド{number}",
+    )
+
+
+class FakeClock:
+    """手動で進める疑似時計"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def time(self) -> float:
+        return self.now
+
+
+class TestExpectedYield:
+    """expected_yield()のテスト"""
+
+    def test_full_day_overlap(self):
+        """対象日より前に立ったスレッドは勢い × 1日分"""
+        # 2日前に立って480レス（1日240レスの勢い）
+        thread = _thread(1, 480, NOW - 48 * 3600)
+
+        assert expected_yield(thread, TARGET_DATE, NOW) == pytest.approx(240)
+
+    def test_partial_overlap(self):
+        """対象日の途中で立ったスレッドは対象日に重なる時間分だけ"""
+        # 対象日の18時に立って180レス（18時間で1時間10レスの勢い）
+        thread = _thread(1, 180, DAY_START + 18 * 3600)
+
+        assert expected_yield(thread, TARGET_DATE, NOW) == pytest.approx(60)
+
+    def test_created_after_target_date_is_zero(self):
+        """対象日より後に立ったスレッドは0"""
+        thread = _thread(1, 100, DAY_START + 25 * 3600)
+
+        assert expected_yield(thread, TARGET_DATE, NOW) == 0.0
+
+    def test_unknown_returns_none(self):
+        """レス数・スレッドキーがない場合はNone"""
+        assert expected_yield(_thread(1, None, DAY_START), TARGET_DATE, NOW) is None
+        assert expected_yield(_thread(1, 10, None), TARGET_DATE, NOW) is None
+
+
+class TestPrioritizeThreads:
+    """prioritize_threads()のテスト"""
+
+    def test_orders_by_expected_yield(self):
+        """見積もり投稿数の多い順に並べ、見積もれないスレッドは板の並び順で最後に置く"""
+        threads = [
+            _thread(1, 10, DAY_START - 3600),
+            _thread(2, None, DAY_START - 3600),
+            _thread(3, 500, DAY_START - 3600),
+            _thread(4, 100, DAY_START + 25 * 3600),
+            _thread(5, 50, DAY_START - 3600),
+            _thread(6, None, DAY_START - 3600),
+        ]
+
+        ordered, yields = prioritize_threads(threads, TARGET_DATE, NOW)
+
+        assert [thread.path[-1] for thread in ordered] == ["3", "5", "1", "2", "6"]
+        # 対象日より後に立ったスレッドは除外する
+        assert "/test/read.cgi/prog/4" not in yields
+        assert yields["/test/read.cgi/prog/2"] == 0.0
+
+    def test_ties_keep_board_order(self):
+        """見積もりが同じスレッドは板の並び順"""
+        threads = [_thread(i, 10, DAY_START - 3600) for i in range(1, 4)]
+
+        ordered, _ = prioritize_threads(threads, TARGET_DATE, NOW)
+
+        assert ordered == threads
+
+
+class TestCrawlBudget:
+    """CrawlBudgetのテスト"""
+
+    def _budget(self, clock, time_budget_sec=10.0):
+        threads = [_thread(i, 10 * i, DAY_START - 3600) for i in range(1, 5)]
+        yields = {thread.path: float(i) for i, thread in enumerate(threads, 1)}
+        coverage = CrawlCoverage()
+        budget = CrawlBudget(threads, yields, time_budget_sec, coverage, clock=clock.time)
+        return budget, threads, coverage
+
+    def test_invalid_time_budget_raises_value_error(self):
+        """時間予算が0以下の場合はValueErrorが発生する"""
+        with pytest.raises(ValueError, match="time_budget_sec must be positive"):
+            self._budget(FakeClock(), time_budget_sec=0)
+
+    def test_prune_after_excludes_later_threads(self):
+        """打ち切り位置より板の並びで後ろのスレッドは取得しない"""
+        budget, threads, coverage = self._budget(FakeClock())
+
+        budget.prune_after(threads[1])
+
+        assert budget.should_fetch(threads[0])
+        assert budget.should_fetch(threads[1])
+        assert not budget.should_fetch(threads[2])
+        # 網羅率の分母は打ち切り位置までの見積もり
+        assert coverage.expected_posts_total == 3.0
+
+    def test_exhausted_after_deadline(self):
+        """時間予算を過ぎたら取得せず、予算切れを記録する"""
+        clock = FakeClock()
+        budget, threads, coverage = self._budget(clock)
+
+        clock.now = 10.0
+
+        assert not budget.should_fetch(threads[0])
+        assert coverage.budget_exhausted is True
+
+    def test_finish_records_coverage(self):
+        """取得しなかったスレッドを打ち切り対象と未取得に分けて記録する"""
+        clock = FakeClock()
+        budget, threads, coverage = self._budget(clock)
+        budget.record_fetched(threads[1], collected_posts=5)
+        budget.prune_after(threads[2])
+        clock.now = 4.0
+
+        budget.finish([threads[0], threads[3]])
+
+        assert coverage.time_budget_sec == 10.0
+        assert coverage.elapsed_sec == 4.0
+        assert coverage.threads_fetched == 1
+        assert coverage.threads_pruned == 1
+        assert coverage.threads_unvisited == 1
+        assert coverage.collected_posts == 5
+        assert coverage.coverage_ratio == pytest.approx(2.0 / 6.0)
+        assert coverage.to_dict()["coverage_ratio"] == 0.3333
@@ -0,0 +1,66 @@
+"""CrawlStateStoreのテスト"""
+from datetime import date
+
+from src.scraping.crawl_state import CrawlStateStore, ThreadCrawlState
+
+
+THREAD = "/test/read.cgi/prog/1000000001"
+
+
+class TestThreadCrawlState:
+    """ThreadCrawlStateのテスト"""
+
+    def test_usable_for_later_date(self):
+        """前回より後の対象日では状態を利用できる"""
+        state = ThreadCrawlState(last_post_number=10, reply_count=10, target_date="2025-01-01")
+        assert state.is_usable_for(date(2025, 1, 2))
+
+    def test_not_usable_for_same_date(self):
+        """同じ対象日の再実行では状態を利用しない"""
+        state = ThreadCrawlState(last_post_number=10, reply_count=10, target_date="2025-01-01")
+        assert not state.is_usable_for(date(2025, 1, 1))
+        assert not state.is_usable_for(date(2024, 12, 31))
+
+
+class TestCrawlStateStore:
+    """CrawlStateStoreのテスト"""
+
+    def test_missing_file_is_empty(self, tmp_path):
+        """状態ファイルがない場合は空の状態になる"""
+        store = CrawlStateStore(tmp_path / "state.json")
+        assert store.get(THREAD) is None
+        assert len(store) == 0
+
+    def test_save_and_load(self, tmp_path):
+        """保存した状態を読み込める"""
+        path = tmp_path / "crawl_state" / "prog.json"
+        store = CrawlStateStore(path)
+        state = ThreadCrawlState(last_post_number=120, reply_count=130, target_date="2025-01-01")
+        store.update(THREAD, state)
+        store.save()
+
+        reloaded = CrawlStateStore(path)
+
+        assert reloaded.get(THREAD) == state
+        assert not (path.parent / "prog.json.tmp").exists()
+
+    def test_corrupted_file_is_ignored(self, tmp_path):
+        """壊れた状態ファイルは無視される"""
+        path = tmp_path / "state.json"
+        path.write_text("{broken", encoding="utf-8")
+
+        store = CrawlStateStore(path)
+
+        assert len(store) == 0
+
+    def test_retain_drops_unlisted_threads(self, tmp_path):
+        """板一覧にないスレッドの状態は削除される"""
+        store = CrawlStateStore(tmp_path / "state.json")
+        state = ThreadCrawlState(last_post_number=1, reply_count=1, target_date="2025-01-01")
+        store.update(THREAD, state)
+        store.update("/test/read.cgi/prog/1000000002", state)
+
+        store.retain([THREAD])
+
+        assert store.get(THREAD) == state
+        assert store.get("/test/read.cgi/prog/1000000002") is None
@@ -0,0 +1,723 @@
+"""daily_scraperモジュールのテスト"""
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+
+import pytest
+
+from src.scraping import daily_scraper
+from src.scraping.archive import RawHtmlArchive
+from src.scraping.checkpoint import CollectionCheckpoint
+from src.scraping.crawl_budget import CrawlCoverage
+from src.scraping.crawl_state import CrawlStateStore, ThreadCrawlState
+from src.scraping.daily_scraper import (
+    CollectedPost,
+    collect_posts_for_date,
+    iter_posts_for_date,
+)
+
+
+BASE_URL = "https://medaka.5ch.net"
+TARGET_DATE = date(2025, 1, 1)
+JST = timezone(timedelta(hours=9))
+
+
+def _board_html(thread_ids):
+    rows = "\n".join(
+        f'<p style="background: #BEB;"><a href="/test/read.cgi/prog/{tid}/l50">'
+        f'{i + 1}: スレッド{tid} (10)</a></p>'
+        for i, tid in enumerate(thread_ids)
+    )
+    return f'<html><body><div style="background: #BEB;">{rows}</div></body></html>'
+
+
+def _single_thread_board_html(reply_count):
+    # スレッド /test/read.cgi/prog/10 だけの板ページ
+    return (
+        '<html><body><div style="background: #BEB;">'
+        '<p style="background: #BEB;"><a href="/test/read.cgi/prog/10/l50">'
+        f'1: スレッド ({reply_count})</a></p></div></body></html>'
+    )
+
+
+def _thread_html(posts):
+    body = "\n".join(
+        f'<div id="{i + 1}" class="clear post">'
+        f'<div class="post-header"><span class="date">{d}</span></div>'
+        f'<div class="post-content">{c}</div></div>'
+        for i, (d, c) in enumerate(posts)
+    )
+    return f"<html><body>{body}</body></html>"
+
+
+class FakeClock:
+    """手動で進める疑似時計"""
+
+    def __init__(self, now: float = 0.0):
+        self.now = now
+
+    def time(self) -> float:
+        return self.now
+
+
+class FakeScraper:
+    """URLごとに用意したHTMLを返すScraperの代替"""
+
+    def __init__(self, pages, **kwargs):
+        self.pages = pages
+        self.fetched = []
+        self.archive_run = kwargs.get("archive_run")
+        self._lock = threading.Lock()
+
+    def fetch_bytes(self, url):
+        with self._lock:
+            self.fetched.append(url)
+        page = self.pages.get(url)
+        if page is None:
+            return None
+        data = page.encode("cp932")
+        if self.archive_run is not None:
+            self.archive_run.record(url, data)
+        return data
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+@pytest.fixture
+def pages():
+    """板ページ + 5スレッド（3番目が打ち切り対象）"""
+    return {
+        f"{BASE_URL}/prog/": _board_html([1, 2, 3, 4, 5]),
+        f"{BASE_URL}/test/read.cgi/prog/1": _thread_html([
+            ("2024/12/31(火) 23:59:59.00", "前日の投稿"),
+            ("2025/01/01(水) 10:00:00.00", "対象1-1"),
+            ("2025/01/02(木) 01:00:00.00", "当日の投稿"),
+        ]),
+        f"{BASE_URL}/test/read.cgi/prog/2": _thread_html([
+            ("2025/01/01(水) 11:00:00.00", "対象2-1"),
+            ("2025/01/01(水) 12:00:00.00", "対象2-2"),
+        ]),
+        f"{BASE_URL}/test/read.cgi/prog/3": _thread_html([
+            ("2024/12/30(月) 10:00:00.00", "古い投稿"),
+        ]),
+        f"{BASE_URL}/test/read.cgi/prog/4": _thread_html([
+            ("2025/01/01(水) 13:00:00.00", "打ち切り後の投稿"),
+        ]),
+        f"{BASE_URL}/test/read.cgi/prog/5": _thread_html([
+            ("2025/01/01(水) 14:00:00.00", "打ち切り後の投稿"),
+        ]),
+    }
+
+
+def _install_scraper(monkeypatch, pages):
+    scraper = FakeScraper(pages)
+    monkeypatch.setattr(daily_scraper, "Scraper", lambda **kwargs: scraper)
+    return scraper
+
+
+@pytest.fixture
+def fake_scraper(monkeypatch, pages):
+    return _install_scraper(monkeypatch, pages)
+
+
+class TestCollectPostsForDate:
+    """collect_posts_for_date()のテスト"""
+
+    def test_collects_only_target_date_posts(self, fake_scraper):
+        """対象日の投稿のみを収集し、打ち切り対象のスレで終了する"""
+        result = collect_posts_for_date(BASE_URL, "/prog/", TARGET_DATE)
+
+        assert result == [
+            CollectedPost("/test/read.cgi/prog/1", "2025/01/01(水) 10:00:00.00", "対象1-1"),
+            CollectedPost("/test/read.cgi/prog/2", "2025/01/01(水) 11:00:00.00", "対象2-1"),
+            CollectedPost("/test/read.cgi/prog/2", "2025/01/01(水) 12:00:00.00", "対象2-2"),
+        ]
+        assert f"{BASE_URL}/test/read.cgi/prog/4" not in fake_scraper.fetched
+
+    def test_max_posts_appends_limit_suffix(self, fake_scraper, pages):
+        """max_postsを指定するとURLに/l{max_posts}が付く"""
+        collect_posts_for_date(BASE_URL, "/prog/", TARGET_DATE, max_posts=300)
+
+        assert f"{BASE_URL}/test/read.cgi/prog/1/l300" in fake_scraper.fetched
+
+    def test_concurrent_matches_serial(self, fake_scraper):
+        """並行取得でも逐次取得と同じ結果・順序になる"""
+        serial = collect_posts_for_date(BASE_URL, "/prog/", TARGET_DATE)
+        concurrent = collect_posts_for_date(
+            BASE_URL, "/prog/", TARGET_DATE, concurrency=3, request_delay=0
+        )
+
+        assert concurrent == serial
+
+    def test_concurrent_stops_within_window(self, fake_scraper):
+        """打ち切り後は先読み分を超えてスレッドを取得しない"""
+        collect_posts_for_date(
+            BASE_URL, "/prog/", TARGET_DATE, concurrency=2, request_delay=0
+        )
+
+        # 打ち切り対象（3番目）の先読みは最大で4番目まで
+        assert f"{BASE_URL}/test/read.cgi/prog/5" not in fake_scraper.fetched
+
+    def test_concurrent_propagates_fetch_error(self, fake_scraper):
+        """並行取得中の取得エラーは呼び出し元に伝播する"""
+        def failing_fetch(url):
+            if url.endswith("/2"):
+                raise RuntimeError("fetch failed")
+            return fake_scraper.pages.get(url).encode("cp932")
+
+        fake_scraper.fetch_bytes = failing_fetch
+
+        with pytest.raises(RuntimeError, match="fetch failed"):
+            collect_posts_for_date(
+                BASE_URL, "/prog/", TARGET_DATE, concurrency=3, request_delay=0
+            )
+
+
+
+class TestIterPostsForDate:
+    """iter_posts_for_date()のテスト"""
+
+    def test_yields_same_posts_as_collect(self, fake_scraper):
+        """collect_posts_for_date と同じ投稿を同じ順序で返す"""
+        expected = collect_posts_for_date(BASE_URL, "/prog/", TARGET_DATE)
+
+        assert list(iter_posts_for_date(BASE_URL, "/prog/", TARGET_DATE)) == expected
+
+    def test_yields_before_fetching_next_thread(self, fake_scraper):
+        """スレッドの投稿は次のスレッドを取得する前に返される"""
+        posts = iter_posts_for_date(BASE_URL, "/prog/", TARGET_DATE)
+
+        first = next(posts)
+
+        assert first.thread_path == "/test/read.cgi/prog/1"
+        assert fake_scraper.fetched == [
+            f"{BASE_URL}/prog/",
+            f"{BASE_URL}/test/read.cgi/prog/1",
+        ]
+        posts.close()
+
+    def test_close_does_not_save_crawl_state(self, fake_scraper, tmp_path):
+        """途中で打ち切った場合は巡回状態を保存しない"""
+        store = CrawlStateStore(tmp_path / "state.json")
+        posts = iter_posts_for_date(BASE_URL, "/prog/", TARGET_DATE, crawl_state=store)
+
+        next(posts)
+        posts.close()
+
+        assert not (tmp_path / "state.json").exists()
+
+def _numbered_thread_html(posts):
+    body = "\n".join(
+        f'<div id="{n}" class="clear post">'
+        f'<div class="post-header"><span class="date">{d}</span></div>'
+        f'<div class="post-content">{c}</div></div>'
+        for n, d, c in posts
+    )
+    return f"<html><body>{body}</body></html>"
+
+
+def _post(number):
+    # >>1は古い投稿、2〜100は前日、101〜200は対象日
+    if number == 1:
+        return (1, "2024/12/01(日) 00:00:00.00", "スレ立て")
+    if number <= 100:
+        return (number, "2024/12/31(火) 12:00:00.00", f"前日{number}")
+    return (number, "2025/01/01(水) 12:00:00.00", f"対象{number}")
+
+
+def _range_html(start, end):
+    # 5chの範囲指定と同様に>>1を必ず含める
+    numbers = sorted({1, *range(start, end + 1)})
+    return _numbered_thread_html([_post(n) for n in numbers])
+
+
+class TestCollectPostsForDateAdaptive:
+    """adaptive_tail指定時のcollect_posts_for_date()のテスト"""
+
+    THREAD = f"{BASE_URL}/test/read.cgi/prog/10"
+
+    def test_widens_until_before_target_date(self, monkeypatch):
+        """最古のレスが対象日より前になるまで範囲を広げ、対象日のレスを取りこぼさない"""
+        scraper = _install_scraper(monkeypatch, {
+            f"{BASE_URL}/prog/": _single_thread_board_html(200),
+            f"{self.THREAD}/l50": _range_html(151, 200),
+            f"{self.THREAD}/51-150": _range_html(51, 150),
+        })
+
+        result = collect_posts_for_date(
+            BASE_URL, "/prog/", TARGET_DATE, adaptive_tail=50
+        )
+
+        assert [post.content for post in result] == [f"対象{n}" for n in range(101, 201)]
+        assert scraper.fetched == [
+            f"{BASE_URL}/prog/",
+            f"{self.THREAD}/l50",
+            f"{self.THREAD}/51-150",
+        ]
+
+    def test_tail_only_when_oldest_is_before_target(self, monkeypatch):
+        """末尾の取得範囲に前日のレスが含まれていれば追加取得しない"""
+        scraper = _install_scraper(monkeypatch, {
+            f"{BASE_URL}/prog/": _single_thread_board_html(200),
+            f"{self.THREAD}/l150": _range_html(51, 200),
+        })
+
+        result = collect_posts_for_date(
+            BASE_URL, "/prog/", TARGET_DATE, adaptive_tail=150
+        )
+
+        assert len(result) == 100
+        assert scraper.fetched == [f"{BASE_URL}/prog/", f"{self.THREAD}/l150"]
+
+    def test_small_thread_fetched_whole(self, monkeypatch):
+        """板一覧のレス数がadaptive_tail以下ならスレ全体を1回で取得する"""
+        scraper = _install_scraper(monkeypatch, {
+            f"{BASE_URL}/prog/": _single_thread_board_html(30),
+            self.THREAD: _range_html(1, 200),
+        })
+
+        collect_posts_for_date(BASE_URL, "/prog/", TARGET_DATE, adaptive_tail=50)
+
+        assert scraper.fetched == [f"{BASE_URL}/prog/", self.THREAD]
+
+    def test_widens_down_to_first_post(self, monkeypatch):
+        """スレ全体が対象日でも>>1まで遡った時点で終了する"""
+        scraper = _install_scraper(monkeypatch, {
+            f"{BASE_URL}/prog/": _single_thread_board_html(200),
+            f"{self.THREAD}/l50": _range_html(151, 200),
+            f"{self.THREAD}/51-150": _range_html(51, 150),
+            f"{self.THREAD}/1-50": _range_html(1, 50),
+        })
+
+        # >>1の投稿日を対象日にして、全レスを対象日以降にする
+        collect_posts_for_date(BASE_URL, "/prog/", date(2024, 12, 1), adaptive_tail=50)
+
+        assert scraper.fetched[-1] == f"{self.THREAD}/1-50"
+
+
+class TestCollectPostsForDateIncremental:
+    """crawl_state指定時のcollect_posts_for_date()のテスト"""
+
+    THREAD_PATH = "/test/read.cgi/prog/10"
+    THREAD = f"{BASE_URL}{THREAD_PATH}"
+
+    def _store(self, tmp_path, last_post_number, reply_count, target_date="2024-12-31"):
+        store = CrawlStateStore(tmp_path / "state.json")
+        store.update(
+            self.THREAD_PATH,
+            ThreadCrawlState(
+                last_post_number=last_post_number,
+                reply_count=reply_count,
+                target_date=target_date,
+            ),
+        )
+        return store
+
+    def test_fetches_only_posts_after_high_water_mark(self, monkeypatch, tmp_path):
+        """収集済みのレス番号より後ろだけを取得する"""
+        scraper = _install_scraper(monkeypatch, {
+            f"{BASE_URL}/prog/": _single_thread_board_html(200),
+            f"{self.THREAD}/101-": _range_html(101, 200),
+        })
+        store = self._store(tmp_path, last_post_number=100, reply_count=100)
+
+        result = collect_posts_for_date(
+            BASE_URL, "/prog/", TARGET_DATE, crawl_state=store
+        )
+
+        assert [post.content for post in result] == [f"対象{n}" for n in range(101, 201)]
+        assert scraper.fetched == [f"{BASE_URL}/prog/", f"{self.THREAD}/101-"]
+
+    def test_unchanged_thread_is_skipped(self, monkeypatch, tmp_path):
+        """板一覧のレス数が収集済みのレス番号以下のスレッドは取得しない"""
+        scraper = _install_scraper(monkeypatch, {
+            f"{BASE_URL}/prog/": _single_thread_board_html(100),
+        })
+        store = self._store(tmp_path, last_post_number=100, reply_count=100)
+
+        result = collect_posts_for_date(
+            BASE_URL, "/prog/", TARGET_DATE, crawl_state=store
+        )
+
+        assert result == []
+        assert scraper.fetched == [f"{BASE_URL}/prog/"]
+
+    def test_state_updated_and_saved(self, monkeypatch, tmp_path):
+        """巡回後に収集済みのレス番号と対象日が保存される"""
+        _install_scraper(monkeypatch, {
+            f"{BASE_URL}/prog/": _single_thread_board_html(200),
+            self.THREAD: _range_html(1, 200),
+        })
+        store = CrawlStateStore(tmp_path / "state.json")
+
+        collect_posts_for_date(BASE_URL, "/prog/", TARGET_DATE, crawl_state=store)
+
+        state = CrawlStateStore(tmp_path / "state.json").get(self.THREAD_PATH)
+        assert state == ThreadCrawlState(
+            last_post_number=200, reply_count=200, target_date="2025-01-01"
+        )
+
+    def test_same_date_rerun_ignores_state(self, monkeypatch, tmp_path):
+        """同じ対象日の再実行では状態を使わずに全体を取得し直す"""
+        scraper = _install_scraper(monkeypatch, {
+            f"{BASE_URL}/prog/": _single_thread_board_html(200),
+            self.THREAD: _range_html(1, 200),
+        })
+        store = self._store(
+            tmp_path, last_post_number=200, reply_count=200, target_date="2025-01-01"
+        )
+
+        result = collect_posts_for_date(
+            BASE_URL, "/prog/", TARGET_DATE, crawl_state=store
+        )
+
+        assert len(result) == 100
+        assert scraper.fetched == [f"{BASE_URL}/prog/", self.THREAD]
+
+
+class TestCollectPostsForDateSubjectIndex:
+    """board_index="subject" 指定時のcollect_posts_for_date()のテスト"""
+
+    SUBJECT_URL = f"{BASE_URL}/prog/subject.txt"
+
+    def test_uses_subject_txt(self, fake_scraper, pages):
+        """subject.txtからスレッド一覧を取得し、板ページは取得しない"""
+        pages[self.SUBJECT_URL] = "".join(
+            f"{tid}.dat<>スレッド{tid} (10)\n" for tid in [1, 2, 3, 4, 5]
+        )
+
+        result = collect_posts_for_date(
+            BASE_URL, "/prog/", TARGET_DATE, board_index="subject"
+        )
+
+        assert len(result) == 3
+        assert fake_scraper.fetched[0] == self.SUBJECT_URL
+        assert f"{BASE_URL}/prog/" not in fake_scraper.fetched
+
+    def test_falls_back_to_board_page(self, fake_scraper):
+        """subject.txtが取得できない場合は板ページにフォールバックする"""
+        result = collect_posts_for_date(
+            BASE_URL, "/prog/", TARGET_DATE, board_index="subject"
+        )
+
+        assert len(result) == 3
+        assert fake_scraper.fetched[:2] == [self.SUBJECT_URL, f"{BASE_URL}/prog/"]
+
+    def test_invalid_board_index_raises_value_error(self, fake_scraper):
+        """不正なboard_indexでValueErrorが発生する"""
+        with pytest.raises(ValueError, match="Invalid board_index"):
+            collect_posts_for_date(BASE_URL, "/prog/", TARGET_DATE, board_index="xml")
+
+
+class TestCollectPostsForDateArchive:
+    """archive / replay 指定時のcollect_posts_for_date()のテスト"""
+
+    def _install(self, monkeypatch, pages):
+        scrapers = []
+
+        def factory(**kwargs):
+            scraper = FakeScraper(pages, **kwargs)
+            scrapers.append(scraper)
+            return scraper
+
+        monkeypatch.setattr(daily_scraper, "Scraper", factory)
+        return scrapers
+
+    def _disable_network(self, monkeypatch):
+        def no_network(**kwargs):
+            raise AssertionError("replay must not create a Scraper")
+
+        monkeypatch.setattr(daily_scraper, "Scraper", no_network)
+
+    def test_fetched_pages_are_archived(self, monkeypatch, pages, tmp_path):
+        """取得したページが実行名のマニフェストに記録される"""
+        self._install(monkeypatch, pages)
+        archive = RawHtmlArchive(tmp_path)
+
+        collect_posts_for_date(BASE_URL, "/prog/", TARGET_DATE, archive=archive)
+
+        run = archive.load_run("prog_20250101")
+        assert run.urls() == [
+            f"{BASE_URL}/prog/",
+            f"{BASE_URL}/test/read.cgi/prog/1",
+            f"{BASE_URL}/test/read.cgi/prog/2",
+            f"{BASE_URL}/test/read.cgi/prog/3",
+        ]
+
+    def test_replay_matches_live_collection(self, monkeypatch, pages, tmp_path):
+        """リプレイはネットワークに接続せず、記録時と同じ投稿を返す"""
+        self._install(monkeypatch, pages)
+        archive = RawHtmlArchive(tmp_path)
+        live = collect_posts_for_date(BASE_URL, "/prog/", TARGET_DATE, archive=archive)
+
+        self._disable_network(monkeypatch)
+        replayed = collect_posts_for_date(
+            BASE_URL, "/prog/", TARGET_DATE, archive=archive, replay=True
+        )
+
+        assert replayed == live
+
+    def test_replay_merges_partial_pages(self, monkeypatch, tmp_path):
+        """可変範囲で取得したページを結合して同じ投稿を返す"""
+        thread = f"{BASE_URL}/test/read.cgi/prog/10"
+        self._install(monkeypatch, {
+            f"{BASE_URL}/prog/": (
+                '<html><body><div style="background: #BEB;">'
+                '<p style="background: #BEB;"><a href="/test/read.cgi/prog/10/l50">'
+                '1: スレッド (200)</a></p></div></body></html>'
+            ),
+            f"{thread}/l50": _range_html(151, 200),
+            f"{thread}/51-150": _range_html(51, 150),
+        })
+        archive = RawHtmlArchive(tmp_path)
+        live = collect_posts_for_date(
+            BASE_URL, "/prog/", TARGET_DATE, adaptive_tail=50, archive=archive
+        )
+
+        self._disable_network(monkeypatch)
+        replayed = collect_posts_for_date(
+            BASE_URL, "/prog/", TARGET_DATE, archive=archive, replay=True
+        )
+
+        assert len(live) == 100
+        assert replayed == live
+
+    def test_replay_requires_archive(self):
+        """archiveなしのリプレイでValueErrorが発生する"""
+        with pytest.raises(ValueError, match="archive is required"):
+            collect_posts_for_date(BASE_URL, "/prog/", TARGET_DATE, replay=True)
+
+    def test_replay_rejects_crawl_state(self, tmp_path):
+        """リプレイとcrawl_stateは併用できない"""
+        with pytest.raises(ValueError, match="crawl_state cannot be used"):
+            collect_posts_for_date(
+                BASE_URL,
+                "/prog/",
+                TARGET_DATE,
+                archive=RawHtmlArchive(tmp_path),
+                replay=True,
+                crawl_state=CrawlStateStore(tmp_path / "state.json"),
+            )
+
+
+class TestCollectPostsForDateCheckpoint:
+    """checkpoint指定時のcollect_posts_for_date()のテスト"""
+
+    def _fail_on(self, fake_scraper, failing_url):
+        original = fake_scraper.fetch_bytes
+
+        def fetch_bytes(url):
+            if url == failing_url:
+                raise RuntimeError("fetch failed")
+            return original(url)
+
+        fake_scraper.fetch_bytes = fetch_bytes
+        return original
+
+    def test_resume_skips_fetched_threads(self, fake_scraper, tmp_path):
+        """リトライ時は取得済みのスレッドと板ページを取得せずに再開する"""
+        expected = collect_posts_for_date(BASE_URL, "/prog/", TARGET_DATE)
+        fake_scraper.fetched.clear()
+        path = tmp_path / "run.jsonl"
+
+        original = self._fail_on(fake_scraper, f"{BASE_URL}/test/read.cgi/prog/2")
+        with pytest.raises(RuntimeError, match="fetch failed"):
+            collect_posts_for_date(
+                BASE_URL, "/prog/", TARGET_DATE, checkpoint=CollectionCheckpoint(path)
+            )
+
+        fake_scraper.fetch_bytes = original
+        fake_scraper.fetched.clear()
+        result = collect_posts_for_date(
+            BASE_URL, "/prog/", TARGET_DATE, checkpoint=CollectionCheckpoint(path)
+        )
+
+        assert result == expected
+        assert fake_scraper.fetched == [
+            f"{BASE_URL}/test/read.cgi/prog/2",
+            f"{BASE_URL}/test/read.cgi/prog/3",
+        ]
+
+    def test_resume_keeps_archived_pages(self, monkeypatch, pages, tmp_path):
+        """再開時はアーカイブのマニフェストに追記し、前回取得したページも残す"""
+        scraper = FakeScraper(pages)
+
+        def factory(**kwargs):
+            # 試行ごとに渡されるアーカイブの記録先に差し替える
+            scraper.archive_run = kwargs["archive_run"]
+            return scraper
+
+        monkeypatch.setattr(daily_scraper, "Scraper", factory)
+        archive = RawHtmlArchive(tmp_path / "archive")
+        path = tmp_path / "run.jsonl"
+
+        original = self._fail_on(scraper, f"{BASE_URL}/test/read.cgi/prog/2")
+        with pytest.raises(RuntimeError):
+            collect_posts_for_date(
+                BASE_URL, "/prog/", TARGET_DATE,
+                archive=archive, checkpoint=CollectionCheckpoint(path),
+            )
+        scraper.fetch_bytes = original
+        collect_posts_for_date(
+            BASE_URL, "/prog/", TARGET_DATE,
+            archive=archive, checkpoint=CollectionCheckpoint(path),
+        )
+
+        assert archive.load_run("prog_20250101").urls() == [
+            f"{BASE_URL}/prog/",
+            f"{BASE_URL}/test/read.cgi/prog/1",
+            f"{BASE_URL}/test/read.cgi/prog/2",
+            f"{BASE_URL}/test/read.cgi/prog/3",
+        ]
+
+    def test_replay_rejects_checkpoint(self, tmp_path):
+        """リプレイとcheckpointは併用できない"""
+        with pytest.raises(ValueError, match="checkpoint cannot be used"):
+            collect_posts_for_date(
+                BASE_URL,
+                "/prog/",
+                TARGET_DATE,
+                archive=RawHtmlArchive(tmp_path),
+                replay=True,
+                checkpoint=CollectionCheckpoint(tmp_path / "run.jsonl"),
+            )
+
+
+class TestCollectPostsForDateTimeBudget:
+    """time_budget_sec指定時のcollect_posts_for_date()のテスト"""
+
+    def _board(self, reply_counts):
+        # スレッドキー（作成時刻）は同じ古さなので、見積もりはレス数の順になる
+        rows = "\n".join(
+            f'<p style="background: #BEB;"><a href="/test/read.cgi/prog/{tid}/l50">'
+            f'{i + 1}: スレッド{tid} ({count})</a></p>'
+            for i, (tid, count) in enumerate(reply_counts)
+        )
+        return f'<html><body><div style="background: #BEB;">{rows}</div></body></html>'
+
+    @pytest.fixture
+    def budget_scraper(self, monkeypatch):
+        # 板の並びは 1, 2, 3, 4、見積もりの順は 2, 3, 4, 1
+        # 3番目は対象日の投稿がない（板の並びでそれより後ろの4番目は取得不要）
+        pages = {
+            f"{BASE_URL}/prog/": self._board([(1, 10), (2, 40), (3, 30), (4, 20)]),
+            f"{BASE_URL}/test/read.cgi/prog/1": _thread_html([
+                ("2025/01/01(水) 10:00:00.00", "対象1-1"),
+            ]),
+            f"{BASE_URL}/test/read.cgi/prog/2": _thread_html([
+                ("2025/01/01(水) 11:00:00.00", "対象2-1"),
+                ("2025/01/02(木) 01:00:00.00", "当日の投稿"),
+            ]),
+            f"{BASE_URL}/test/read.cgi/prog/3": _thread_html([
+                ("2024/12/30(月) 10:00:00.00", "古い投稿"),
+            ]),
+            f"{BASE_URL}/test/read.cgi/prog/4": _thread_html([
+                ("2025/01/01(水) 13:00:00.00", "打ち切り後の投稿"),
+            ]),
+        }
+        scraper = FakeScraper(pages)
+        monkeypatch.setattr(daily_scraper, "Scraper", lambda **kwargs: scraper)
+        return scraper
+
+    def _slow(self, scraper, clock, seconds):
+        # 1リクエストごとに疑似時計を進める
+        original = scraper.fetch_bytes
+
+        def fetch_bytes(url):
+            clock.now += seconds
+            return original(url)
+
+        scraper.fetch_bytes = fetch_bytes
+
+    def test_fetches_highest_yield_first(self, budget_scraper):
+        """見積もり投稿数の多い順に取得し、打ち切り位置より後ろのスレッドは取得しない"""
+        coverage = CrawlCoverage()
+
+        result = collect_posts_for_date(
+            BASE_URL, "/prog/", TARGET_DATE, time_budget_sec=60, coverage=coverage
+        )
+
+        assert result == [
+            CollectedPost("/test/read.cgi/prog/2", "2025/01/01(水) 11:00:00.00", "対象2-1"),
+            CollectedPost("/test/read.cgi/prog/1", "2025/01/01(水) 10:00:00.00", "対象1-1"),
+        ]
+        assert budget_scraper.fetched == [
+            f"{BASE_URL}/prog/",
+            f"{BASE_URL}/test/read.cgi/prog/2",
+            f"{BASE_URL}/test/read.cgi/prog/3",
+            f"{BASE_URL}/test/read.cgi/prog/1",
+        ]
+        assert coverage.threads_listed == 4
+        assert coverage.threads_fetched == 3
+        assert coverage.threads_pruned == 1
+        assert coverage.threads_unvisited == 0
+        assert coverage.collected_posts == 2
+        assert coverage.budget_exhausted is False
+        assert coverage.coverage_ratio == 1.0
+
+    def test_stops_when_budget_exhausted(self, budget_scraper):
+        """時間予算が尽きたら以降のスレッドを取得せず、網羅状況を記録する"""
+        clock = FakeClock(now=time.time())
+        self._slow(budget_scraper, clock, seconds=10)
+        coverage = CrawlCoverage()
+
+        result = collect_posts_for_date(
+            BASE_URL, "/prog/", TARGET_DATE,
+            time_budget_sec=15, coverage=coverage, clock=clock.time,
+        )
+
+        assert [post.thread_path for post in result] == ["/test/read.cgi/prog/2"]
+        assert f"{BASE_URL}/test/read.cgi/prog/1" not in budget_scraper.fetched
+        assert coverage.budget_exhausted is True
+        assert coverage.threads_fetched == 2
+        assert coverage.threads_unvisited == 1
+        assert coverage.coverage_ratio < 1.0
+
+    def test_ranks_threads_with_injected_clock(self, budget_scraper):
+        """スレッドの見積もりには clock の現在時刻を使う"""
+        # 対象日より前の時刻では、どのスレッドにも対象日の投稿は見込めない
+        clock = FakeClock(now=datetime(2024, 12, 31, tzinfo=JST).timestamp())
+        coverage = CrawlCoverage()
+
+        result = collect_posts_for_date(
+            BASE_URL, "/prog/", TARGET_DATE,
+            time_budget_sec=60, coverage=coverage, clock=clock.time,
+        )
+
+        assert result == []
+        assert budget_scraper.fetched == [f"{BASE_URL}/prog/"]
+        assert coverage.threads_excluded == 4
+
+    def test_replay_of_budgeted_crawl(self, monkeypatch, budget_scraper, tmp_path):
+        """予算切れで一部のスレッドを取得しなかった巡回のアーカイブも、記録時と同じ投稿を返す"""
+        clock = FakeClock(now=time.time())
+        self._slow(budget_scraper, clock, seconds=10)
+
+        def factory(**kwargs):
+            budget_scraper.archive_run = kwargs.get("archive_run")
+            return budget_scraper
+
+        monkeypatch.setattr(daily_scraper, "Scraper", factory)
+        archive = RawHtmlArchive(tmp_path)
+        live = collect_posts_for_date(
+            BASE_URL, "/prog/", TARGET_DATE,
+            time_budget_sec=15, clock=clock.time, archive=archive,
+        )
+
+        # 板の並びで先頭のスレッド（1番目）は取得していない
+        assert f"{BASE_URL}/test/read.cgi/prog/1" not in archive.load_run("prog_20250101").urls()
+        replayed = collect_posts_for_date(
+            BASE_URL, "/prog/", TARGET_DATE, archive=archive, replay=True
+        )
+
+        assert [post.content for post in live] == ["対象2-1"]
+        assert replayed == live
+
+    def test_invalid_time_budget_raises_value_error(self, budget_scraper):
+        """時間予算が0以下の場合はValueErrorが発生する"""
+        with pytest.raises(ValueError, match="time_budget_sec must be positive"):
+            collect_posts_for_date(BASE_URL, "/prog/", TARGET_DATE, time_budget_sec=0)
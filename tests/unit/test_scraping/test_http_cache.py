@@ -0,0 +1,92 @@
+"""HttpValidatorCacheのテスト"""
+import os
+
+import pytest
+
+from src.scraping.http_cache import HttpValidatorCache
+
+
+URL = "https://medaka.5ch.net/prog/subject.txt"
+HEADERS = {"ETag": '"abc"', "Last-Modified": "Wed, 01 Jan 2025 00:00:00 GMT"}
+
+
+class TestHttpValidatorCache:
+    """HttpValidatorCacheのテスト"""
+
+    def test_invalid_max_bytes_raises_value_error(self, tmp_path):
+        """max_bytesが0以下の場合はValueErrorが発生する"""
+        with pytest.raises(ValueError, match="max_bytes must be positive"):
+            HttpValidatorCache(tmp_path, max_bytes=0)
+
+    def test_store_and_get(self, tmp_path):
+        """保存したURLは条件付きリクエストのヘッダとボディを返す"""
+        cache = HttpValidatorCache(tmp_path)
+        cache.store(URL, b"body", HEADERS)
+
+        assert cache.conditional_headers(URL) == {
+            "If-None-Match": '"abc"',
+            "If-Modified-Since": "Wed, 01 Jan 2025 00:00:00 GMT",
+        }
+        assert cache.get(URL) == b"body"
+        assert cache.summary() == {
+            "hits": 1, "misses": 1, "evictions": 0, "entries": 1, "size_bytes": 4,
+        }
+
+    def test_response_without_validators_is_not_stored(self, tmp_path):
+        """検証子のないレスポンスは保存せず、以前の記録も消す"""
+        cache = HttpValidatorCache(tmp_path)
+        cache.store(URL, b"old", HEADERS)
+
+        cache.store(URL, b"new", {})
+
+        assert cache.conditional_headers(URL) == {}
+        assert len(cache) == 0
+        assert cache.size_bytes == 0
+
+    def test_persists_across_instances(self, tmp_path):
+        """保存した内容は別のインスタンスから使える"""
+        HttpValidatorCache(tmp_path).store(URL, b"body", HEADERS)
+
+        cache = HttpValidatorCache(tmp_path)
+
+        assert cache.conditional_headers(URL)["If-None-Match"] == '"abc"'
+        assert cache.get(URL) == b"body"
+        assert cache.size_bytes == 4
+
+    def test_evicts_least_recently_used(self, tmp_path):
+        """合計が上限を超えたら最も長く使われていないものから削除する"""
+        cache = HttpValidatorCache(tmp_path, max_bytes=10)
+        cache.store("https://example.com/a", b"aaaa", HEADERS)
+        cache.store("https://example.com/b", b"bbbb", HEADERS)
+        cache.get("https://example.com/a")
+
+        cache.store("https://example.com/c", b"cccc", HEADERS)
+
+        assert cache.conditional_headers("https://example.com/b") == {}
+        assert cache.get("https://example.com/a") == b"aaaa"
+        assert cache.get("https://example.com/c") == b"cccc"
+        assert cache.evictions == 1
+        assert cache.size_bytes == 8
+
+    def test_lru_order_restored_from_disk(self, tmp_path):
+        """使用順はファイルの更新時刻から復元される"""
+        cache = HttpValidatorCache(tmp_path, max_bytes=10)
+        cache.store("https://example.com/a", b"aaaa", HEADERS)
+        cache.store("https://example.com/b", b"bbbb", HEADERS)
+        # aを後から使ったことにする
+        os.utime(cache._body_path(cache._key("https://example.com/b")), (1, 1))
+
+        reloaded = HttpValidatorCache(tmp_path, max_bytes=10)
+        reloaded.store("https://example.com/c", b"cccc", HEADERS)
+
+        assert reloaded.conditional_headers("https://example.com/b") == {}
+        assert reloaded.conditional_headers("https://example.com/a") != {}
+
+    def test_missing_body_returns_none(self, tmp_path):
+        """ボディが削除されていた場合はNoneを返し、記録を消す"""
+        cache = HttpValidatorCache(tmp_path)
+        cache.store(URL, b"body", HEADERS)
+        os.remove(cache._body_path(cache._key(URL)))
+
+        assert cache.get(URL) is None
+        assert cache.conditional_headers(URL) == {}
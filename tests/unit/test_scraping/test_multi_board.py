@@ -0,0 +1,186 @@
+"""multi_boardモジュールのテスト"""
+import threading
+from datetime import date
+
+import pytest
+
+from src.scraping import daily_scraper
+from src.scraping.crawl_state import CrawlStateStore
+from src.scraping.multi_board import (
+    BoardTarget,
+    collect_posts_for_boards,
+    parse_board_urls,
+    run_for_boards,
+)
+
+
+TARGET_DATE = date(2025, 1, 1)
+PROG = BoardTarget("https://medaka.5ch.net", "/prog/", "prog")
+TECH = BoardTarget("https://medaka.5ch.net", "/tech/", "tech")
+SOFTWARE = BoardTarget("https://egg.5ch.net", "/software/", "software")
+
+
+class TestBoardTarget:
+    """BoardTargetのテスト"""
+
+    def test_from_url(self):
+        """板URLからベースURL・パス・板キーを取得する"""
+        assert BoardTarget.from_url("https://medaka.5ch.net/prog/") == PROG
+        assert BoardTarget.from_url("https://medaka.5ch.net/prog") == PROG
+        assert PROG.host == "medaka.5ch.net"
+
+    @pytest.mark.parametrize("url", ["medaka.5ch.net/prog/", "https://medaka.5ch.net/"])
+    def test_invalid_url_raises_value_error(self, url):
+        """スキーム・板キーのないURLでValueErrorが発生する"""
+        with pytest.raises(ValueError, match="Invalid board URL"):
+            BoardTarget.from_url(url)
+
+
+class TestParseBoardUrls:
+    """parse_board_urls()のテスト"""
+
+    def test_parse_comma_separated(self):
+        """カンマ・空白区切りの一覧を解析する"""
+        boards = parse_board_urls(
+            "https://medaka.5ch.net/prog/, https://egg.5ch.net/software/"
+        )
+        assert boards == [PROG, SOFTWARE]
+
+    def test_duplicate_board_key_raises_value_error(self):
+        """板キーが重複する場合はValueErrorが発生する"""
+        with pytest.raises(ValueError, match="Duplicate board keys"):
+            parse_board_urls("https://medaka.5ch.net/prog/ https://egg.5ch.net/prog/")
+
+
+class TestRunForBoards:
+    """run_for_boards()のテスト"""
+
+    def test_results_keyed_by_board_key(self):
+        """板キーごとの結果を返す"""
+        result = run_for_boards([PROG, SOFTWARE], lambda board: board.host)
+
+        assert result == {"prog": "medaka.5ch.net", "software": "egg.5ch.net"}
+
+    def test_boards_run_in_parallel(self):
+        """板ごとの処理は並行して実行される"""
+        barrier = threading.Barrier(2, timeout=5)
+
+        def task(board):
+            # 並行して実行されなければタイムアウトする
+            barrier.wait()
+            return board.board_key
+
+        assert run_for_boards([PROG, SOFTWARE], task) == {
+            "prog": "prog",
+            "software": "software",
+        }
+
+    def test_failure_is_raised_after_all_boards(self):
+        """失敗した板があっても他の板の処理を終えてからエラーにする"""
+        finished = []
+
+        def task(board):
+            if board.board_key == "prog":
+                raise RuntimeError("fetch failed")
+            finished.append(board.board_key)
+
+        with pytest.raises(RuntimeError, match=r"Collection failed for boards: \['prog'\]"):
+            run_for_boards([PROG, SOFTWARE], task)
+
+        assert finished == ["software"]
+
+    def test_empty_boards(self):
+        """板がない場合は空の結果を返す"""
+        assert run_for_boards([], lambda board: None) == {}
+
+
+class FakeScraper:
+    """板ごとにスレッド1件の固定ページを返すScraperの代替"""
+
+    def __init__(self, rate_limiter=None, **kwargs):
+        self.rate_limiter = rate_limiter
+
+    def fetch_bytes(self, url):
+        if url.endswith("/"):
+            board_key = url.rstrip("/").rsplit("/", 1)[-1]
+            html = (
+                '<html><body><div style="background: #BEB;">'
+                f'<p style="background: #BEB;"><a href="/test/read.cgi/{board_key}/1/l50">'
+                '1: スレッド (1)</a></p></div></body></html>'
+            )
+        else:
+            board_key = url.rsplit("/", 2)[-2]
+            html = (
+                '<html><body><div id="1" class="clear post">'
+                '<div class="post-header"><span class="date">2025/01/01(水) 12:00:00.00</span></div>'
+                f'<div class="post-content">{board_key}の投稿</div></div></body></html>'
+            )
+        return html.encode("cp932")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        pass
+
+
+class TestCollectPostsForBoards:
+    """collect_posts_for_boards()のテスト"""
+
+    def test_collects_per_board(self, monkeypatch):
+        """板キーごとに収集した投稿を返す"""
+        monkeypatch.setattr(daily_scraper, "Scraper", FakeScraper)
+
+        result = collect_posts_for_boards([PROG, SOFTWARE], TARGET_DATE)
+
+        assert [post.content for post in result["prog"]] == ["progの投稿"]
+        assert [post.content for post in result["software"]] == ["softwareの投稿"]
+        assert result["software"][0].thread_path == "/test/read.cgi/software/1"
+
+    def test_rate_limiter_is_shared(self, monkeypatch):
+        """全板で1つのホスト単位のレート制限を共有する"""
+        limiters = []
+
+        def factory(**kwargs):
+            limiters.append(kwargs["rate_limiter"])
+            return FakeScraper(**kwargs)
+
+        monkeypatch.setattr(daily_scraper, "Scraper", factory)
+
+        collect_posts_for_boards([PROG, TECH, SOFTWARE], TARGET_DATE, request_delay=0.01)
+
+        assert len(limiters) == 3
+        assert limiters[0] is not None
+        assert all(limiter is limiters[0] for limiter in limiters)
+
+    def test_per_board_state_given_per_board(self, monkeypatch, tmp_path):
+        """board_kwargs に指定した巡回状態は板ごとに使われる"""
+        monkeypatch.setattr(daily_scraper, "Scraper", FakeScraper)
+        stores = {
+            board.board_key: CrawlStateStore(tmp_path / f"{board.board_key}.json")
+            for board in (PROG, SOFTWARE)
+        }
+
+        collect_posts_for_boards(
+            [PROG, SOFTWARE],
+            TARGET_DATE,
+            request_delay=0,
+            board_kwargs={key: {"crawl_state": store} for key, store in stores.items()},
+        )
+
+        assert stores["prog"].get("/test/read.cgi/prog/1") is not None
+        assert stores["prog"].get("/test/read.cgi/software/1") is None
+        assert stores["software"].get("/test/read.cgi/software/1") is not None
+
+    def test_shared_per_board_state_raises_value_error(self, tmp_path):
+        """板ごとの状態を全板に共有するキーワード引数で渡すとValueErrorが発生する"""
+        with pytest.raises(ValueError, match="board_kwargs"):
+            collect_posts_for_boards(
+                [PROG, SOFTWARE],
+                TARGET_DATE,
+                crawl_state=CrawlStateStore(tmp_path / "state.json"),
+            )
+        with pytest.raises(ValueError, match="Invalid board_kwargs"):
+            collect_posts_for_boards(
+                [PROG], TARGET_DATE, board_kwargs={"prog": {"max_posts": 10}}
+            )
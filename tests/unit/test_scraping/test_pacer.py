@@ -0,0 +1,157 @@
+"""AimdPacerのテスト"""
+import pytest
+
+from src.scraping.pacer import AimdPacer
+
+
+HOST = "medaka.5ch.net"
+
+
+class FakeClock:
+    """sleepで進む疑似時計"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+def _pacer(clock, **kwargs):
+    params = dict(initial_delay=2.0, min_delay=1.0, max_delay=16.0, decrease_step=0.5)
+    params.update(kwargs)
+    return AimdPacer(clock=clock.time, sleep=clock.sleep, **params)
+
+
+class TestAimdPacerInit:
+    """__init__()のテスト"""
+
+    def test_invalid_min_delay_raises_value_error(self):
+        """min_delayが0以下の場合はValueErrorが発生する"""
+        with pytest.raises(ValueError, match="min_delay must be positive"):
+            AimdPacer(min_delay=0)
+
+    def test_invalid_max_delay_raises_value_error(self):
+        """max_delayがmin_delay未満の場合はValueErrorが発生する"""
+        with pytest.raises(ValueError, match="max_delay must be >= min_delay"):
+            AimdPacer(min_delay=2.0, max_delay=1.0)
+
+    def test_initial_delay_is_clamped_to_floor(self, clock):
+        """初期間隔は下限以上に丸められる"""
+        pacer = _pacer(clock, initial_delay=0.1)
+
+        assert pacer.delay(HOST) == 1.0
+
+
+class TestAimdPacerObserve:
+    """observe()のテスト"""
+
+    def test_fast_responses_decrease_delay_down_to_floor(self, clock):
+        """速く正常な応答が続くと間隔が加算的に縮み、下限で止まる"""
+        pacer = _pacer(clock)
+
+        pacer.observe(HOST, 200, 0.1)
+        assert pacer.delay(HOST) == pytest.approx(1.5)
+
+        for _ in range(10):
+            pacer.observe(HOST, 200, 0.1)
+        assert pacer.delay(HOST) == pytest.approx(1.0)
+
+    @pytest.mark.parametrize("status_code", [429, 500, 503])
+    def test_error_status_backs_off_multiplicatively(self, clock, status_code):
+        """429/5xxで間隔が乗算的に広がる"""
+        pacer = _pacer(clock)
+
+        pacer.observe(HOST, status_code, 0.1)
+
+        assert pacer.delay(HOST) == pytest.approx(4.0)
+
+    def test_backoff_is_capped(self, clock):
+        """間隔は上限を超えない"""
+        pacer = _pacer(clock)
+
+        for _ in range(10):
+            pacer.observe(HOST, 503, 0.1)
+
+        assert pacer.delay(HOST) == pytest.approx(16.0)
+
+    def test_retried_statuses_back_off(self, clock):
+        """最終的に成功しても、途中でリトライが発生した場合は間隔を広げる"""
+        pacer = _pacer(clock)
+
+        pacer.observe(HOST, 200, 0.1, retried_statuses=[502])
+
+        assert pacer.delay(HOST) == pytest.approx(4.0)
+
+    def test_rising_latency_backs_off(self, clock):
+        """応答時間が平均の latency_ratio 倍を超えたら間隔を広げる"""
+        pacer = _pacer(clock, latency_floor_sec=0.5)
+        pacer.observe(HOST, 200, 0.4)
+
+        pacer.observe(HOST, 200, 1.2)
+
+        assert pacer.delay(HOST) == pytest.approx(3.0)
+
+    def test_small_latency_jitter_is_ignored(self, clock):
+        """latency_floor_sec 未満の応答時間の揺らぎでは間隔を広げない"""
+        pacer = _pacer(clock)
+        pacer.observe(HOST, 200, 0.05)
+
+        pacer.observe(HOST, 200, 0.3)
+
+        assert pacer.delay(HOST) == pytest.approx(1.0)
+
+
+class TestAimdPacerAcquire:
+    """acquire()のテスト"""
+
+    def test_requests_are_spaced_by_delay(self, clock):
+        """リクエストは現在の間隔ごとに払い出される"""
+        pacer = _pacer(clock)
+
+        assert pacer.acquire(HOST) == 0.0
+        assert pacer.acquire(HOST) == pytest.approx(2.0)
+
+    def test_retry_after_blocks_until_given_time(self, clock):
+        """Retry-Afterを受け取ったらその時刻までリクエストを送らない"""
+        pacer = _pacer(clock)
+        pacer.acquire(HOST)
+
+        pacer.observe(HOST, 429, 0.1, retry_after=30.0)
+        waited = pacer.acquire(HOST)
+
+        assert waited == pytest.approx(30.0)
+        assert clock.now == pytest.approx(30.0)
+
+    def test_retry_after_extends_pending_wait(self, clock):
+        """待機中に Retry-After を受け取った場合も、その時刻まで待機を延ばす"""
+        pacer = _pacer(clock)
+        pacer.acquire(HOST)
+
+        def sleep(seconds):
+            clock.sleep(seconds)
+            if len(clock.sleeps) == 1:
+                # 1回目の待機中に別スレッドが Retry-After を受け取った
+                pacer.observe(HOST, 503, 0.1, retry_after=10.0)
+
+        pacer._sleep = sleep
+        waited = pacer.acquire(HOST)
+
+        assert waited == pytest.approx(12.0)
+
+    def test_hosts_are_paced_independently(self, clock):
+        """ホストごとに独立して間隔を調整する"""
+        pacer = _pacer(clock)
+        pacer.observe(HOST, 429, 0.1, retry_after=60.0)
+
+        assert pacer.acquire("egg.5ch.net") == 0.0
@@ -1,7 +1,16 @@
 """パーサーモジュールのテスト"""
 import pytest
+from datetime import datetime
 from pathlib import Path
-from src.scraping.parser import parse_board_page, parse_thread_page, ThreadInfo, PostInfo
+from src.scraping.parser import (
+    JST,
+    parse_board_page,
+    parse_post_datetime,
+    parse_subject_txt,
+    parse_thread_page,
+    ThreadInfo,
+    PostInfo,
+)
 
 
 # fixturesディレクトリのパス
@@ -55,6 +64,37 @@ class TestParseBoardPage:
         assert result[0].path == "/test/read.cgi/prog/1000000001"
         assert result[1].path == "/test/read.cgi/prog/1000000002"
 
+    def test_parse_board_page_extracts_reply_count(self, board_page_html):
+        """タイトル末尾の「(数字)」からレス数が抽出される"""
+        result = parse_board_page(board_page_html)
+
+        assert [thread.reply_count for thread in result] == [100, 200, 300]
+
+    def test_parse_board_page_extracts_key_and_title(self, board_page_html):
+        """スレッドキーとタイトルが抽出される"""
+        result = parse_board_page(board_page_html)
+
+        assert result[0].key == "1000000001"
+        assert result[0].title == "テストスレッド1"
+
+    def test_parse_board_page_bytes_input(self, board_page_html):
+        """cp932のバイト列からも同じスレッド一覧を抽出できる"""
+        result = parse_board_page(board_page_html.encode("cp932"))
+
+        assert result == parse_board_page(board_page_html)
+
+    def test_parse_board_page_reply_count_missing(self):
+        """レス数が表示されていない場合はNoneになる"""
+        html = '''
+        <div style="background: #BEB;">
+        <p style="background: #BEB;"><a href="/test/read.cgi/prog/1000000001/l50">Test</a></p>
+        </div>
+        '''
+
+        result = parse_board_page(html)
+
+        assert result[0].reply_count is None
+
     def test_parse_board_page_empty_html(self):
         """空のHTML"""
         html = ""
@@ -131,6 +171,70 @@ class TestParseBoardPage:
         assert result[0].path == "/test/read.cgi/prog/1000000002"
 
 
+class TestParseSubjectTxt:
+    """parse_subject_txt()のテスト"""
+
+    SUBJECT_TXT = (
+        "1000000001.dat<>テストスレッド1 (100)\n"
+        "1000000002.dat<>C&amp;C++ 質問スレ (200)\n"
+        "1000000003.dat<>テストスレッド3 (1)\n"
+    )
+
+    def test_parse_subject_txt_extracts_threads(self):
+        """subject.txtからスレッド一覧を板の並び順で抽出できる"""
+        result = parse_subject_txt(self.SUBJECT_TXT, "prog")
+
+        assert [thread.path for thread in result] == [
+            "/test/read.cgi/prog/1000000001",
+            "/test/read.cgi/prog/1000000002",
+            "/test/read.cgi/prog/1000000003",
+        ]
+
+    def test_parse_subject_txt_extracts_details(self):
+        """スレッドキー・タイトル・レス数が抽出される"""
+        result = parse_subject_txt(self.SUBJECT_TXT, "prog")
+
+        assert result[1] == ThreadInfo(
+            path="/test/read.cgi/prog/1000000002",
+            reply_count=200,
+            key="1000000002",
+            title="C&C++ 質問スレ",
+        )
+
+    def test_parse_subject_txt_skips_malformed_lines(self):
+        """形式が不正な行はスキップされる"""
+        text = "invalid line\n1000000001.dat<>テスト (10)\n\n"
+
+        result = parse_subject_txt(text, "prog")
+
+        assert len(result) == 1
+
+    def test_parse_subject_txt_bytes_input(self):
+        """cp932のバイト列からも抽出できる"""
+        result = parse_subject_txt(self.SUBJECT_TXT.encode("cp932"), "prog")
+
+        assert result == parse_subject_txt(self.SUBJECT_TXT, "prog")
+
+    def test_parse_subject_txt_empty(self):
+        """空のテキスト"""
+        assert parse_subject_txt("", "prog") == []
+
+    def test_parse_subject_txt_excludes_threads_by_title(self, monkeypatch):
+        """取得対象外のタイトルは除外される"""
+        monkeypatch.setattr(
+            "src.scraping.parser.get_excluded_thread_titles",
+            lambda: ["★ UPLIFT プレミアム・サービスのお知らせ"],
+        )
+        text = (
+            "1000000001.dat<>★ UPLIFT プレミアム・サービスのお知らせ (2)\n"
+            "1000000002.dat<>通常のスレッド (5)\n"
+        )
+
+        result = parse_subject_txt(text, "prog")
+
+        assert [thread.key for thread in result] == ["1000000002"]
+
+
 class TestParseThreadPage:
     """parse_thread_page()のテスト"""
 
@@ -166,6 +270,27 @@ class TestParseThreadPage:
         assert "<br>" not in result[2].content
         assert "<br />" not in result[2].content
 
+    def test_parse_thread_page_extracts_number(self, thread_page_html):
+        """div要素のid属性からレス番号が抽出される"""
+        result = parse_thread_page(thread_page_html)
+
+        assert [post.number for post in result] == [1, 2, 3]
+
+    def test_parse_thread_page_number_from_postid(self):
+        """id属性がない場合は<span class="postid">からレス番号が抽出される"""
+        html = '''
+        <div class="clear post">
+        <div class="post-header">
+        <span class="postid">15</span>
+        <span class="date">2025/12/02(火) 10:50:43.07</span>
+        </div>
+        <div class="post-content">Content</div>
+        </div>
+        '''
+        result = parse_thread_page(html)
+
+        assert result[0].number == 15
+
     def test_parse_thread_page_creates_post_info(self, thread_page_html):
         """PostInfoオブジェクトが正しく作成される"""
         result = parse_thread_page(thread_page_html)
@@ -273,3 +398,159 @@ class TestParseThreadPage:
         lines = result[0].content.split("\n")
         assert len(lines) >= 3
 
+
+
+# lxml/bs4エンジンの一致を確認するためのHTMLコーパス
+PARITY_FIXTURES = sorted((FIXTURES_DIR / "thread_parity").glob("*.html")) + [
+    FIXTURES_DIR / "thread_page.html",
+]
+
+
+class TestParseThreadPageEngines:
+    """parse_thread_page()のエンジン切り替えのテスト"""
+
+    @pytest.mark.parametrize("html_file", PARITY_FIXTURES, ids=lambda p: p.name)
+    def test_engines_produce_identical_posts(self, html_file):
+        """lxmlエンジンとBeautifulSoupエンジンが同じ結果を返す"""
+        html = html_file.read_text(encoding="utf-8")
+
+        lxml_posts = parse_thread_page(html, engine="lxml")
+        bs4_posts = parse_thread_page(html, engine="bs4")
+
+        assert lxml_posts == bs4_posts
+        assert len(lxml_posts) > 0
+
+    @pytest.mark.parametrize("html", [
+        "",
+        "   ",
+        "<html><body><div>No posts</div></body></html>",
+        "<html><body><div>Invalid</div>",
+        '<div class="clear post"><div class="post-content">日付なし</div></div>',
+    ])
+    def test_engines_agree_on_degenerate_html(self, html):
+        """空・投稿なし・不正なHTMLでも両エンジンが同じ結果を返す"""
+        assert parse_thread_page(html, engine="lxml") == parse_thread_page(html, engine="bs4")
+
+    def test_realistic_thread_content(self):
+        """実際のスレッド形式のHTMLから本文・レス番号が抽出される"""
+        html = (FIXTURES_DIR / "thread_parity" / "realistic_thread.html").read_text(encoding="utf-8")
+
+        result = parse_thread_page(html)
+
+        # 本文が空白のみの5番目は除外される
+        assert [post.number for post in result] == [1, 2, 3, 4, 6]
+        assert result[1].content == ">>1\nC&C++で\nstd::vector<int>\nを使うには？"
+
+    @pytest.mark.parametrize("engine", ["lxml", "bs4"])
+    @pytest.mark.parametrize("html_file", PARITY_FIXTURES, ids=lambda p: p.name)
+    def test_bytes_input_matches_str_input(self, html_file, engine):
+        """cp932のバイト列を渡しても文字列を渡した場合と同じ結果になる"""
+        html = html_file.read_text(encoding="utf-8")
+
+        from_bytes = parse_thread_page(html.encode("cp932"), engine=engine)
+
+        assert from_bytes == parse_thread_page(html, engine="bs4")
+
+    @pytest.mark.parametrize("engine", ["lxml", "bs4"])
+    def test_bytes_input_decodes_cp932_only_characters(self, engine):
+        """Shift_JISにないcp932拡張文字（①、髙、～ など）が文字化けしない"""
+        html = (
+            '<div id="1" class="clear post"><span class="date">2025/01/01(水) 00:00:00.00</span>'
+            '<div class="post-content">①髙橋～∥－￢</div></div>'
+        ).encode("cp932")
+
+        result = parse_thread_page(html, engine=engine)
+
+        assert result[0].content == "①髙橋～∥－￢"
+
+    @pytest.mark.parametrize("engine", ["lxml", "bs4"])
+    def test_bytes_input_keeps_entity_references(self, engine):
+        """文字参照で書かれた 〜 − ¬ はバイト列・文字列のどちらで渡しても同じ文字になる"""
+        html = (
+            '<div id="1" class="clear post"><span class="date">2025/01/01(水) 00:00:00.00</span>'
+            '<div class="post-content">&#12316;&#8722;&not; ～－￢</div></div>'
+        )
+
+        from_bytes = parse_thread_page(html.encode("cp932"), engine=engine)
+
+        assert from_bytes == parse_thread_page(html, engine=engine)
+        assert from_bytes[0].content == "\u301c\u2212\u00ac ～－￢"
+
+    @pytest.mark.parametrize("engine", ["lxml", "bs4"])
+    def test_xml_encoding_declaration(self, engine):
+        """先頭にXMLのエンコーディング宣言があるページもバイト列・文字列のどちらでも解析できる"""
+        html = (
+            '<?xml version="1.0" encoding="Shift_JIS"?>\n<html><body>'
+            '<div id="1" class="clear post"><span class="date">2025/01/01(水) 00:00:00.00</span>'
+            '<div class="post-content">宣言付き①</div></div></body></html>'
+        )
+
+        from_bytes = parse_thread_page(html.encode("cp932"), engine=engine)
+
+        assert from_bytes == parse_thread_page(html, engine=engine)
+        assert [post.content for post in from_bytes] == ["宣言付き①"]
+
+    def test_realistic_thread_structured_fields(self):
+        """レス番号・投稿者ID・投稿日時（JST）が抽出される"""
+        html = (FIXTURES_DIR / "thread_parity" / "realistic_thread.html").read_text(encoding="utf-8")
+
+        result = parse_thread_page(html)
+
+        assert [post.poster_id for post in result] == [
+            "AbCd1234", "EfGh5678", "IjKl9012", None, "QrSt7890"
+        ]
+        assert result[0].posted_at == datetime(2025, 1, 1, 0, 0, 1, 230000, tzinfo=JST)
+        # あぼーんは投稿日時を解析できない
+        assert result[3].posted_at is None
+
+    def test_post_info_has_no_instance_dict(self):
+        """PostInfoは__slots__で定義され、インスタンスごとの__dict__を持たない"""
+        post = PostInfo(date="2025/01/01(水) 00:00:00.00", content="本文")
+
+        assert not hasattr(post, "__dict__")
+
+    def test_invalid_engine_raises_value_error(self):
+        """不正なエンジン名でValueErrorが発生する"""
+        with pytest.raises(ValueError, match="Invalid engine"):
+            parse_thread_page("", engine="html5lib")
+
+
+class TestParsePostDatetime:
+    """parse_post_datetime()のテスト"""
+
+    @pytest.mark.parametrize("value, expected", [
+        ("2025/01/01(水) 12:34:56.78", datetime(2025, 1, 1, 12, 34, 56, 780000, tzinfo=JST)),
+        ("2025/01/01(水) 12:34:56", datetime(2025, 1, 1, 12, 34, 56, tzinfo=JST)),
+        ("2025/01/01(水)12:34:56.78", datetime(2025, 1, 1, 12, 34, 56, 780000, tzinfo=JST)),
+        ("2025/01/01(水曜) 00:00:00.123456789",
+         datetime(2025, 1, 1, 0, 0, 0, 123456, tzinfo=JST)),
+        ("2024/02/29(木) 23:59:59.99 ID:AbCd1234",
+         datetime(2024, 2, 29, 23, 59, 59, 990000, tzinfo=JST)),
+    ])
+    def test_parses_5ch_format(self, value, expected):
+        """5chの投稿日時を日本時間のdatetimeに変換する"""
+        assert parse_post_datetime(value) == expected
+
+    def test_matches_strptime(self):
+        """strptimeで解析した結果と一致する"""
+        value = "2025/12/31(水) 23:59:58.01"
+
+        expected = datetime.strptime(
+            value.replace("(水)", ""), "%Y/%m/%d %H:%M:%S.%f"
+        ).replace(tzinfo=JST)
+
+        assert parse_post_datetime(value) == expected
+
+    @pytest.mark.parametrize("value", [
+        "",
+        "あぼーん",
+        "2025/01/01 12:34:56",
+        "2025/01/01(水)",
+        "2025/13/01(水) 12:34:56.78",
+        "2025/02/30(日) 12:34:56.78",
+        "2025/01/01(水) 1:34:56.78",
+        "2025/0a/01(水) 12:34:56.78",
+    ])
+    def test_invalid_returns_none(self, value):
+        """解析できない・存在しない日時はNone"""
+        assert parse_post_datetime(value) is None
@@ -0,0 +1,112 @@
+"""TokenBucketRateLimiterのテスト"""
+import threading
+
+import pytest
+
+from src.scraping.rate_limiter import TokenBucketRateLimiter
+
+
+class FakeClock:
+    """sleepで進む疑似時計"""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def time(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+class TestTokenBucketRateLimiterInit:
+    """__init__()のテスト"""
+
+    def test_invalid_rate_raises_value_error(self):
+        """rateが0以下の場合はValueErrorが発生する"""
+        with pytest.raises(ValueError, match="rate must be positive"):
+            TokenBucketRateLimiter(rate=0)
+
+    def test_invalid_burst_raises_value_error(self):
+        """burstが1未満の場合はValueErrorが発生する"""
+        with pytest.raises(ValueError, match="burst must be >= 1"):
+            TokenBucketRateLimiter(rate=1.0, burst=0)
+
+
+class TestTokenBucketRateLimiterAcquire:
+    """acquire()のテスト"""
+
+    def test_first_acquire_does_not_wait(self, clock):
+        """最初の取得は待機しない"""
+        limiter = TokenBucketRateLimiter(rate=0.5, clock=clock.time, sleep=clock.sleep)
+
+        assert limiter.acquire("medaka.5ch.net") == 0.0
+        assert clock.sleeps == []
+
+    def test_consecutive_acquire_waits_interval(self, clock):
+        """連続した取得は 1 / rate 秒間隔に制限される"""
+        limiter = TokenBucketRateLimiter(rate=0.5, clock=clock.time, sleep=clock.sleep)
+
+        limiter.acquire("medaka.5ch.net")
+        waited = limiter.acquire("medaka.5ch.net")
+
+        assert waited == pytest.approx(2.0)
+        assert clock.now == pytest.approx(2.0)
+
+    def test_burst_allows_immediate_requests(self, clock):
+        """burst分までは待機せずに取得できる"""
+        limiter = TokenBucketRateLimiter(
+            rate=1.0, burst=3, clock=clock.time, sleep=clock.sleep
+        )
+
+        waits = [limiter.acquire("medaka.5ch.net") for _ in range(4)]
+
+        assert waits[:3] == [0.0, 0.0, 0.0]
+        assert waits[3] == pytest.approx(1.0)
+
+    def test_tokens_refill_over_time(self, clock):
+        """時間経過でトークンが補充される"""
+        limiter = TokenBucketRateLimiter(rate=1.0, clock=clock.time, sleep=clock.sleep)
+
+        limiter.acquire("medaka.5ch.net")
+        clock.now += 5.0
+
+        assert limiter.acquire("medaka.5ch.net") == 0.0
+
+    def test_hosts_are_limited_independently(self, clock):
+        """ホストごとに独立して制限される"""
+        limiter = TokenBucketRateLimiter(rate=0.5, clock=clock.time, sleep=clock.sleep)
+
+        limiter.acquire("medaka.5ch.net")
+
+        assert limiter.acquire("egg.5ch.net") == 0.0
+
+    def test_concurrent_waiters_are_spaced(self):
+        """複数スレッドから同時に取得した場合も待ち時間が重ならない"""
+        limiter = TokenBucketRateLimiter(rate=100.0, sleep=lambda _: None)
+        waits = []
+        lock = threading.Lock()
+
+        def worker():
+            wait = limiter._reserve("medaka.5ch.net")
+            with lock:
+                waits.append(wait)
+
+        workers = [threading.Thread(target=worker) for _ in range(5)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+
+        # 1件目は即時、残りは0.01秒ずつずれた待ち時間になる
+        waits.sort()
+        assert waits[0] == 0.0
+        for prev, current in zip(waits, waits[1:]):
+            assert current - prev == pytest.approx(0.01, abs=0.005)
@@ -1,11 +1,23 @@
 """Scraperクラスのテスト"""
+import os
 import pytest
+from datetime import timedelta
 from unittest.mock import Mock, patch, MagicMock
 import requests
+from src.scraping.http_cache import HttpValidatorCache
 from src.scraping.scraper import Scraper
 from src.scraping import utils
 
 
+def _mock_response():
+    """計測に必要な属性（elapsed, content, raw.retries）を持つモックレスポンス"""
+    response = Mock()
+    response.elapsed = timedelta(milliseconds=100)
+    response.content = b""
+    response.raw.retries = None
+    return response
+
+
 class TestScraperInit:
     """__init__()のテスト"""
 
@@ -61,7 +73,7 @@ class TestScraperFetch:
         mock_is_valid_url.return_value = True
         
         # モックレスポンスを作成
-        mock_response = Mock()
+        mock_response = _mock_response()
         mock_response.text = "<html>test</html>"
         mock_response.encoding = "Shift_JIS"
         mock_response.raise_for_status = Mock()
@@ -81,7 +93,7 @@ class TestScraperFetch:
         """エンコーディングが正しく設定される"""
         mock_is_valid_url.return_value = True
         
-        mock_response = Mock()
+        mock_response = _mock_response()
         mock_response.text = "<html>test</html>"
         mock_response.encoding = None
         mock_response.raise_for_status = Mock()
@@ -93,6 +105,51 @@ class TestScraperFetch:
         
         assert mock_response.encoding == "UTF-8"
 
+    @patch('src.scraping.scraper.utils.sleep_with_jitter')
+    @patch('src.scraping.scraper.utils.is_valid_url')
+    def test_fetch_default_encoding_cp932(self, mock_is_valid_url, mock_sleep):
+        """既定のエンコーディングはcp932（Shift_JISのMicrosoft拡張）"""
+        mock_is_valid_url.return_value = True
+
+        mock_response = _mock_response()
+        mock_response.raise_for_status = Mock()
+
+        scraper = Scraper()
+        scraper.session.get = Mock(return_value=mock_response)
+
+        scraper.fetch("https://example.com")
+
+        assert mock_response.encoding == "cp932"
+
+    @patch('src.scraping.scraper.utils.sleep_with_jitter')
+    @patch('src.scraping.scraper.utils.is_valid_url')
+    def test_fetch_bytes_returns_raw_content(self, mock_is_valid_url, mock_sleep):
+        """fetch_bytesはデコードせずにレスポンスボディを返す"""
+        mock_is_valid_url.return_value = True
+
+        body = "①テスト".encode("cp932")
+        mock_response = _mock_response()
+        mock_response.content = body
+        mock_response.raise_for_status = Mock()
+
+        scraper = Scraper()
+        scraper.session.get = Mock(return_value=mock_response)
+
+        result = scraper.fetch_bytes("https://example.com")
+
+        assert result == body
+        mock_sleep.assert_called_once()
+
+    @patch('src.scraping.scraper.utils.is_valid_url')
+    def test_fetch_bytes_invalid_url_raises_value_error(self, mock_is_valid_url):
+        """fetch_bytesでも不正なURLでValueErrorが発生する"""
+        mock_is_valid_url.return_value = False
+
+        scraper = Scraper()
+
+        with pytest.raises(ValueError, match="Invalid URL"):
+            scraper.fetch_bytes("invalid-url")
+
     @patch('src.scraping.scraper.utils.is_valid_url')
     def test_fetch_invalid_url_raises_value_error(self, mock_is_valid_url):
         """不正なURLでValueErrorが発生する"""
@@ -109,7 +166,7 @@ class TestScraperFetch:
         """HTTPエラーでRequestExceptionが発生する"""
         mock_is_valid_url.return_value = True
         
-        mock_response = Mock()
+        mock_response = _mock_response()
         mock_response.raise_for_status.side_effect = requests.HTTPError("404 Not Found")
         
         scraper = Scraper()
@@ -146,7 +203,7 @@ class TestScraperFetch:
         """空のレスポンスボディ"""
         mock_is_valid_url.return_value = True
         
-        mock_response = Mock()
+        mock_response = _mock_response()
         mock_response.text = ""
         mock_response.encoding = "Shift_JIS"
         mock_response.raise_for_status = Mock()
@@ -163,7 +220,7 @@ class TestScraperFetch:
         """異なるエンコーディングの指定"""
         mock_is_valid_url.return_value = True
         
-        mock_response = Mock()
+        mock_response = _mock_response()
         mock_response.text = "<html>test</html>"
         mock_response.encoding = None
         mock_response.raise_for_status = Mock()
@@ -175,6 +232,273 @@ class TestScraperFetch:
         assert mock_response.encoding == "UTF-8"
 
 
+class TestScraperRateLimiter:
+    """rate_limiter指定時のテスト"""
+
+    @patch('src.scraping.scraper.utils.sleep_with_jitter')
+    def test_fetch_acquires_token_instead_of_sleep(self, mock_sleep):
+        """リクエスト前にホスト単位でトークンを取得し、固定待機は行わない"""
+        mock_limiter = Mock()
+        mock_limiter.acquire.return_value = 0.0
+
+        mock_response = _mock_response()
+        mock_response.text = "<html>test</html>"
+        mock_response.raise_for_status = Mock()
+
+        scraper = Scraper(rate_limiter=mock_limiter)
+        scraper.session.get = Mock(return_value=mock_response)
+
+        result = scraper.fetch("https://medaka.5ch.net/prog/")
+
+        assert result == "<html>test</html>"
+        mock_limiter.acquire.assert_called_once_with("medaka.5ch.net")
+        mock_sleep.assert_not_called()
+
+
+class TestScraperArchive:
+    """archive_run指定時のテスト"""
+
+    @patch('src.scraping.scraper.utils.sleep_with_jitter')
+    def test_fetch_records_raw_content(self, mock_sleep):
+        """取得したレスポンスボディをURLとともにアーカイブに記録する"""
+        mock_archive_run = Mock()
+
+        body = "<html>テスト</html>".encode("cp932")
+        mock_response = _mock_response()
+        mock_response.content = body
+        mock_response.raise_for_status = Mock()
+
+        scraper = Scraper(archive_run=mock_archive_run)
+        scraper.session.get = Mock(return_value=mock_response)
+
+        scraper.fetch_bytes("https://medaka.5ch.net/prog/")
+
+        mock_archive_run.record.assert_called_once_with(
+            "https://medaka.5ch.net/prog/", body
+        )
+
+    @patch('src.scraping.scraper.utils.is_valid_url')
+    def test_failed_fetch_is_not_recorded(self, mock_is_valid_url):
+        """取得に失敗したページは記録しない"""
+        mock_is_valid_url.return_value = True
+        mock_archive_run = Mock()
+
+        mock_response = _mock_response()
+        mock_response.raise_for_status.side_effect = requests.HTTPError("404 Not Found")
+
+        scraper = Scraper(archive_run=mock_archive_run)
+        scraper.session.get = Mock(return_value=mock_response)
+
+        with pytest.raises(requests.RequestException):
+            scraper.fetch_bytes("https://example.com")
+
+        mock_archive_run.record.assert_not_called()
+
+
+class TestScraperStats:
+    """リクエストの計測のテスト"""
+
+    @patch('src.scraping.scraper.utils.sleep_with_jitter')
+    def test_fetch_records_request_stats(self, mock_sleep):
+        """TTFB・転送量・リトライ回数・待機時間を記録する"""
+        mock_response = _mock_response()
+        mock_response.elapsed = timedelta(milliseconds=120)
+        mock_response.content = b"x" * 2048
+        # 503での再試行と、接続エラー（ステータスなし）での再試行
+        mock_response.raw.retries = Mock(history=(Mock(status=503), Mock(status=None)))
+        mock_response.raise_for_status = Mock()
+
+        scraper = Scraper()
+        scraper.session.get = Mock(return_value=mock_response)
+
+        scraper.fetch_bytes("https://medaka.5ch.net/prog/")
+
+        summary = scraper.stats.summary()
+        assert summary["requests"] == 1
+        assert summary["total_bytes"] == 2048
+        assert summary["total_retries"] == 2
+        assert summary["retry_statuses"] == {"503": 1}
+        assert summary["ttfb_ms"]["sum"] == pytest.approx(120.0)
+        assert summary["sleep_ms"]["count"] == 1
+
+    @patch('src.scraping.scraper.utils.is_valid_url')
+    def test_failed_fetch_counts_error(self, mock_is_valid_url):
+        """取得に失敗したリクエストはエラーとして数える"""
+        mock_is_valid_url.return_value = True
+
+        scraper = Scraper()
+        scraper.session.get = Mock(side_effect=requests.ConnectionError("Connection refused"))
+
+        with pytest.raises(requests.RequestException):
+            scraper.fetch_bytes("https://example.com")
+
+        assert scraper.stats.summary()["errors"] == 1
+        assert scraper.stats.summary()["requests"] == 0
+
+    def test_rate_limit_wait_recorded(self):
+        """レート制限のトークン待ちの時間を記録する"""
+        mock_limiter = Mock()
+        mock_limiter.acquire.return_value = 1.5
+        mock_response = _mock_response()
+        mock_response.raise_for_status = Mock()
+
+        scraper = Scraper(rate_limiter=mock_limiter)
+        scraper.session.get = Mock(return_value=mock_response)
+
+        scraper.fetch_bytes("https://medaka.5ch.net/prog/")
+
+        assert scraper.stats.summary()["rate_limit_wait_sec"] == pytest.approx(1.5)
+
+
+class TestScraperPacer:
+    """pacer指定時のテスト"""
+
+    def _response(self, status_code, headers=None):
+        response = _mock_response()
+        response.status_code = status_code
+        response.headers = headers or {}
+        if status_code >= 400:
+            response.raise_for_status.side_effect = requests.HTTPError(f"{status_code} Error")
+        else:
+            response.raise_for_status = Mock()
+        return response
+
+    def test_paced_statuses_are_not_retried_by_urllib3(self):
+        """429/503 はurllib3のリトライ対象から外し、pacer側で再試行する"""
+        scraper = Scraper(pacer=Mock())
+        adapter = scraper.session.get_adapter("https://")
+
+        assert adapter.max_retries.status_forcelist == [500, 502, 504]
+
+    @patch('src.scraping.scraper.utils.sleep_with_jitter')
+    def test_success_is_observed_without_fixed_sleep(self, mock_sleep):
+        """成功したレスポンスをpacerに渡し、固定待機は行わない"""
+        mock_pacer = Mock()
+        mock_pacer.acquire.return_value = 0.0
+
+        scraper = Scraper(pacer=mock_pacer)
+        scraper.session.get = Mock(return_value=self._response(200))
+
+        scraper.fetch_bytes("https://medaka.5ch.net/prog/")
+
+        mock_pacer.acquire.assert_called_once_with("medaka.5ch.net")
+        mock_pacer.observe.assert_called_once_with(
+            "medaka.5ch.net", 200, 0.1, retry_after=None, retried_statuses=[]
+        )
+        mock_sleep.assert_not_called()
+
+    def test_retry_after_is_passed_and_request_retried(self):
+        """429のRetry-Afterをpacerに渡し、pacerの待機後に再試行する"""
+        mock_pacer = Mock()
+        mock_pacer.acquire.return_value = 0.0
+
+        scraper = Scraper(pacer=mock_pacer)
+        scraper.session.get = Mock(side_effect=[
+            self._response(429, {"Retry-After": "30"}),
+            self._response(200),
+        ])
+
+        scraper.fetch_bytes("https://medaka.5ch.net/prog/")
+
+        assert scraper.session.get.call_count == 2
+        assert mock_pacer.acquire.call_count == 2
+        first_observe = mock_pacer.observe.call_args_list[0]
+        assert first_observe.args[1] == 429
+        assert first_observe.kwargs["retry_after"] == 30.0
+        assert scraper.stats.summary()["total_retries"] == 1
+        assert scraper.stats.summary()["retry_statuses"] == {"429": 1}
+
+    def test_gives_up_after_max_retries(self):
+        """max_retries回再試行しても429の場合はエラーになる"""
+        mock_pacer = Mock()
+        mock_pacer.acquire.return_value = 0.0
+
+        scraper = Scraper(max_retries=2, pacer=mock_pacer)
+        scraper.session.get = Mock(return_value=self._response(429))
+
+        with pytest.raises(requests.RequestException, match="Failed to fetch"):
+            scraper.fetch_bytes("https://medaka.5ch.net/prog/")
+
+        assert scraper.session.get.call_count == 3
+        # 取得できなかったリクエストの再試行も記録する
+        summary = scraper.stats.summary()
+        assert summary["errors"] == 1
+        assert summary["total_retries"] == 2
+        assert summary["retry_statuses"] == {"429": 2}
+
+
+class TestScraperHttpCache:
+    """http_cache指定時のテスト"""
+
+    URL = "https://medaka.5ch.net/prog/subject.txt"
+
+    def _response(self, status_code, content=b"", headers=None):
+        # 304 の場合にボディを差し替えられるよう、実際のResponseを使う
+        response = requests.Response()
+        response.status_code = status_code
+        response._content = content
+        response.headers.update(headers or {})
+        response.elapsed = timedelta(milliseconds=100)
+        response.raw = Mock(retries=None)
+        response.url = self.URL
+        return response
+
+    @patch('src.scraping.scraper.utils.sleep_with_jitter')
+    def test_not_modified_served_from_cache(self, mock_sleep, tmp_path):
+        """2回目は条件付きリクエストを送り、304ならキャッシュのボディを返す"""
+        cache = HttpValidatorCache(tmp_path)
+        scraper = Scraper(http_cache=cache)
+        scraper.session.get = Mock(side_effect=[
+            self._response(200, b"subject", {"ETag": '"v1"'}),
+            self._response(304),
+        ])
+
+        first = scraper.fetch_bytes(self.URL)
+        second = scraper.fetch_bytes(self.URL)
+
+        assert first == second == b"subject"
+        assert scraper.session.get.call_args_list[1].kwargs["headers"] == {
+            "If-None-Match": '"v1"'
+        }
+        assert cache.hits == 1
+        assert cache.misses == 1
+        # 転送量は実際に受信したバイト数
+        assert scraper.stats.summary()["total_bytes"] == len(b"subject")
+
+    @patch('src.scraping.scraper.utils.sleep_with_jitter')
+    def test_modified_response_replaces_cache(self, mock_sleep, tmp_path):
+        """変更があった場合（200）は新しいボディと検証子で置き換える"""
+        cache = HttpValidatorCache(tmp_path)
+        cache.store(self.URL, b"old", {"ETag": '"v1"'})
+        scraper = Scraper(http_cache=cache)
+        scraper.session.get = Mock(
+            return_value=self._response(200, b"new", {"ETag": '"v2"'})
+        )
+
+        assert scraper.fetch_bytes(self.URL) == b"new"
+        assert cache.conditional_headers(self.URL) == {"If-None-Match": '"v2"'}
+        assert cache.get(self.URL) == b"new"
+
+    @patch('src.scraping.scraper.utils.sleep_with_jitter')
+    def test_refetches_when_cached_body_is_gone(self, mock_sleep, tmp_path):
+        """304を受け取ったときにキャッシュが消えていれば条件なしで取得し直す"""
+        cache = HttpValidatorCache(tmp_path)
+        cache.store(self.URL, b"old", {"ETag": '"v1"'})
+        scraper = Scraper(http_cache=cache)
+
+        def get(url, timeout, headers=None):
+            if headers:
+                # 条件付きリクエストの送信中に別スレッドが削除した状況
+                os.remove(cache._body_path(cache._key(url)))
+                return self._response(304)
+            return self._response(200, b"fresh", {"ETag": '"v2"'})
+
+        scraper.session.get = Mock(side_effect=get)
+
+        assert scraper.fetch_bytes(self.URL) == b"fresh"
+        assert scraper.session.get.call_count == 2
+
+
 class TestScraperRetry:
     """リトライ機能のテスト"""
 
@@ -189,7 +513,7 @@ class TestScraperRetry:
         mock_response_error.status_code = 500
         mock_response_error.raise_for_status.side_effect = requests.HTTPError("500 Internal Server Error")
         
-        mock_response_success = Mock()
+        mock_response_success = _mock_response()
         mock_response_success.text = "<html>success</html>"
         mock_response_success.encoding = "Shift_JIS"
         mock_response_success.raise_for_status = Mock()
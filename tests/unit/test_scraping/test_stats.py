@@ -0,0 +1,92 @@
+"""statsモジュールのテスト"""
+import threading
+
+import pytest
+
+from src.scraping.stats import Histogram, ScraperStats
+
+
+class TestHistogram:
+    """Histogramのテスト"""
+
+    def test_observe_counts_into_buckets(self):
+        """値が上限以下の最小のバケットに数えられる"""
+        histogram = Histogram((10, 100))
+
+        for value in [5, 10, 11, 100, 1000]:
+            histogram.observe(value)
+
+        assert histogram.summary()["buckets"] == {"le_10": 2, "le_100": 2, "le_inf": 1}
+        assert histogram.count == 5
+        assert histogram.max == 1000
+
+    def test_quantile_uses_bucket_bounds(self):
+        """分位点はバケットの上限で近似される"""
+        histogram = Histogram((10, 100, 1000))
+
+        for value in [1] * 90 + [50] * 9 + [500]:
+            histogram.observe(value)
+
+        assert histogram.quantile(0.5) == 10
+        assert histogram.quantile(0.9) == 10
+        assert histogram.quantile(0.99) == 100
+        assert histogram.quantile(1.0) == 500
+
+    def test_empty_summary(self):
+        """観測値がない場合の平均・分位点はNone"""
+        summary = Histogram((10,)).summary()
+
+        assert summary["count"] == 0
+        assert summary["mean"] is None
+        assert summary["p50"] is None
+
+
+class TestScraperStats:
+    """ScraperStatsのテスト"""
+
+    def test_summary_totals(self):
+        """リクエストの計測値が集計される"""
+        stats = ScraperStats()
+        stats.record_request(ttfb_sec=0.1, total_sec=0.3, num_bytes=1000, retries=0)
+        stats.record_request(ttfb_sec=0.2, total_sec=2.5, num_bytes=3000, retries=2)
+        stats.record_error()
+        stats.record_sleep(2.0)
+
+        summary = stats.summary()
+
+        assert summary["requests"] == 2
+        assert summary["errors"] == 1
+        assert summary["total_bytes"] == 4000
+        assert summary["total_retries"] == 2
+        assert summary["sleep_sec"] == pytest.approx(2.0)
+        assert summary["total_ms"]["max"] == pytest.approx(2500.0)
+        assert summary["retries"]["buckets"]["le_2"] == 1
+
+    def test_failed_request_retries_and_statuses(self):
+        """取得できなかったリクエストの再試行回数と、再試行したステータスコードを集計する"""
+        stats = ScraperStats()
+        stats.record_retry_statuses([429, 503])
+        stats.record_retry_statuses([429])
+        stats.record_error(retries=3)
+
+        summary = stats.summary()
+
+        assert summary["errors"] == 1
+        assert summary["total_retries"] == 3
+        assert summary["retry_statuses"] == {"429": 2, "503": 1}
+
+    def test_concurrent_records(self):
+        """複数スレッドから記録しても件数が失われない"""
+        stats = ScraperStats()
+
+        def worker():
+            for _ in range(100):
+                stats.record_request(ttfb_sec=0.1, total_sec=0.2, num_bytes=10, retries=0)
+
+        workers = [threading.Thread(target=worker) for _ in range(4)]
+        for w in workers:
+            w.start()
+        for w in workers:
+            w.join()
+
+        assert stats.summary()["requests"] == 400
@@ -1,5 +1,6 @@
 """utilsモジュールのテスト"""
 import pytest
+from datetime import datetime, timezone
 from unittest.mock import patch, MagicMock
 from src.scraping import utils
 
@@ -89,6 +90,36 @@ class TestIsValidUrl:
         assert utils.is_valid_url("not a url") is False
 
 
+class TestGetHost:
+    """get_host()のテスト"""
+
+    def test_get_host_basic(self):
+        """URLからホスト名を取得できる"""
+        result = utils.get_host("https://medaka.5ch.net/test/read.cgi/prog/1000000001")
+        assert result == "medaka.5ch.net"
+
+    def test_get_host_lowercase(self):
+        """ホスト名は小文字に揃えられる"""
+        result = utils.get_host("https://Medaka.5ch.NET/prog/")
+        assert result == "medaka.5ch.net"
+
+
+class TestGetBoardKey:
+    """get_board_key()のテスト"""
+
+    def test_get_board_key_with_slashes(self):
+        """前後のスラッシュ有りのパス"""
+        assert utils.get_board_key("/prog/") == "prog"
+
+    def test_get_board_key_without_trailing_slash(self):
+        """末尾スラッシュ無しのパス"""
+        assert utils.get_board_key("/prog") == "prog"
+
+    def test_get_board_key_empty(self):
+        """空のパス"""
+        assert utils.get_board_key("/") == ""
+
+
 class TestGetDefaultHeaders:
     """get_default_headers()のテスト（最小限）"""
 
@@ -142,6 +173,32 @@ class TestSleepWithJitter:
         mock_sleep.assert_called_with(2.5)
 
 
+class TestParseRetryAfter:
+    """parse_retry_after()のテスト"""
+
+    def test_parse_seconds(self):
+        """秒数の指定"""
+        assert utils.parse_retry_after("120") == 120.0
+
+    def test_parse_http_date(self):
+        """HTTP-dateの指定は現在時刻からの秒数になる"""
+        now = datetime(2025, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+        result = utils.parse_retry_after("Wed, 01 Jan 2025 00:00:30 GMT", now=now)
+        assert result == 30.0
+
+    def test_parse_past_http_date(self):
+        """過去の日時は0秒"""
+        now = datetime(2025, 1, 1, 0, 0, 0, tzinfo=timezone.utc)
+        result = utils.parse_retry_after("Tue, 31 Dec 2024 23:59:00 GMT", now=now)
+        assert result == 0.0
+
+    def test_parse_missing_or_invalid(self):
+        """ヘッダがない・解釈できない場合はNone"""
+        assert utils.parse_retry_after(None) is None
+        assert utils.parse_retry_after("") is None
+        assert utils.parse_retry_after("soon") is None
+
+
 class TestExtractThreadIdFromUrl:
     """extract_thread_id_from_url()のテスト"""
 